@@ -4,8 +4,42 @@ Provides tools for backtesting trading strategies.
 """
 
 from .engine import BacktestEngine
-from .metrics import PerformanceMetrics
+from .metrics import PerformanceMetrics, RunningMetrics
+from .montecarlo import MonteCarlo
 from .visualization import BacktestVisualizer
 from .execution import TradeExecutor
+from .indicators import IndicatorCache
+from .sweep import ParameterSweep
+from .store import SharedPriceStore
+from .columnar import ColumnarDataset
+from .streaming import StreamingEngine, StreamingExecutor
+from .ledger import TradeLedger
+from .portfolio import PortfolioEngine
+from .walkforward import WalkForward
+from .live import LiveRunner, ReplayFeed
+from .profiling import Profiler
+from .cache import ResultCache
+from .report import BatchReport
 
-__all__ = ['BacktestEngine', 'PerformanceMetrics', 'BacktestVisualizer', 'TradeExecutor']
\ No newline at end of file
+__all__ = [
+    'BacktestEngine',
+    'PerformanceMetrics',
+    'RunningMetrics',
+    'MonteCarlo',
+    'BacktestVisualizer',
+    'TradeExecutor',
+    'IndicatorCache',
+    'ParameterSweep',
+    'SharedPriceStore',
+    'ColumnarDataset',
+    'StreamingEngine',
+    'StreamingExecutor',
+    'TradeLedger',
+    'PortfolioEngine',
+    'WalkForward',
+    'LiveRunner',
+    'ReplayFeed',
+    'Profiler',
+    'ResultCache',
+    'BatchReport'
+]
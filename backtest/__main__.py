@@ -0,0 +1,49 @@
+"""
+Command line tools for the backtesting package.
+
+Usage:
+    python -m backtest convert prices.csv prices_dir [--date-format FMT] [--sep ;] [--decimal ,]
+    python -m backtest info prices_dir
+"""
+
+import argparse
+import json
+from typing import List, Optional
+
+from .columnar import ColumnarDataset, convert_csv
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog='python -m backtest', description="Backtesting data tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert = subparsers.add_parser('convert', help="Convert a CSV price file to the columnar format")
+    convert.add_argument('csv_path')
+    convert.add_argument('path')
+    convert.add_argument('--date-column', default='date')
+    convert.add_argument('--date-format', default=None)
+    convert.add_argument('--sep', default=',')
+    convert.add_argument('--decimal', default='.')
+    convert.add_argument('--chunksize', type=int, default=1_000_000)
+
+    info = subparsers.add_parser('info', help="Show the header of a columnar dataset")
+    info.add_argument('path')
+
+    args = parser.parse_args(argv)
+    if args.command == 'convert':
+        dataset = convert_csv(
+            args.csv_path, args.path,
+            date_column=args.date_column,
+            date_format=args.date_format,
+            chunksize=args.chunksize,
+            sep=args.sep,
+            decimal=args.decimal
+        )
+        print(f"Wrote {len(dataset)} rows to {args.path}")
+    elif args.command == 'info':
+        print(json.dumps(ColumnarDataset.open(args.path).header, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+Result cache module.
+Stores backtest results on disk keyed by data, strategy and engine settings.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sysconfig
+import tempfile
+import types
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .indicators import fingerprint
+from .ledger import TradeLedger
+
+# Columns the engine derives from 'date'; they add nothing to a data fingerprint
+_DERIVED_COLUMNS = ('day_of_week', 'month')
+
+# Directories of the standard library and installed packages; their functions are hashed by name
+_LIBRARY_PATHS = tuple({os.path.realpath(sysconfig.get_path(name)) for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
+
+# Per-bar result arrays, stored run-length encoded (they are constant while flat or between signals)
+_RESULT_ARRAYS = ('equity_curve', 'positions', 'signal')
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Content hash of prepared price data (column names, index and values).
+
+    The calendar columns derived from 'date' are left out, so data attached
+    from a SharedPriceStore hashes like the DataFrame it was created from.
+
+    Args:
+        data: DataFrame as held by BacktestEngine.data
+
+    Returns:
+        Hex digest identifying the data
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    columns = [name for name in data.columns if name not in _DERIVED_COLUMNS]
+    digest.update(repr(columns).encode())
+    digest.update(fingerprint(data.index.to_numpy()).encode())
+    for name in columns:
+        digest.update(fingerprint(data[name].to_numpy()).encode())
+    return digest.hexdigest()
+
+
+def strategy_fingerprint(func: Callable) -> str:
+    """
+    Hash of a strategy function's code and the values it is bound to.
+
+    Covers the bytecode and constants (nested functions included), default
+    arguments, closure cells, functools.partial arguments, and the current
+    value of every global the code reads (containers, arrays and DataFrames
+    by content, user functions by their own code, recursively). Functions
+    of the standard library and installed packages, builtins, modules and
+    classes are identified by qualified name only, so upgrading a library
+    or editing a class does not invalidate entries. Values without a stable
+    representation (objects printed with their address) hash differently on
+    every call, so such strategies are never served from the cache rather
+    than served stale.
+
+    Args:
+        func: Strategy function, lambda or functools.partial
+
+    Returns:
+        Hex digest identifying the strategy
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _hash_value(digest, func, set())
+    return digest.hexdigest()
+
+
+def _hash_value(digest, value: Any, seen: set) -> None:
+    """Feed a stable representation of a value into the digest"""
+    if isinstance(value, functools.partial):
+        digest.update(b'partial')
+        _hash_value(digest, value.func, seen)
+        _hash_value(digest, value.args, seen)
+        _hash_value(digest, value.keywords, seen)
+    elif isinstance(value, types.MethodType):
+        _hash_value(digest, value.__func__, seen)
+        _hash_value(digest, value.__self__, seen)
+    elif isinstance(value, types.FunctionType):
+        digest.update(f"function {value.__module__}.{value.__qualname__}".encode())
+        if id(value) in seen or _is_library_code(value.__code__):
+            return
+        seen.add(id(value))
+        _hash_code(digest, value.__code__, value.__globals__, seen)
+        _hash_value(digest, value.__defaults__, seen)
+        _hash_value(digest, value.__kwdefaults__, seen)
+        for cell in value.__closure__ or ():
+            try:
+                _hash_value(digest, cell.cell_contents, seen)
+            except ValueError:  # empty cell
+                digest.update(b'empty')
+    elif isinstance(value, types.CodeType):
+        _hash_code(digest, value, {}, seen)
+    elif isinstance(value, (np.ndarray, pd.Series, pd.Index)):
+        digest.update(fingerprint(value).encode())
+    elif isinstance(value, pd.DataFrame):
+        digest.update(data_fingerprint(value).encode())
+    elif isinstance(value, (dict, list, tuple, set, frozenset)):
+        if id(value) in seen:
+            digest.update(b'cycle')
+            return
+        seen.add(id(value))
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        if isinstance(value, dict):
+            for key in sorted(value, key=repr):
+                digest.update(repr(key).encode())
+                _hash_value(digest, value[key], seen)
+        else:
+            for item in (sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value):
+                _hash_value(digest, item, seen)
+        seen.discard(id(value))
+    elif isinstance(value, types.ModuleType):
+        digest.update(f"module {value.__name__}".encode())
+    elif isinstance(value, type):
+        digest.update(f"class {value.__module__}.{value.__qualname__}".encode())
+    elif callable(value) and hasattr(value, '__qualname__'):
+        # Builtins, ufuncs and other compiled callables
+        digest.update(f"callable {getattr(value, '__module__', None)}.{value.__qualname__}".encode())
+    else:
+        digest.update(repr(value).encode())
+
+
+def _hash_code(digest, code: types.CodeType, module_globals: Dict, seen: set) -> None:
+    """Feed a code object, its nested code and the values of the module globals it reads into the digest"""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(digest, const, module_globals, seen)
+        else:
+            digest.update(repr(const).encode())
+    for name in code.co_names:
+        if name in module_globals:
+            digest.update(f"global {name}".encode())
+            _hash_value(digest, module_globals[name], seen)
+
+
+def _is_library_code(code: types.CodeType) -> bool:
+    """Whether a code object comes from the standard library or an installed package"""
+    filename = os.path.realpath(code.co_filename)
+    return any(filename.startswith(path + os.sep) for path in _LIBRARY_PATHS)
+
+
+class ResultCache:
+    """
+    Stores the results of BacktestEngine.run on disk, one .npz file per run.
+
+    Each entry holds the trade ledger columns, the equity curve, positions
+    and signal (run-length encoded, as they stay constant while flat or
+    between signals), and the scalar and breakdown metrics, keyed on the content
+    of the data, the strategy (code and bound parameters), the engine
+    settings and the run mode. Files are written atomically, so a sweep
+    that crashed resumes from the runs it finished, and several processes
+    can share a directory. Entries beyond `max_bytes` are evicted least
+    recently used first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 2**30):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the entries (created if missing)
+            max_bytes: Disk budget of the entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._scan()
+
+    def key(self, data_key: str, strategy_func: Callable, settings: Dict, mode: str) -> str:
+        """
+        Cache key of a run.
+
+        Args:
+            data_key: data_fingerprint of the engine's data
+            strategy_func: Strategy function of the run
+            settings: Engine settings (initial_capital, commission, slippage)
+            mode: Simulation mode
+
+        Returns:
+            Hex digest identifying the run
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(data_key.encode())
+        digest.update(strategy_fingerprint(strategy_func).encode())
+        digest.update(repr(sorted(settings.items())).encode())
+        digest.update(mode.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Stored entry of a run.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Dict with 'trades' (TradeLedger), 'equity_curve', 'positions', 'signal',
+            'final_capital', 'return_pct' and 'metrics', or None when not cached
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError, KeyError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        trades = TradeLedger(arrays['trade_entry_date'].dtype, capacity=len(arrays['trade_pnl']))
+        trades.extend(**{name[len('trade_'):]: values for name, values in arrays.items() if name.startswith('trade_')})
+        entry = {name: _decode_runs(arrays[f"{name}_runs"], arrays[name]) for name in _RESULT_ARRAYS}
+        entry['trades'] = trades
+        entry['final_capital'] = float(arrays['final_capital'])
+        entry['return_pct'] = float(arrays['return_pct'])
+        entry['metrics'] = json.loads(arrays['metrics'].item())
+        return entry
+
+    def put(self, key: str, results: Dict, signal: np.ndarray, metrics: Dict) -> bool:
+        """
+        Store the results of a run, evicting old entries down to the budget.
+
+        Args:
+            key: Cache key
+            results: Dict returned by BacktestEngine.run
+            signal: Signal column the run simulated
+            metrics: PerformanceMetrics.get_metrics() of the results
+
+        Returns:
+            Whether the entry was stored (object-typed dates or signals are not)
+        """
+        trades = results['trades']
+        arrays = {f"trade_{name}": trades.column(name) for name in trades._columns}
+        per_bar = {
+            'equity_curve': np.asarray(results['equity_curve'], dtype=np.float64),
+            'positions': np.asarray(results['positions'], dtype=np.float64),
+            'signal': np.asarray(signal)
+        }
+        for name, values in per_bar.items():
+            arrays[f"{name}_runs"], arrays[name] = _encode_runs(values)
+        if any(values.dtype.kind == 'O' for values in arrays.values()):
+            return False
+        arrays['final_capital'] = np.float64(results['final_capital'])
+        arrays['return_pct'] = np.float64(results['return_pct'])
+        arrays['metrics'] = np.array(json.dumps(metrics, default=_json_default))
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        self.nbytes -= self._entries.pop(key, 0)
+        self._entries[key] = os.path.getsize(self._path(key))
+        self.nbytes += self._entries[key]
+        if self.nbytes > self.max_bytes:
+            self._scan()
+            self._evict(keep=key)
+        return True
+
+    def clear(self) -> None:
+        """Delete every entry"""
+        for key in list(self._entries):
+            self._remove(key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _scan(self) -> None:
+        """Index the entries on disk (including other processes' writes) from oldest to newest use"""
+        found = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith('.npz'):
+                    try:
+                        stat = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    found.append((stat.st_mtime, item.name[:-len('.npz')], stat.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self.nbytes = sum(self._entries.values())
+
+    def _evict(self, keep: str) -> None:
+        """Remove the least recently used entries until the budget is met"""
+        for key in list(self._entries):
+            if self.nbytes <= self.max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        self.nbytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars left in metrics to Python numbers"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in the result cache")
+
+
+def _encode_runs(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Boundaries (run starts followed by the length) and values of the runs of equal consecutive values"""
+    if len(values) == 0:
+        return np.zeros(1, dtype=np.int64), values
+    starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+    bounds = np.concatenate([[0], starts, [len(values)]]).astype(np.int64)
+    return bounds, values[bounds[:-1]]
+
+
+def _decode_runs(bounds: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Expand run-length encoded values"""
+    return np.repeat(values, np.diff(bounds))
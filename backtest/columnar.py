@@ -0,0 +1,286 @@
+"""
+Columnar on-disk price format.
+Stores each column as a raw binary file memory-mapped on open, described by a small JSON header.
+"""
+
+import json
+import os
+import warnings
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+from .store import _INDEX_KEY
+
+HEADER_FILE = 'header.json'
+FORMAT_VERSION = 1
+
+
+class ColumnarDataset:
+    """
+    Read-only price history backed by per-column memory-mapped files.
+
+    Opening a dataset only reads the header and maps the column files, so it
+    takes milliseconds regardless of size; pages are read when touched.
+    """
+
+    def __init__(self, path: str, header: Dict, arrays: Dict[str, np.ndarray], row_offset: int = 0):
+        """
+        Wrap mapped columns. Use open() or slice() instead.
+
+        Args:
+            path: Dataset directory
+            header: Parsed header
+            arrays: Column name to memory-mapped array (or a view of one)
+            row_offset: Position of the first row in the full dataset
+        """
+        self.path = path
+        self.header = header
+        self.arrays = arrays
+        self.row_offset = row_offset
+
+    @classmethod
+    def open(cls, path: str) -> 'ColumnarDataset':
+        """
+        Open a dataset directory written by write_columnar or convert_csv.
+
+        Args:
+            path: Dataset directory
+
+        Returns:
+            ColumnarDataset over the full history
+        """
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            header = json.load(f)
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {header.get('version')}")
+
+        length = header['length']
+        arrays = {}
+        for col in header['columns']:
+            file_path = os.path.join(path, col['file'])
+            if length:
+                arrays[col['name']] = np.memmap(file_path, dtype=col['dtype'], mode='r', shape=(length,))
+            else:
+                arrays[col['name']] = np.empty(0, dtype=col['dtype'])
+        return cls(path, header, arrays)
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the stored columns"""
+        return [name for name in self.arrays if name != _INDEX_KEY]
+
+    @property
+    def date_column(self) -> Optional[str]:
+        """Name of the sorted datetime column used for slicing"""
+        return self.header.get('date_column')
+
+    def __len__(self) -> int:
+        return len(next(iter(self.arrays.values()))) if self.arrays else 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Memory-mapped view of one column"""
+        return self.arrays[name]
+
+    def slice(self,
+              start: Optional[Union[str, pd.Timestamp]] = None,
+              end: Optional[Union[str, pd.Timestamp]] = None) -> 'ColumnarDataset':
+        """
+        Select rows with start <= date <= end without reading the whole file.
+
+        The bounds are located by binary search on the mapped date column, so
+        only a few pages are touched.
+
+        Args:
+            start: First date to include (None for the beginning)
+            end: Last date to include (None for the end)
+
+        Returns:
+            ColumnarDataset over the selected rows
+        """
+        if not self.date_column or not self.header.get('sorted', False):
+            raise ValueError("Dataset has no sorted date column to slice on")
+
+        dates = self.arrays[self.date_column]
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), side='left'))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).to_datetime64(), side='right'))
+        hi = max(lo, hi)
+        arrays = {name: values[lo:hi] for name, values in self.arrays.items()}
+        return ColumnarDataset(self.path, self.header, arrays, self.row_offset + lo)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build a DataFrame whose columns are views over the mapped files.
+
+        Without a stored index, rows keep their position in the full dataset
+        as the index so label-based strategy code behaves the same on slices.
+
+        Returns:
+            DataFrame sharing memory with the mapped files
+        """
+        arrays = dict(self.arrays)
+        index = arrays.pop(_INDEX_KEY, None)
+        if index is None:
+            index = pd.RangeIndex(self.row_offset, self.row_offset + len(self))
+        return pd.DataFrame(arrays, index=index, copy=False)
+
+
+def write_columnar(data: pd.DataFrame, path: str, date_column: str = 'date') -> ColumnarDataset:
+    """
+    Write the numeric and datetime columns of a DataFrame to a dataset directory.
+
+    Columns keep their dtype. Other columns (strings, categories, timezone-aware
+    dates) are left out with a warning.
+
+    Args:
+        data: DataFrame with historical price data
+        path: Dataset directory (created if needed)
+        date_column: Datetime column used for date-range slicing
+
+    Returns:
+        The written dataset, opened
+    """
+    writer = _ColumnarWriter(path, date_column)
+    writer.append(data, keep_index=True)
+    writer.finish()
+    return ColumnarDataset.open(path)
+
+
+def convert_csv(csv_path: str,
+                path: str,
+                date_column: str = 'date',
+                date_format: Optional[str] = None,
+                chunksize: int = 1_000_000,
+                **read_csv_kwargs) -> ColumnarDataset:
+    """
+    Convert a CSV price file to the columnar format in bounded memory.
+
+    Columns keep the dtype parsed from the first chunk, so an integer column
+    with missing values further down needs dtype={'column': 'float64'}.
+
+    Args:
+        csv_path: Source CSV file
+        path: Dataset directory (created if needed)
+        date_column: Name of the date column ('datetime' is accepted as a fallback)
+        date_format: strftime format of the date column (much faster than inference)
+        chunksize: Rows parsed per chunk
+        **read_csv_kwargs: Extra arguments for pd.read_csv (sep, decimal, ...)
+
+    Returns:
+        The written dataset, opened
+    """
+    writer = _ColumnarWriter(path, date_column)
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, **read_csv_kwargs):
+        if date_column not in chunk.columns and 'datetime' in chunk.columns:
+            chunk = chunk.rename(columns={'datetime': date_column})
+        if date_column in chunk.columns:
+            chunk[date_column] = pd.to_datetime(chunk[date_column], format=date_format)
+        writer.append(chunk)
+    writer.finish()
+    return ColumnarDataset.open(path)
+
+
+class _ColumnarWriter:
+    """
+    Appends DataFrame chunks to per-column files and writes the header last.
+    """
+
+    def __init__(self, path: str, date_column: str):
+        self.path = path
+        self.date_column = date_column
+        self.dtypes = None
+        self.length = 0
+        self.sorted = True
+        self.first_date = None
+        self.last_date = None
+        os.makedirs(path, exist_ok=True)
+
+    def append(self, chunk: pd.DataFrame, keep_index: bool = False) -> None:
+        """
+        Append one chunk; the first chunk fixes the schema.
+
+        Columns keep the dtype they have in the first chunk. Columns that
+        cannot be stored (strings, categories, timezone-aware dates) are
+        left out with a warning.
+
+        Raises:
+            ValueError: If the date column cannot be stored, the columns differ
+                        from the first chunk, or a later chunk has missing or
+                        fractional values in an integer column
+        """
+        arrays = {}
+        dropped = []
+        for name in chunk.columns:
+            values = chunk[name].to_numpy()
+            if values.dtype.kind in 'biufM':
+                arrays[name] = values
+            else:
+                dropped.append(f"{name} ({chunk[name].dtype})")
+        if keep_index and not isinstance(chunk.index, pd.RangeIndex) and chunk.index.dtype.kind in 'biufM':
+            arrays[_INDEX_KEY] = chunk.index.to_numpy()
+
+        if self.dtypes is None:
+            if self.date_column in chunk.columns and self.date_column not in arrays:
+                raise ValueError(
+                    f"Date column '{self.date_column}' has dtype {chunk[self.date_column].dtype}; "
+                    f"convert it to naive datetime64 first (e.g. .dt.tz_convert(None) for UTC)"
+                )
+            if dropped:
+                warnings.warn(f"Columns not stored in the columnar dataset: {', '.join(dropped)}", stacklevel=3)
+            self.dtypes = {name: values.dtype for name, values in arrays.items()}
+            for name in self.dtypes:
+                open(self._column_path(name), 'wb').close()
+        elif set(arrays) != set(self.dtypes):
+            raise ValueError("All chunks must have the same numeric columns")
+
+        for name, dtype in self.dtypes.items():
+            with open(self._column_path(name), 'ab') as f:
+                self._cast(name, arrays[name], dtype).tofile(f)
+
+        if self.date_column in arrays and len(chunk):
+            dates = arrays[self.date_column]
+            if self.last_date is not None and dates[0] < self.last_date:
+                self.sorted = False
+            if len(dates) > 1 and (np.diff(dates) < np.timedelta64(0)).any():
+                self.sorted = False
+            if self.first_date is None:
+                self.first_date = dates[0]
+            self.last_date = dates[-1]
+        self.length += len(chunk)
+
+    def _cast(self, name: str, values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """Column values of a chunk in the stored dtype, refusing lossy casts"""
+        if values.dtype == dtype or np.can_cast(values.dtype, dtype, casting='safe'):
+            return np.ascontiguousarray(values, dtype=dtype)
+        with np.errstate(invalid='ignore'):
+            cast = np.ascontiguousarray(values.astype(dtype))
+        if not np.array_equal(cast, values):
+            raise ValueError(
+                f"Column '{name}' is stored as {dtype} but a later chunk has {values.dtype} values that "
+                f"do not fit (e.g. missing values); read it as float with dtype={{'{name}': 'float64'}}"
+            )
+        return cast
+
+    def finish(self) -> None:
+        """Write the header describing the columns and date range"""
+        has_date = self.dtypes is not None and self.date_column in self.dtypes
+        header = {
+            'version': FORMAT_VERSION,
+            'length': self.length,
+            'columns': [
+                {'name': name, 'dtype': dtype.str, 'file': self._column_file(name)}
+                for name, dtype in (self.dtypes or {}).items()
+            ],
+            'date_column': self.date_column if has_date else None,
+            'sorted': self.sorted if has_date else False,
+            'start': str(pd.Timestamp(self.first_date)) if self.first_date is not None else None,
+            'end': str(pd.Timestamp(self.last_date)) if self.last_date is not None else None
+        }
+        with open(os.path.join(self.path, HEADER_FILE), 'w') as f:
+            json.dump(header, f, indent=2)
+
+    def _column_file(self, name: str) -> str:
+        return f"{name}.bin"
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, self._column_file(name))
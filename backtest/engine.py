@@ -8,79 +8,337 @@ import numpy as np
 from typing import List, Dict, Callable, Tuple, Optional, Union
 from datetime import datetime, timedelta
 
-class BacktestEngine:
+from .store import SharedPriceStore
+from .columnar import ColumnarDataset
+from .ledger import TradeLedger
+from .profiling import Profiler, DISABLED
+from .kernels import EXIT_REASONS
+from .cache import ResultCache, data_fingerprint
+from .metrics import PerformanceMetrics
+
+# Size budget of one bars x strategies matrix in BacktestEngine.run_batch
+BATCH_BLOCK_BYTES = 16 * 2**20
+
+class _TradeBook:
+    """
+    Long-only trade bookkeeping shared by BacktestEngine and StreamingEngine.
+
+    Subclasses set initial_capital, commission and slippage, and hold the
+    run state the methods update: trades (TradeLedger), _open_trade,
+    current_position and current_capital.
+    """
+
+    def _simulate_chunk(self,
+                        opens: np.ndarray,
+                        closes: np.ndarray,
+                        signal: np.ndarray,
+                        dates: pd.Series,
+                        prev_signal: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulate a run of consecutive bars with NumPy, continuing from the current state.
+        
+        Position state only depends on the previous bar's signal, so the bars
+        in the market are derived in one pass and only the per-trade capital
+        compounding is done in Python. An open trade (self._open_trade) and
+        the capital carry over between calls.
+        
+        Args:
+            opens: Open prices of the bars
+            closes: Close prices of the bars
+            signal: Strategy signal of each bar
+            dates: Dates of the bars
+            prev_signal: Signal of the bar preceding the first one (0 at the start of the data)
+            
+        Returns:
+            Tuple of (equity, position) arrays with one value per bar
+        """
+        n = len(opens)
+        held_in = self.current_position > 0
+        
+        # A long is held on bar i when the last buy/sell signal before it was a buy
+        seen_signal = np.empty(n, dtype=np.float64)
+        seen_signal[:1] = prev_signal
+        seen_signal[1:] = signal[:-1]
+        actionable = (seen_signal == 1) | (seen_signal == -1)
+        last_signal_idx = np.where(actionable, np.arange(n), -1)
+        np.maximum.accumulate(last_signal_idx, out=last_signal_idx)
+        held = np.where(last_signal_idx >= 0, seen_signal[last_signal_idx] == 1, held_in)
+        held_before = np.empty(n, dtype=bool)
+        held_before[:1] = held_in
+        held_before[1:] = held[:-1]
+        
+        entry_bars = np.flatnonzero(held & ~held_before)
+        exit_bars = np.flatnonzero(~held & held_before)
+        
+        # Trades active in this chunk: the carried-over one (if any) and the new entries
+        trade_starts = np.concatenate([[-1], entry_bars]) if held_in else entry_bars
+        sizes = np.zeros(len(trade_starts))
+        entry_values = np.zeros(len(trade_starts))
+        capital_in = self.current_capital
+        capital_after = np.zeros(len(exit_bars))
+        
+        # Compound capital trade by trade
+        for k in range(len(trade_starts)):
+            if not (held_in and k == 0):
+                entry_bar = trade_starts[k]
+                entry_price = opens[entry_bar] * (1 + self.slippage)
+                position_size = self._calculate_position_size(self.current_capital, entry_price)
+                
+                self._open_trade = {
+                    'entry_date': dates.iloc[entry_bar],
+                    'entry_price': entry_price,
+                    'position_size': position_size,
+                    'commission': self._calculate_commission(entry_price * position_size),
+                    'slippage': self._calculate_slippage(entry_price * position_size)
+                }
+            
+            sizes[k] = self._open_trade['position_size']
+            entry_values[k] = self._open_trade['entry_price'] * self._open_trade['position_size']
+            
+            if k < len(exit_bars):
+                exit_bar = exit_bars[k]
+                self._close_trade(dates.iloc[exit_bar], opens[exit_bar] * (1 - self.slippage), 'signal')
+                capital_after[k] = self.current_capital
+        
+        # Realized capital and mark-to-market of the open trade on every bar
+        bars = np.arange(n)
+        capital_levels = np.concatenate([[capital_in], capital_after])
+        realized = capital_levels[np.searchsorted(exit_bars, bars, side='right')]
+        
+        equity = realized.copy()
+        positions = np.zeros(n)
+        if len(trade_starts):
+            trade_idx = np.maximum(np.searchsorted(trade_starts, bars, side='right') - 1, 0)
+            unrealized = sizes[trade_idx[held]] * closes[held] - entry_values[trade_idx[held]]
+            equity[held] = realized[held] + unrealized
+            positions[held] = sizes[trade_idx[held]]
+        
+        self.current_position = positions[-1] if n else self.current_position
+        return equity, positions
+    
+    def _close_trade(self, exit_date, exit_price: float, exit_reason: str) -> None:
+        """Close the open trade, record it in the ledger and book its P&L into capital"""
+        trade = self._open_trade
+        entry_value = trade['entry_price'] * trade['position_size']
+        exit_value = exit_price * trade['position_size']
+        commission = trade['commission'] + self._calculate_commission(exit_value)
+        slippage = trade['slippage'] + self._calculate_slippage(exit_value)
+        
+        pnl = exit_value - entry_value - commission - slippage
+        self.trades.append(
+            entry_date=trade['entry_date'],
+            exit_date=exit_date,
+            entry_price=trade['entry_price'],
+            exit_price=exit_price,
+            position_size=trade['position_size'],
+            direction='long',
+            pnl=pnl,
+            pnl_pct=(pnl / entry_value) * 100,
+            commission=trade['commission'],
+            slippage=trade['slippage'],
+            exit_reason=exit_reason
+        )
+        
+        self.current_capital += pnl
+        self._open_trade = None
+    
+    def _calculate_entry_price(self, row: pd.Series, direction: str) -> float:
+        """Calculate entry price with slippage"""
+        if direction == 'buy':
+            return row['open'] * (1 + self.slippage)
+        else:  # sell
+            return row['open'] * (1 - self.slippage)
+    
+    def _calculate_position_size(self, capital: float, price: float) -> float:
+        """Calculate position size based on available capital"""
+        # Simple implementation: use all available capital
+        return capital / price
+    
+    def _calculate_commission(self, trade_value: float) -> float:
+        """Calculate commission for a trade"""
+        return trade_value * self.commission
+    
+    def _calculate_slippage(self, trade_value: float) -> float:
+        """Calculate slippage for a trade"""
+        return trade_value * self.slippage
+
+
+class BacktestEngine(_TradeBook):
     """
     Core backtesting engine that simulates trading strategies on historical data.
     """
     
     def __init__(self, 
-                 data: pd.DataFrame, 
+                 data: Union[pd.DataFrame, SharedPriceStore, ColumnarDataset], 
                  initial_capital: float = 10000.0,
                  commission: float = 0.0,
-                 slippage: float = 0.0):
+                 slippage: float = 0.0,
+                 profiler: Optional[Profiler] = None,
+                 result_cache: Optional[ResultCache] = None):
         """
         Initialize the backtesting engine.
         
         Args:
-            data: DataFrame with historical price data (must include 'open', 'high', 'low', 'close')
+            data: DataFrame with historical price data (must include 'open', 'high', 'low', 'close'),
+                  or a SharedPriceStore / ColumnarDataset to attach to read-only without
+                  copying (the 'day_of_week'/'month' analysis columns are not added in that case)
             initial_capital: Starting capital for the backtest
             commission: Commission per trade (percentage)
             slippage: Slippage per trade (percentage)
+            profiler: Optional Profiler timing the phases of each run; its report is
+                      added to the results as 'profile'
+            result_cache: Optional ResultCache; run() then returns stored results for
+                          unchanged data, strategy and settings, and adds 'metrics'
         """
-        self.data = data.copy()
+        shared = isinstance(data, (SharedPriceStore, ColumnarDataset))
+        self.data = _prepare_data(data.to_frame() if shared else data.copy(), calendar_columns=not shared)
         self.initial_capital = initial_capital
         self.commission = commission
         self.slippage = slippage
-        
-        # Ensure required columns exist
-        required_columns = ['open', 'high', 'low', 'close', 'date']
-        for col in required_columns:
-            if col not in self.data.columns:
-                if col == 'date' and 'datetime' in self.data.columns:
-                    self.data['date'] = self.data['datetime']
-                else:
-                    raise ValueError(f"Data must contain '{col}' column")
-        
-        # Convert date column to datetime if it's not already
-        if not pd.api.types.is_datetime64_any_dtype(self.data['date']):
-            self.data['date'] = pd.to_datetime(self.data['date'])
-            
-        # Add day of week and month columns for analysis
-        self.data['day_of_week'] = self.data['date'].dt.day_name().str.lower()
-        self.data['month'] = self.data['date'].dt.month_name().str.lower()
+        self.profiler = profiler if profiler is not None else DISABLED
+        self.result_cache = result_cache
+        self._data_key = None
         
         # Initialize results containers
-        self.trades = []
+        self.trades = TradeLedger(self.data['date'].dtype)
+        self._open_trade = None
         self.equity_curve = []
         self.positions = []
         self.current_position = 0
         self.current_capital = initial_capital
         
-    def run(self, strategy_func: Callable) -> Dict:
+    def run(self, strategy_func: Callable, mode: str = 'loop') -> Dict:
         """
         Run the backtest using the provided strategy function.
         
         Args:
             strategy_func: Function that generates entry/exit signals
                            Should return a DataFrame with 'signal' column (1 for buy, -1 for sell, 0 for no action)
+            mode: Simulation engine ('loop' walks the data bar by bar, 'vectorized'
+                  derives the same results from NumPy arrays)
         
         Returns:
-            Dict containing backtest results
+            Dict containing backtest results; 'equity_curve' is a float64 array
+            with one value per bar of 'dates', 'positions' starts at the second bar
+            ('profile' holds the profiler report when a profiler is enabled,
+            'metrics' the PerformanceMetrics values when a result cache is set)
         """
+        if mode not in ('loop', 'vectorized'):
+            raise ValueError("Mode must be 'loop' or 'vectorized'")
+        
         # Reset state
-        self.trades = []
-        self.equity_curve = [self.initial_capital]
-        self.positions = []
+        self.trades = TradeLedger(self.data['date'].dtype)
+        self._open_trade = None
         self.current_position = 0
         self.current_capital = self.initial_capital
         
+        profiler = self.profiler
+        cache = self.result_cache
+        with profiler:
+            entry = None
+            if cache is not None:
+                with profiler.span('engine.cache'):
+                    key = cache.key(self._fingerprint(), strategy_func, self._settings(), mode)
+                    entry = cache.get(key)
+            
+            if entry is not None:
+                results = self._cached_results(entry)
+                profiler.count('engine.cache_hits')
+            else:
+                results = self._simulate(strategy_func, mode)
+                if cache is not None:
+                    with profiler.span('engine.cache'):
+                        results['metrics'] = PerformanceMetrics(results).get_metrics()
+                        if len(results['data']) == len(self.data):
+                            cache.put(key, results, results['data']['signal'].to_numpy(), results['metrics'])
+            profiler.count_results('engine', len(results['dates']), results['trades'])
+        
+        if profiler.enabled:
+            results['profile'] = profiler.report()
+        return results
+    
+    def _simulate(self, strategy_func: Callable, mode: str) -> Dict:
+        """
+        Generate the strategy's signals and simulate them.
+        
+        Args:
+            strategy_func: Function that generates entry/exit signals
+            mode: Simulation engine ('loop' or 'vectorized')
+            
+        Returns:
+            Dict containing backtest results
+        """
+        profiler = self.profiler
+        
         # Generate signals using the strategy function
-        signals = strategy_func(self.data)
+        with profiler.span('engine.strategy'):
+            signals = strategy_func(self.data)
         if not isinstance(signals, pd.DataFrame) or 'signal' not in signals.columns:
             raise ValueError("Strategy function must return DataFrame with 'signal' column")
         
         # Merge signals with price data
-        backtest_data = pd.concat([self.data, signals['signal']], axis=1)
+        with profiler.span('engine.merge'):
+            backtest_data = pd.concat([self.data, signals['signal']], axis=1)
+        
+        with profiler.span('engine.simulate'):
+            if mode == 'vectorized':
+                return self._run_vectorized(backtest_data)
+            return self._run_loop(backtest_data)
+    
+    def _fingerprint(self) -> str:
+        """Content hash of the engine's data, computed once"""
+        if self._data_key is None:
+            self._data_key = data_fingerprint(self.data)
+        return self._data_key
+    
+    def _settings(self) -> Dict:
+        """Engine settings that change the results of a run"""
+        return {
+            'initial_capital': self.initial_capital,
+            'commission': self.commission,
+            'slippage': self.slippage
+        }
+    
+    def _cached_results(self, entry: Dict) -> Dict:
+        """
+        Rebuild the results of a run from a ResultCache entry and restore the engine state.
+        
+        Args:
+            entry: Dict returned by ResultCache.get
+            
+        Returns:
+            Dict containing backtest results (same layout as run, plus 'metrics')
+        """
+        self.trades = entry['trades']
+        self.equity_curve = entry['equity_curve']
+        self.positions = entry['positions']
+        self.current_capital = entry['final_capital']
+        backtest_data = self.data.assign(signal=entry['signal'])
+        return {
+            'trades': self.trades,
+            'equity_curve': self.equity_curve,
+            'positions': self.positions,
+            'dates': backtest_data['date'].to_numpy(),
+            'final_capital': self.current_capital,
+            'return_pct': entry['return_pct'],
+            'data': backtest_data,
+            'metrics': entry['metrics']
+        }
+    
+    def _run_loop(self, backtest_data: pd.DataFrame) -> Dict:
+        """
+        Simulate the strategy bar by bar.
+        
+        Args:
+            backtest_data: Price data merged with the 'signal' column
+            
+        Returns:
+            Dict containing backtest results
+        """
+        # Preallocate result buffers (one equity point per bar)
+        self.equity_curve = np.empty(max(len(backtest_data), 1), dtype=np.float64)
+        self.equity_curve[0] = self.initial_capital
+        self.positions = np.empty(max(len(backtest_data) - 1, 0), dtype=np.float64)
         
         # Simulate trading
         for i in range(1, len(backtest_data)):
@@ -92,43 +350,22 @@ class BacktestEngine:
                 entry_price = self._calculate_entry_price(current_row, 'buy')
                 position_size = self._calculate_position_size(self.current_capital, entry_price)
                 
-                # Record trade
-                trade = {
+                # Open trade (recorded in the ledger when it closes)
+                self._open_trade = {
                     'entry_date': current_row['date'],
                     'entry_price': entry_price,
                     'position_size': position_size,
-                    'direction': 'long',
-                    'exit_date': None,
-                    'exit_price': None,
-                    'pnl': 0,
-                    'pnl_pct': 0,
                     'commission': self._calculate_commission(entry_price * position_size),
                     'slippage': self._calculate_slippage(entry_price * position_size)
                 }
-                self.trades.append(trade)
                 self.current_position = position_size
                 
             elif self.current_position > 0 and prev_row['signal'] == -1:  # Sell signal
                 exit_price = self._calculate_entry_price(current_row, 'sell')
                 
-                # Update last trade
-                if self.trades:
-                    last_trade = self.trades[-1]
-                    if last_trade['exit_date'] is None:
-                        last_trade['exit_date'] = current_row['date']
-                        last_trade['exit_price'] = exit_price
-                        
-                        # Calculate P&L
-                        entry_value = last_trade['entry_price'] * last_trade['position_size']
-                        exit_value = exit_price * last_trade['position_size']
-                        commission = last_trade['commission'] + self._calculate_commission(exit_value)
-                        slippage = last_trade['slippage'] + self._calculate_slippage(exit_value)
-                        
-                        last_trade['pnl'] = exit_value - entry_value - commission - slippage
-                        last_trade['pnl_pct'] = (last_trade['pnl'] / entry_value) * 100
-                        
-                        # Update capital
-                        self.current_capital += last_trade['pnl']
+                # Record exit, P&L and update capital
+                if self._open_trade is not None:
+                    self._close_trade(current_row['date'], exit_price, 'signal')
                 
                 self.current_position = 0
             
@@ -136,33 +373,20 @@ class BacktestEngine:
             if self.current_position > 0:
                 # Mark-to-market current position
                 current_value = self.current_position * current_row['close']
-                unrealized_pnl = current_value - (self.trades[-1]['entry_price'] * self.trades[-1]['position_size'])
-                self.equity_curve.append(self.current_capital + unrealized_pnl)
+                unrealized_pnl = current_value - (self._open_trade['entry_price'] * self._open_trade['position_size'])
+                self.equity_curve[i] = self.current_capital + unrealized_pnl
             else:
-                self.equity_curve.append(self.current_capital)
+                self.equity_curve[i] = self.current_capital
             
             # Record position
-            self.positions.append(self.current_position)
+            self.positions[i - 1] = self.current_position
         
         # Close any open positions at the end of the backtest
-        if self.current_position > 0 and self.trades and self.trades[-1]['exit_date'] is None:
+        if self.current_position > 0 and self._open_trade is not None:
             last_row = backtest_data.iloc[-1]
-            last_trade = self.trades[-1]
             
-            last_trade['exit_date'] = last_row['date']
-            last_trade['exit_price'] = last_row['close']
-            
-            # Calculate P&L
-            entry_value = last_trade['entry_price'] * last_trade['position_size']
-            exit_value = last_trade['exit_price'] * last_trade['position_size']
-            commission = last_trade['commission'] + self._calculate_commission(exit_value)
-            slippage = last_trade['slippage'] + self._calculate_slippage(exit_value)
-            
-            last_trade['pnl'] = exit_value - entry_value - commission - slippage
-            last_trade['pnl_pct'] = (last_trade['pnl'] / entry_value) * 100
-            
-            # Update capital
-            self.current_capital += last_trade['pnl']
+            # Record exit, P&L and update capital
+            self._close_trade(last_row['date'], last_row['close'], 'end_of_data')
             self.equity_curve[-1] = self.current_capital
             self.current_position = 0
         
@@ -171,6 +395,7 @@ class BacktestEngine:
             'trades': self.trades,
             'equity_curve': self.equity_curve,
             'positions': self.positions,
+            'dates': backtest_data['date'].to_numpy(),
             'final_capital': self.current_capital,
             'return_pct': ((self.current_capital / self.initial_capital) - 1) * 100,
             'data': backtest_data
@@ -178,22 +403,406 @@ class BacktestEngine:
         
         return results
     
-    def _calculate_entry_price(self, row: pd.Series, direction: str) -> float:
-        """Calculate entry price with slippage"""
-        if direction == 'buy':
-            return row['open'] * (1 + self.slippage)
-        else:  # sell
-            return row['open'] * (1 - self.slippage)
+    def _run_vectorized(self, backtest_data: pd.DataFrame) -> Dict:
+        """
+        Simulate the strategy from NumPy arrays instead of iterating rows.
+        
+        Args:
+            backtest_data: Price data merged with the 'signal' column
+            
+        Returns:
+            Dict containing backtest results (same layout as the loop engine)
+        """
+        dates = backtest_data['date']
+        equity, positions = self._simulate_chunk(
+            backtest_data['open'].to_numpy(dtype=np.float64),
+            backtest_data['close'].to_numpy(dtype=np.float64),
+            backtest_data['signal'].to_numpy(),
+            dates,
+            prev_signal=0
+        )
+        self.equity_curve = equity
+        self.positions = positions[1:]
+        
+        # Close any open positions at the end of the backtest
+        if self.current_position > 0:
+            self._close_trade(dates.iloc[-1], backtest_data['close'].iloc[-1], 'end_of_data')
+            self.equity_curve[-1] = self.current_capital
+            self.current_position = 0
+        
+        return {
+            'trades': self.trades,
+            'equity_curve': self.equity_curve,
+            'positions': self.positions,
+            'dates': dates.to_numpy(),
+            'final_capital': self.current_capital,
+            'return_pct': ((self.current_capital / self.initial_capital) - 1) * 100,
+            'data': backtest_data
+        }
     
-    def _calculate_position_size(self, capital: float, price: float) -> float:
-        """Calculate position size based on available capital"""
-        # Simple implementation: use all available capital
-        return capital / price
+    def run_signals(self, signal: np.ndarray, start: int = 0, stop: Optional[int] = None) -> Dict:
+        """
+        Run the vectorized simulation on precomputed signals over a range of rows.
+
+        The data is sliced positionally, so many windows of the same history
+        can be backtested on one engine without preparing the data again.
+        The range starts flat, as if it were the whole data.
+
+        Args:
+            signal: Signal of every row of the engine's data (1 for buy, -1 for sell, 0 for no action)
+            start: First row of the range
+            stop: Row after the last one of the range (defaults to the end of the data)
+
+        Returns:
+            Dict containing backtest results (same layout as run)
+        """
+        stop = len(self.data) if stop is None else stop
+        if len(signal) != len(self.data):
+            raise ValueError("Signal must have one value per row of the data")
+
+        self.trades = TradeLedger(self.data['date'].dtype)
+        self._open_trade = None
+        self.current_position = 0
+        self.current_capital = self.initial_capital
+
+        profiler = self.profiler
+        with profiler:
+            with profiler.span('engine.simulate'):
+                backtest_data = self.data.iloc[start:stop].assign(signal=signal[start:stop])
+                results = self._run_vectorized(backtest_data)
+            profiler.count_results('engine', len(backtest_data), results['trades'])
+        
+        if profiler.enabled:
+            results['profile'] = profiler.report()
+        return results
+
+    def run_batch(self,
+                  signals: Union[pd.DataFrame, np.ndarray],
+                  names: Optional[List] = None,
+                  block_size: Optional[int] = None) -> Dict:
+        """
+        Run many strategies over the data in one vectorized pass.
+        
+        Every column of a bars x strategies signal matrix is simulated as by
+        run(mode='vectorized'), with identical results. Trades are found from
+        the buy/sell signals of all strategies at once, capital is compounded
+        one trade ordinal at a time across strategies, and the equity curves
+        are filled block by block with dense array operations, so the Python
+        work grows with the longest trade count rather than with the number
+        of strategies.
+        
+        Args:
+            signals: Signal matrix with one row per row of the data and one column per
+                     strategy (1 for buy, -1 for sell, 0 for no action); DataFrame
+                     columns name the strategies
+            names: Strategy names for an array matrix (defaults to the column numbers)
+            block_size: Number of strategies whose bar matrices are built together (defaults
+                        to as many as fit BATCH_BLOCK_BYTES per matrix)
+        
+        Returns:
+            Dict mapping each strategy name to its results (same layout as run;
+            'data' is the engine's data, shared by all strategies and without a
+            'signal' column)
+        """
+        if isinstance(signals, pd.DataFrame):
+            names = list(signals.columns) if names is None else list(names)
+            matrix = signals.to_numpy(dtype=np.float64)
+        else:
+            matrix = np.asarray(signals, dtype=np.float64)
+            if matrix.ndim == 1:
+                matrix = matrix[:, None]
+            names = list(range(matrix.shape[1])) if names is None else list(names)
+        n, n_strategies = matrix.shape
+        if n != len(self.data):
+            raise ValueError("Signal matrix must have one row per row of the data")
+        if len(names) != n_strategies:
+            raise ValueError("Names must have one entry per strategy")
+        if block_size is None:
+            block_size = max(BATCH_BLOCK_BYTES // (8 * max(n, 1)), 1)
+        
+        profiler = self.profiler
+        with profiler:
+            with profiler.span('engine.batch'):
+                opens = self.data['open'].to_numpy(dtype=np.float64)
+                closes = self.data['close'].to_numpy(dtype=np.float64)
+                dates = self.data['date'].to_numpy()
+                blocks = [(start, min(start + block_size, n_strategies)) for start in range(0, n_strategies, block_size)]
+                
+                # Entry and exit bars of every trade, ordered by strategy then time
+                parts = [_batch_trades(matrix[:, start:stop], start) for start, stop in blocks]
+                strategy = np.concatenate([part[0] for part in parts])
+                entry_bar = np.concatenate([part[1] for part in parts])
+                exit_bar = np.concatenate([part[2] for part in parts])
+                trades = self._compound_batch(opens, closes, strategy, entry_bar, exit_bar, n_strategies)
+                
+                # Bar by bar equity and positions from the trades of each block (Fortran order,
+                # so each strategy's curve is contiguous and a block's transpose is a C-ordered view)
+                equity = np.empty((n, n_strategies), dtype=np.float64, order='F')
+                positions = np.empty((n, n_strategies), dtype=np.float64, order='F')
+                bounds = np.searchsorted(strategy, [start for start, _ in blocks] + [n_strategies])
+                for (start, stop), lo, hi in zip(blocks, bounds[:-1], bounds[1:]):
+                    self._batch_equity(
+                        closes, strategy[lo:hi] - start, entry_bar[lo:hi], exit_bar[lo:hi],
+                        trades['position_size'][lo:hi], trades['entry_value'][lo:hi], trades['capital'][lo:hi],
+                        equity[:, start:stop].T, positions[:, start:stop].T
+                    )
+                
+                ledgers = self._batch_ledgers(dates, strategy, entry_bar, exit_bar, trades, n_strategies)
+            
+            results = {}
+            for j, name in enumerate(names):
+                final_capital = trades['final_capital'][j]
+                results[name] = {
+                    'trades': ledgers[j],
+                    'equity_curve': equity[:, j],
+                    'positions': positions[1:, j],
+                    'dates': dates,
+                    'final_capital': final_capital,
+                    'return_pct': ((final_capital / self.initial_capital) - 1) * 100,
+                    'data': self.data
+                }
+                profiler.count_results('engine', n, ledgers[j])
+        
+        if profiler.enabled:
+            report = profiler.report()
+            for result in results.values():
+                result['profile'] = report
+        return results
     
-    def _calculate_commission(self, trade_value: float) -> float:
-        """Calculate commission for a trade"""
-        return trade_value * self.commission
+    def _compound_batch(self,
+                        opens: np.ndarray,
+                        closes: np.ndarray,
+                        strategy: np.ndarray,
+                        entry_bar: np.ndarray,
+                        exit_bar: np.ndarray,
+                        n_strategies: int) -> Dict[str, np.ndarray]:
+        """
+        Size and close the trades of all strategies, compounding each strategy's capital.
+        
+        The k-th trades of all strategies are processed together, with the
+        same operations (and rounding) as _simulate_chunk and _close_trade.
+        
+        Args:
+            opens: Open prices of the bars
+            closes: Close prices of the bars
+            strategy: Strategy of each trade
+            entry_bar: Entry bar of each trade
+            exit_bar: Exit bar of each trade (len(opens) for trades still open at the end)
+            n_strategies: Number of strategies
+            
+        Returns:
+            Dict of per-trade arrays (prices, size, entry value, commission, slippage,
+            pnl, capital after the trade) and 'final_capital' per strategy
+        """
+        n_trades = len(strategy)
+        n = len(opens)
+        at_end = exit_bar >= n
+        entry_price = opens[entry_bar] * (1 + self.slippage)
+        exit_price = np.where(at_end, closes[-1] if n else 0.0, opens[np.minimum(exit_bar, n - 1)] * (1 - self.slippage))
+        
+        # Position of each trade among its strategy's trades
+        first_trade = np.searchsorted(strategy, np.arange(n_strategies))
+        ordinal = np.arange(n_trades) - first_trade[strategy]
+        order = np.lexsort((strategy, ordinal))
+        per_ordinal = np.bincount(ordinal, minlength=1)
+        
+        trades = {name: np.empty(n_trades) for name in
+                  ('position_size', 'entry_value', 'commission', 'slippage', 'pnl', 'capital')}
+        capital = np.full(n_strategies, float(self.initial_capital))
+        offset = 0
+        for count in per_ordinal:
+            rows = order[offset:offset + count]
+            offset += count
+            owners = strategy[rows]
+            
+            position_size = self._calculate_position_size(capital[owners], entry_price[rows])
+            entry_value = entry_price[rows] * position_size
+            entry_commission = self._calculate_commission(entry_value)
+            entry_slippage = self._calculate_slippage(entry_value)
+            exit_value = exit_price[rows] * position_size
+            commission = entry_commission + self._calculate_commission(exit_value)
+            slippage = entry_slippage + self._calculate_slippage(exit_value)
+            pnl = exit_value - entry_value - commission - slippage
+            capital[owners] += pnl
+            
+            trades['position_size'][rows] = position_size
+            trades['entry_value'][rows] = entry_value
+            trades['commission'][rows] = entry_commission
+            trades['slippage'][rows] = entry_slippage
+            trades['pnl'][rows] = pnl
+            trades['capital'][rows] = capital[owners]
+        
+        trades['entry_price'] = entry_price
+        trades['exit_price'] = exit_price
+        trades['final_capital'] = capital
+        return trades
     
-    def _calculate_slippage(self, trade_value: float) -> float:
-        """Calculate slippage for a trade"""
-        return trade_value * self.slippage
\ No newline at end of file
+    def _batch_equity(self,
+                      closes: np.ndarray,
+                      strategy: np.ndarray,
+                      entry_bar: np.ndarray,
+                      exit_bar: np.ndarray,
+                      position_size: np.ndarray,
+                      entry_value: np.ndarray,
+                      capital: np.ndarray,
+                      equity: np.ndarray,
+                      positions: np.ndarray) -> None:
+        """
+        Fill the equity and position rows of a block of strategies from their trades.
+        
+        Each row is a run of flat and held segments. Segment values (realized
+        capital, and size / entry value while held) are repeated over the
+        bars of the segment, so the rows are built in a few dense passes.
+        
+        Args:
+            closes: Close prices of the bars
+            strategy: Strategy of each trade, relative to the block
+            entry_bar: Entry bar of each trade
+            exit_bar: Exit bar of each trade (len(closes) for trades still open at the end)
+            position_size: Size of each trade
+            entry_value: Entry price x size of each trade
+            capital: Capital after each trade closes
+            equity: Output strategies x bars equity matrix
+            positions: Output strategies x bars position matrix
+        """
+        width, n = equity.shape
+        initial_capital = float(self.initial_capital)
+        
+        # Capital before each trade: after the strategy's previous trade, or the initial capital
+        first = np.ones(len(strategy), dtype=bool)
+        first[1:] = strategy[1:] != strategy[:-1]
+        capital_before = np.empty(len(strategy))
+        capital_before[first] = initial_capital
+        capital_before[~first] = capital[:-1][~first[1:]]
+        
+        # Segments start at each row, entry and signal exit (positions in the flattened block)
+        closes_in_data = exit_bar < n
+        starts = np.concatenate([
+            np.arange(width) * n,
+            strategy * n + entry_bar,
+            strategy[closes_in_data] * n + exit_bar[closes_in_data]
+        ])
+        realized = np.concatenate([np.full(width, initial_capital), capital_before, capital[closes_in_data]])
+        size = np.concatenate([np.zeros(width), position_size, np.zeros(closes_in_data.sum())])
+        value = np.concatenate([np.zeros(width), entry_value, np.zeros(closes_in_data.sum())])
+        held = np.concatenate([np.zeros(width, dtype=bool), np.ones(len(strategy), dtype=bool),
+                               np.zeros(closes_in_data.sum(), dtype=bool)])
+        
+        order = np.argsort(starts, kind='stable')
+        lengths = np.diff(np.append(starts[order], width * n))
+        realized = np.repeat(realized[order], lengths).reshape(width, n)
+        size = np.repeat(size[order], lengths).reshape(width, n)
+        held = np.repeat(held[order], lengths).reshape(width, n)
+        unrealized = size * closes - np.repeat(value[order], lengths).reshape(width, n)
+        equity[:] = np.where(held, realized + unrealized, realized)
+        positions[:] = size
+        
+        # Trades still open at the end are closed at the last close
+        equity[strategy[~closes_in_data], -1] = capital[~closes_in_data]
+    
+    def _batch_ledgers(self,
+                       dates: np.ndarray,
+                       strategy: np.ndarray,
+                       entry_bar: np.ndarray,
+                       exit_bar: np.ndarray,
+                       trades: Dict[str, np.ndarray],
+                       n_strategies: int) -> List[TradeLedger]:
+        """Split the batch's trades into one ledger per strategy"""
+        n = len(dates)
+        at_end = exit_bar >= n
+        exit_reason = np.where(at_end, EXIT_REASONS.index('end_of_data'), EXIT_REASONS.index('signal'))
+        exit_dates = dates[np.minimum(exit_bar, n - 1)]
+        bounds = np.searchsorted(strategy, np.arange(n_strategies + 1))
+        
+        ledgers = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            ledger = TradeLedger(self.data['date'].dtype, capacity=hi - lo)
+            ledger.extend(
+                entry_date=dates[entry_bar[lo:hi]],
+                exit_date=exit_dates[lo:hi],
+                entry_price=trades['entry_price'][lo:hi],
+                exit_price=trades['exit_price'][lo:hi],
+                position_size=trades['position_size'][lo:hi],
+                direction=1,
+                pnl=trades['pnl'][lo:hi],
+                pnl_pct=(trades['pnl'][lo:hi] / trades['entry_value'][lo:hi]) * 100,
+                commission=trades['commission'][lo:hi],
+                slippage=trades['slippage'][lo:hi],
+                exit_reason=exit_reason[lo:hi]
+            )
+            ledgers.append(ledger)
+        return ledgers
+
+
+def _batch_trades(signal: np.ndarray, first_strategy: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Entry and exit bars of the long trades of a block of strategies.
+    
+    Same rule as BacktestEngine._simulate_chunk: a long is held on bar i when
+    the last buy/sell signal before it was a buy. Only the buy/sell signals
+    are visited, so the cost past finding them grows with the signal count.
+    
+    Args:
+        signal: Bars x strategies signal matrix
+        first_strategy: Number of the block's first strategy
+        
+    Returns:
+        Tuple of (strategy, entry bar, exit bar) arrays ordered by strategy then
+        time; trades still open at the end have exit bar len(signal)
+    """
+    n, width = signal.shape
+    
+    # Buy/sell signals by strategy then bar; each acts on the next bar
+    acted = signal[:-1].T
+    event_strategy, event_bar = np.nonzero((acted == 1) | (acted == -1))
+    is_buy = acted[event_strategy, event_bar] == 1
+    event_bar = event_bar + 1
+    
+    # A trade opens or closes where the held state changes (every strategy starts flat)
+    was_buy = np.zeros(len(is_buy), dtype=bool)
+    was_buy[1:] = is_buy[:-1]
+    was_buy[1:] &= event_strategy[1:] == event_strategy[:-1]
+    changed = is_buy != was_buy
+    entries = changed & is_buy
+    exits = changed & ~is_buy
+    strategy, entry_bar = event_strategy[entries], event_bar[entries]
+    exit_strategy, exit_bars = event_strategy[exits], event_bar[exits]
+    
+    # Exits pair with entries in order; the last trade of a strategy may still be open
+    exit_bar = np.full(len(entry_bar), n, dtype=np.int64)
+    first_trade = np.searchsorted(strategy, np.arange(width))
+    first_exit = np.searchsorted(exit_strategy, np.arange(width))
+    exit_bar[first_trade[exit_strategy] + np.arange(len(exit_strategy)) - first_exit[exit_strategy]] = exit_bars
+    return strategy + first_strategy, entry_bar, exit_bar
+
+
+def _prepare_data(data: pd.DataFrame, calendar_columns: bool = True) -> pd.DataFrame:
+    """
+    Validate price data and add the columns the engine relies on (modifies data in place).
+
+    Args:
+        data: DataFrame with historical price data
+        calendar_columns: Whether to add 'day_of_week' and 'month' columns
+
+    Returns:
+        The prepared DataFrame
+    """
+    # Ensure required columns exist
+    required_columns = ['open', 'high', 'low', 'close', 'date']
+    for col in required_columns:
+        if col not in data.columns:
+            if col == 'date' and 'datetime' in data.columns:
+                data['date'] = data['datetime']
+            else:
+                raise ValueError(f"Data must contain '{col}' column")
+
+    # Convert date column to datetime if it's not already
+    if not pd.api.types.is_datetime64_any_dtype(data['date']):
+        data['date'] = pd.to_datetime(data['date'])
+
+    # Add day of week and month columns for analysis
+    if calendar_columns:
+        data['day_of_week'] = data['date'].dt.day_name().str.lower()
+        data['month'] = data['date'].dt.month_name().str.lower()
+
+    return data
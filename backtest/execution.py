@@ -7,6 +7,15 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Callable, Optional, Union, Tuple
 
+from .store import SharedPriceStore
+from .columnar import ColumnarDataset
+from .kernels import run_execution_kernel, SIZING_CODES, STATE_FIELDS
+from .ledger import TradeLedger
+from .indicators import IndicatorCache, atr
+from .incremental import RunningATR, WilderATR
+from .intrabar import TickIndex
+from .profiling import Profiler, DISABLED
+
 class TradeExecutor:
     """
     Handles trade execution logic for backtesting.
@@ -20,7 +29,9 @@ class TradeExecutor:
                  take_profit_atr_multiple: float = 3.0,
                  trailing_stop: bool = False,
                  trailing_stop_activation: float = 1.0,
-                 trailing_stop_distance: float = 1.0):
+                 trailing_stop_distance: float = 1.0,
+                 indicator_cache: Optional[IndicatorCache] = None,
+                 profiler: Optional[Profiler] = None):
         """
         Initialize trade executor with execution parameters.
         
@@ -33,6 +44,9 @@ class TradeExecutor:
             trailing_stop: Whether to use trailing stops
             trailing_stop_activation: Multiple of ATR to activate trailing stop
             trailing_stop_distance: Multiple of ATR for trailing stop distance
+            indicator_cache: Optional IndicatorCache that memoizes the ATR across runs on the same data
+            profiler: Optional Profiler timing the phases of apply_execution_logic; its report
+                      is added to the results as 'profile'
         """
         self.position_sizing = position_sizing
         self.risk_per_trade = risk_per_trade
@@ -42,6 +56,8 @@ class TradeExecutor:
         self.trailing_stop = trailing_stop
         self.trailing_stop_activation = trailing_stop_activation
         self.trailing_stop_distance = trailing_stop_distance
+        self.indicator_cache = indicator_cache
+        self.profiler = profiler if profiler is not None else DISABLED
     
     def calculate_position_size(self, 
                                capital: float, 
@@ -143,7 +159,7 @@ class TradeExecutor:
                             direction: str, 
                             entry_price: float,
                             current_stop: float,
-                            atr: Optional[float] = None) -> float:
+                            atr: Optional[Union[float, RunningATR, WilderATR]] = None) -> float:
         """
         Update trailing stop price.
         
@@ -152,7 +168,7 @@ class TradeExecutor:
             direction: Trade direction ('long' or 'short')
             entry_price: Entry price
             current_stop: Current stop loss price
-            atr: Average True Range value (if available)
+            atr: Average True Range value, or an incremental ATR updated bar by bar (if available)
             
         Returns:
             Updated stop loss price
@@ -161,7 +177,7 @@ class TradeExecutor:
             return current_stop
         
         # Default ATR value if not provided
-        atr_value = atr if atr is not None else (entry_price * 0.01)
+        atr_value = float(atr) if atr is not None else (entry_price * 0.01)
         
         if direction == 'long':
             # Check if price has moved enough to activate trailing stop
@@ -227,39 +243,123 @@ class TradeExecutor:
         else:
             return current_bar['low'] <= take_profit
     
+    def _stop_fired_first(self, prices: np.ndarray, stop_loss: float, take_profit: float, direction: str) -> bool:
+        """
+        Whether the stop was reached before the target within a bar's ticks.
+        
+        Args:
+            prices: Tick prices of the bar in time order
+            stop_loss: Stop loss price
+            take_profit: Take profit price
+            direction: Trade direction ('long' or 'short')
+            
+        Returns:
+            False if a tick reached the target first, True otherwise (also when
+            no tick reached either level)
+        """
+        if direction == 'long':
+            stop_ticks = np.flatnonzero(prices <= stop_loss)
+            target_ticks = np.flatnonzero(prices >= take_profit)
+        else:
+            stop_ticks = np.flatnonzero(prices >= stop_loss)
+            target_ticks = np.flatnonzero(prices <= take_profit)
+        
+        if not len(target_ticks):
+            return True
+        return bool(len(stop_ticks)) and stop_ticks[0] < target_ticks[0]
+    
     def apply_execution_logic(self, 
-                             data: pd.DataFrame, 
+                             data: Union[pd.DataFrame, SharedPriceStore, ColumnarDataset], 
                              signals: pd.Series, 
                              initial_capital: float = 10000.0,
                              commission: float = 0.0,
-                             slippage: float = 0.0) -> Dict:
+                             slippage: float = 0.0,
+                             mode: str = 'loop',
+                             ticks: Optional[TickIndex] = None) -> Dict:
         """
         Apply execution logic to signals and generate trades.
         
         Args:
-            data: DataFrame with price data
+            data: DataFrame with price data, or a SharedPriceStore / ColumnarDataset to read without copying
             signals: Series with trade signals (1 for buy, -1 for sell, 0 for no action)
             initial_capital: Initial capital
             commission: Commission per trade (percentage)
             slippage: Slippage per trade (percentage)
+            mode: Simulation engine ('loop' walks DataFrame rows, 'compiled' runs the
+                  array kernel, JIT-compiled with numba when it is installed)
+            ticks: Optional tick or lower-timeframe prices used to decide whether the stop or
+                   the target fired first on bars that reach both (bars need dates; without
+                   ticks the stop is assumed to fire first)
             
         Returns:
             Dictionary with execution results
         """
-        # Ensure data has required columns
-        required_columns = ['open', 'high', 'low', 'close']
-        for col in required_columns:
-            if col not in data.columns:
-                raise ValueError(f"Data must contain '{col}' column")
+        if mode not in ('loop', 'compiled'):
+            raise ValueError("Mode must be 'loop' or 'compiled'")
         
-        # Calculate ATR if not in data
-        if 'atr' not in data.columns:
-            data['atr'] = self._calculate_atr(data, period=14)
+        profiler = self.profiler
+        with profiler:
+            with profiler.span('executor.prepare'):
+                # Attach to shared data read-only; columns are added to a view, never copied
+                shared = isinstance(data, (SharedPriceStore, ColumnarDataset))
+                if shared:
+                    data = data.to_frame()
+                
+                # Ensure data has required columns
+                required_columns = ['open', 'high', 'low', 'close']
+                for col in required_columns:
+                    if col not in data.columns:
+                        raise ValueError(f"Data must contain '{col}' column")
+                
+                # Calculate ATR if not in data
+                if 'atr' not in data.columns:
+                    with profiler.span('executor.atr'):
+                        data['atr'] = self._calculate_atr(data, period=14)
+                
+                # Combine data and signals
+                if len(signals) != len(data):
+                    raise ValueError("Signals length must match data length")
+                
+                combined_data = data if shared else data.copy()
+                combined_data['signal'] = signals
+                
+                # Bar to tick offsets, so only the ticks of ambiguous bars are read
+                tick_offsets = ticks.offsets(self._result_dates(combined_data)) if ticks is not None else None
+            
+            with profiler.span('executor.simulate'):
+                if mode == 'compiled':
+                    results = self._apply_execution_kernel(combined_data, initial_capital, commission, slippage, ticks, tick_offsets)
+                else:
+                    results = self._apply_execution_loop(combined_data, initial_capital, commission, slippage, ticks, tick_offsets)
+            profiler.count_results('executor', len(combined_data), results['trades'])
         
+        if profiler.enabled:
+            results['profile'] = profiler.report()
+        return results
+    
+    def _apply_execution_loop(self,
+                              combined_data: pd.DataFrame,
+                              initial_capital: float,
+                              commission: float,
+                              slippage: float,
+                              ticks: Optional[TickIndex] = None,
+                              tick_offsets: Optional[np.ndarray] = None) -> Dict:
+        """
+        Run the execution logic bar by bar over DataFrame rows.
+        
+        Args:
+            combined_data: Price data with 'atr' and 'signal' columns
+            initial_capital: Initial capital
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+            ticks: Optional tick prices for bars that reach both stop and target
+            tick_offsets: Offsets of each bar's ticks (see TickIndex.offsets)
+            
+        Returns:
+            Dictionary with execution results
+        """
         # Initialize results
-        trades = []
-        equity_curve = [initial_capital]
-        positions = []
+        trades = TradeLedger(combined_data.index.dtype)
         
         current_position = 0
         current_capital = initial_capital
@@ -271,12 +371,10 @@ class TradeExecutor:
         position_size = 0
         direction = ''
         
-        # Combine data and signals
-        if len(signals) != len(data):
-            raise ValueError("Signals length must match data length")
-        
-        combined_data = data.copy()
-        combined_data['signal'] = signals
+        # Preallocate result buffers (one equity point per bar)
+        equity_curve = np.empty(max(len(combined_data), 1), dtype=np.float64)
+        equity_curve[0] = initial_capital
+        positions = np.empty(max(len(combined_data) - 1, 0), dtype=np.float64)
         
         # Simulate trading
         for i in range(1, len(combined_data)):
@@ -290,6 +388,11 @@ class TradeExecutor:
                 target_hit = self.check_take_profit_hit(current_row, take_profit, direction)
                 exit_signal = prev_row['signal'] == -1 if direction == 'long' else prev_row['signal'] == 1
                 
+                if stop_hit and target_hit and ticks is not None:
+                    stop_hit = self._stop_fired_first(
+                        ticks.prices[tick_offsets[i]:tick_offsets[i + 1]], stop_loss, take_profit, direction
+                    )
+                
                 if stop_hit or target_hit or exit_signal:
                     # Determine exit price
                     if stop_hit:
@@ -316,20 +419,19 @@ class TradeExecutor:
                     current_capital += pnl
                     
                     # Record trade
-                    trade = {
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_date': current_row.name if hasattr(current_row, 'name') else i,
-                        'exit_price': exit_price,
-                        'position_size': position_size,
-                        'direction': direction,
-                        'pnl': pnl,
-                        'pnl_pct': (pnl / (entry_price * position_size)) * 100,
-                        'exit_reason': exit_reason,
-                        'commission': commission_amount,
-                        'slippage': 0  # Slippage is already included in the price
-                    }
-                    trades.append(trade)
+                    trades.append(
+                        entry_date=entry_date,
+                        exit_date=current_row.name if hasattr(current_row, 'name') else i,
+                        entry_price=entry_price,
+                        exit_price=exit_price,
+                        position_size=position_size,
+                        direction=direction,
+                        pnl=pnl,
+                        pnl_pct=(pnl / (entry_price * position_size)) * 100,
+                        commission=commission_amount,
+                        slippage=0,  # Slippage is already included in the price
+                        exit_reason=exit_reason
+                    )
                     
                     # Reset trade variables
                     in_trade = False
@@ -396,12 +498,12 @@ class TradeExecutor:
                 else:
                     unrealized_pnl = position_size * (entry_price - current_row['close'])
                 
-                equity_curve.append(current_capital + unrealized_pnl)
+                equity_curve[i] = current_capital + unrealized_pnl
             else:
-                equity_curve.append(current_capital)
+                equity_curve[i] = current_capital
             
             # Record position
-            positions.append(current_position)
+            positions[i - 1] = current_position
         
         # Close any open positions at the end
         if in_trade:
@@ -422,20 +524,19 @@ class TradeExecutor:
             current_capital += pnl
             
             # Record trade
-            trade = {
-                'entry_date': entry_date,
-                'entry_price': entry_price,
-                'exit_date': last_row.name if hasattr(last_row, 'name') else len(combined_data) - 1,
-                'exit_price': exit_price,
-                'position_size': position_size,
-                'direction': direction,
-                'pnl': pnl,
-                'pnl_pct': (pnl / (entry_price * position_size)) * 100,
-                'exit_reason': 'end_of_data',
-                'commission': commission_amount,
-                'slippage': 0  # Slippage is already included in the price
-            }
-            trades.append(trade)
+            trades.append(
+                entry_date=entry_date,
+                exit_date=last_row.name if hasattr(last_row, 'name') else len(combined_data) - 1,
+                entry_price=entry_price,
+                exit_price=exit_price,
+                position_size=position_size,
+                direction=direction,
+                pnl=pnl,
+                pnl_pct=(pnl / (entry_price * position_size)) * 100,
+                commission=commission_amount,
+                slippage=0,  # Slippage is already included in the price
+                exit_reason='end_of_data'
+            )
             
             # Update final equity
             equity_curve[-1] = current_capital
@@ -445,6 +546,7 @@ class TradeExecutor:
             'trades': trades,
             'equity_curve': equity_curve,
             'positions': positions,
+            'dates': self._result_dates(combined_data),
             'final_capital': current_capital,
             'return_pct': ((current_capital / initial_capital) - 1) * 100,
             'data': combined_data
@@ -452,29 +554,175 @@ class TradeExecutor:
         
         return results
     
-    def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
+    def _apply_execution_kernel(self,
+                                combined_data: pd.DataFrame,
+                                initial_capital: float,
+                                commission: float,
+                                slippage: float,
+                                ticks: Optional[TickIndex] = None,
+                                tick_offsets: Optional[np.ndarray] = None) -> Dict:
         """
-        Calculate Average True Range (ATR).
+        Run the execution logic through the array kernel.
         
         Args:
-            data: DataFrame with OHLC data
-            period: ATR period
+            combined_data: Price data with 'atr' and 'signal' columns
+            initial_capital: Initial capital
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+            ticks: Optional tick prices for bars that reach both stop and target
+            tick_offsets: Offsets of each bar's ticks (see TickIndex.offsets)
             
         Returns:
-            Series with ATR values
+            Dictionary with execution results (same layout as the loop)
+        """
+        state = np.zeros(STATE_FIELDS, dtype=np.float64)
+        state[7] = initial_capital
+        
+        with self.profiler.span('executor.kernel'):
+            equity, positions, trade_rows = run_execution_kernel(
+                combined_data['open'].to_numpy(dtype=np.float64),
+                combined_data['high'].to_numpy(dtype=np.float64),
+                combined_data['low'].to_numpy(dtype=np.float64),
+                combined_data['close'].to_numpy(dtype=np.float64),
+                combined_data['atr'].to_numpy(dtype=np.float64),
+                combined_data['signal'].to_numpy(dtype=np.float64),
+                self._kernel_params(commission, slippage),
+                state,
+                tick_offsets=tick_offsets,
+                tick_prices=ticks.prices if ticks is not None else None
+            )
+        
+        index = combined_data.index
+        trades = TradeLedger(index.dtype, capacity=len(trade_rows) + 1)
+        self._record_kernel_trades(trades, trade_rows, index)
+        equity_curve = equity
+        
+        # Close any open positions at the end
+        if state[0]:
+            self._close_kernel_position(
+                trades, state, index[int(state[3])], combined_data['close'].iloc[-1], index[-1], commission
+            )
+            equity_curve[-1] = state[7]
+        
+        current_capital = state[7]
+        return {
+            'trades': trades,
+            'equity_curve': equity_curve,
+            'positions': positions,
+            'dates': self._result_dates(combined_data),
+            'final_capital': current_capital,
+            'return_pct': ((current_capital / initial_capital) - 1) * 100,
+            'data': combined_data
+        }
+    
+    def _result_dates(self, combined_data: pd.DataFrame) -> np.ndarray:
+        """Bar dates aligned with the equity curve (the index when there is no date column)"""
+        if 'date' in combined_data.columns:
+            return combined_data['date'].to_numpy()
+        return combined_data.index.to_numpy()
+    
+    def _kernel_params(self, commission: float, slippage: float) -> np.ndarray:
+        """Pack the execution settings into the kernel parameter vector"""
+        return np.array([
+            SIZING_CODES.get(self.position_sizing, SIZING_CODES['fixed']),
+            self.risk_per_trade,
+            self.fixed_position_size,
+            self.stop_loss_atr_multiple,
+            self.take_profit_atr_multiple,
+            float(self.trailing_stop),
+            self.trailing_stop_activation,
+            self.trailing_stop_distance,
+            commission,
+            slippage
+        ], dtype=np.float64)
+    
+    def _record_kernel_trades(self, trades: TradeLedger, trade_rows: np.ndarray, index: pd.Index, carried_entry_date=None) -> None:
+        """
+        Append kernel trade rows to a ledger.
+        
+        Args:
+            trades: Ledger to append to
+            trade_rows: Closed trades as returned by run_execution_kernel
+            index: Labels of the bars the kernel ran over
+            carried_entry_date: Entry date for a trade opened before these bars (entry bar -1)
         """
-        high = data['high']
-        low = data['low']
-        close = data['close'].shift(1)
+        if not len(trade_rows):
+            return
+        entry_bars = trade_rows[:, 0].astype(np.int64)
+        entry_dates = index[np.maximum(entry_bars, 0)].to_numpy()
+        if (entry_bars < 0).any():
+            entry_dates = entry_dates.astype(trades.entry_date.dtype)
+            entry_dates[entry_bars < 0] = carried_entry_date
         
-        tr1 = high - low
-        tr2 = abs(high - close)
-        tr3 = abs(low - close)
+        trades.extend(
+            entry_date=entry_dates,
+            exit_date=index[trade_rows[:, 1].astype(np.int64)].to_numpy(),
+            entry_price=trade_rows[:, 3],
+            exit_price=trade_rows[:, 4],
+            position_size=trade_rows[:, 5],
+            direction=np.where(trade_rows[:, 2] > 0, 1, -1),
+            pnl=trade_rows[:, 6],
+            pnl_pct=(trade_rows[:, 6] / (trade_rows[:, 3] * trade_rows[:, 5])) * 100,
+            commission=trade_rows[:, 7],
+            slippage=0,  # Slippage is already included in the price
+            exit_reason=trade_rows[:, 8]
+        )
+    
+    def _close_kernel_position(self, trades: TradeLedger, state: np.ndarray, entry_date, exit_price: float, exit_date, commission: float) -> None:
+        """
+        Close the position held in a kernel state vector at the end of the data.
         
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
+        Args:
+            trades: Ledger the closed position is appended to
+            state: Kernel state with an open position, updated in place
+            entry_date: Entry date of the open position
+            exit_price: Exit price (last close)
+            exit_date: Exit date (last bar)
+            commission: Commission per trade (percentage)
+        """
+        direction = 'long' if state[1] > 0 else 'short'
+        entry_price = state[2]
+        position_size = state[6]
         
-        # Fill NaN values with a reasonable default
-        atr = atr.fillna(tr.mean())
+        if direction == 'long':
+            pnl = (exit_price - entry_price) * position_size
+        else:
+            pnl = (entry_price - exit_price) * position_size
+        
+        commission_amount = (entry_price * position_size * commission) + (exit_price * position_size * commission)
+        pnl -= commission_amount
+        
+        state[7] += pnl
+        state[0] = 0.0
+        state[8] = 0.0
         
-        return atr
\ No newline at end of file
+        trades.append(
+            entry_date=entry_date,
+            exit_date=exit_date,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            position_size=position_size,
+            direction=direction,
+            pnl=pnl,
+            pnl_pct=(pnl / (entry_price * position_size)) * 100,
+            commission=commission_amount,
+            slippage=0,  # Slippage is already included in the price
+            exit_reason='end_of_data'
+        )
+    
+    def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> pd.Series:
+        """
+        Calculate Average True Range (ATR).
+        
+        Args:
+            data: DataFrame with OHLC data
+            period: ATR period
+            
+        Returns:
+            Series with ATR values (bars before the first full window get the mean true range)
+        """
+        if self.indicator_cache is not None:
+            values = self.indicator_cache.atr(data, period)
+        else:
+            values = atr(data['high'], data['low'], data['close'], period)
+        return pd.Series(values, index=data.index)
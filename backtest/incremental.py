@@ -0,0 +1,201 @@
+"""
+Incremental indicator module.
+Indicators updated one bar at a time in O(1), for streaming and live trading.
+"""
+
+import math
+from collections import deque
+
+
+class _Incremental:
+    """
+    Base of the incremental indicators.
+
+    `update` takes the next bar and returns the current value, which is
+    NaN until the indicator has seen enough bars. The value is also kept
+    in `value`, and float(indicator) returns it, so an indicator can be
+    passed wherever a float is expected (e.g. TradeExecutor.update_trailing_stop).
+    """
+
+    __slots__ = ('period', 'value', 'count')
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError("Period must be at least 1")
+        self.period = period
+        self.value = math.nan
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the value no longer depends on missing warm-up bars"""
+        return self.count >= self.period
+
+    def __float__(self) -> float:
+        return float(self.value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(period={self.period}, value={self.value})"
+
+
+class RunningSMA(_Incremental):
+    """
+    Simple moving average over a ring buffer (same values as indicators.sma).
+
+    The running sum is recomputed from the buffer once per `period` updates,
+    which keeps the rounding error from growing on long streams at O(1)
+    amortized cost.
+    """
+
+    __slots__ = ('_buffer', '_sum', '_pos')
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self._buffer = [0.0] * period
+        self._sum = 0.0
+        self._pos = 0
+
+    def update(self, x: float) -> float:
+        """Add the next value and return the average of the last `period` values"""
+        self._sum += x - self._buffer[self._pos]
+        self._buffer[self._pos] = x
+        self._pos += 1
+        if self._pos == self.period:
+            self._pos = 0
+            self._sum = math.fsum(self._buffer)
+        self.count += 1
+        if self.count >= self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+
+class RunningEMA(_Incremental):
+    """Exponential moving average with span `period`, seeded with the first value (same values as indicators.ema)"""
+
+    __slots__ = ('alpha',)
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.alpha = 2.0 / (period + 1)
+
+    def update(self, x: float) -> float:
+        """Add the next value and return the average"""
+        if self.count == 0:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        self.count += 1
+        return self.value
+
+
+class RunningATR(_Incremental):
+    """
+    Average True Range as a simple average of the true range.
+
+    From bar `period` - 1 on the values match indicators.atr. Before that,
+    the batch version fills in the mean true range of the whole history,
+    which is not known yet bar by bar, so the mean of the true ranges seen
+    so far is used instead.
+    """
+
+    __slots__ = ('_tr', '_tr_sum', '_prev_close')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self._tr = RunningSMA(period)
+        self._tr_sum = 0.0
+        self._prev_close = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add the next bar and return the ATR"""
+        tr = _true_range(high, low, self._prev_close)
+        self._prev_close = close
+        self._tr.update(tr)
+        self.count += 1
+        if self._tr.ready:
+            self.value = self._tr.value
+        else:
+            self._tr_sum += tr
+            self.value = self._tr_sum / self.count
+        return self.value
+
+
+class WilderATR(_Incremental):
+    """
+    Wilder's ATR: the mean true range of the first `period` bars, then
+    smoothed as (previous * (period - 1) + true range) / period (same values
+    as indicators.wilder_atr).
+    """
+
+    __slots__ = ('_tr_sum', '_prev_close')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self._tr_sum = 0.0
+        self._prev_close = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add the next bar and return the ATR (NaN during the first `period` - 1 bars)"""
+        tr = _true_range(high, low, self._prev_close)
+        self._prev_close = close
+        self.count += 1
+        if self.count < self.period:
+            self._tr_sum += tr
+        elif self.count == self.period:
+            self.value = (self._tr_sum + tr) / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        return self.value
+
+
+class RollingMax(_Incremental):
+    """Highest of the last `period` values with a monotonic deque (same values as indicators.rolling_max)"""
+
+    __slots__ = ('_window',)
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self._window = deque()  # (bar, value) pairs with decreasing values
+
+    def update(self, x: float) -> float:
+        """Add the next value and return the maximum of the last `period` values"""
+        window = self._window
+        while window and window[-1][1] <= x:
+            window.pop()
+        window.append((self.count, x))
+        if window[0][0] <= self.count - self.period:
+            window.popleft()
+        self.count += 1
+        if self.count >= self.period:
+            self.value = window[0][1]
+        return self.value
+
+
+class RollingMin(_Incremental):
+    """Lowest of the last `period` values with a monotonic deque (same values as indicators.rolling_min)"""
+
+    __slots__ = ('_window',)
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self._window = deque()  # (bar, value) pairs with increasing values
+
+    def update(self, x: float) -> float:
+        """Add the next value and return the minimum of the last `period` values"""
+        window = self._window
+        while window and window[-1][1] >= x:
+            window.pop()
+        window.append((self.count, x))
+        if window[0][0] <= self.count - self.period:
+            window.popleft()
+        self.count += 1
+        if self.count >= self.period:
+            self.value = window[0][1]
+        return self.value
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    """True range of one bar (high - low when there is no previous close)"""
+    if prev_close != prev_close:  # NaN
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
@@ -0,0 +1,344 @@
+"""
+Technical indicator module.
+Array indicators and a cache that memoizes them by data content and parameters.
+"""
+
+import hashlib
+import os
+import tempfile
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Callable, Optional, Tuple, Union
+
+ArrayLike = Union[np.ndarray, pd.Series]
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """
+    True range of each bar (high - low on the first bar).
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+
+    Returns:
+        Array with one value per bar
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    prev_close = np.empty(len(high))
+    prev_close[:1] = np.nan
+    prev_close[1:] = np.asarray(close, dtype=np.float64)[:-1]
+
+    # fmax skips the missing previous close, like a NaN-skipping row max
+    with np.errstate(invalid='ignore'):
+        return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def sma(values: ArrayLike, period: int) -> np.ndarray:
+    """Simple moving average (NaN until the first full window)"""
+    return pd.Series(np.asarray(values, dtype=np.float64)).rolling(window=period).mean().to_numpy()
+
+
+def ema(values: ArrayLike, period: int) -> np.ndarray:
+    """Exponential moving average with span `period`, seeded with the first value"""
+    return pd.Series(np.asarray(values, dtype=np.float64)).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def stdev(values: ArrayLike, period: int) -> np.ndarray:
+    """Rolling sample standard deviation (NaN until the first full window)"""
+    return pd.Series(np.asarray(values, dtype=np.float64)).rolling(window=period).std().to_numpy()
+
+
+def rolling_max(values: ArrayLike, period: int) -> np.ndarray:
+    """Highest value of the last `period` values (NaN until the first full window)"""
+    return pd.Series(np.asarray(values, dtype=np.float64)).rolling(window=period).max().to_numpy()
+
+
+def rolling_min(values: ArrayLike, period: int) -> np.ndarray:
+    """Lowest value of the last `period` values (NaN until the first full window)"""
+    return pd.Series(np.asarray(values, dtype=np.float64)).rolling(window=period).min().to_numpy()
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    Average True Range as a simple average of the true range.
+
+    Bars before the first full window get the mean true range, as in
+    TradeExecutor's ATR.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: ATR period
+
+    Returns:
+        Array with one value per bar
+    """
+    tr = true_range(high, low, close)
+    values = sma(tr, period)
+    if not len(tr):
+        return values
+    return np.where(np.isnan(values), np.nanmean(tr), values)
+
+
+def wilder_atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """
+    Wilder's Average True Range.
+
+    The first value (bar `period` - 1) is the mean true range of the first
+    `period` bars; each later value is (previous * (period - 1) + true range) / period.
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        period: ATR period
+
+    Returns:
+        Array with one value per bar (NaN before the first value)
+    """
+    tr = true_range(high, low, close)
+    values = np.full(len(tr), np.nan)
+    if len(tr) >= period:
+        seeded = np.concatenate([[tr[:period].mean()], tr[period:]])
+        values[period - 1:] = pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return values
+
+
+# Indicators available through IndicatorCache.get
+INDICATORS: Dict[str, Callable] = {
+    'sma': sma,
+    'ema': ema,
+    'stdev': stdev,
+    'rolling_max': rolling_max,
+    'rolling_min': rolling_min,
+    'true_range': true_range,
+    'atr': atr,
+    'wilder_atr': wilder_atr
+}
+
+
+def fingerprint(values: ArrayLike) -> str:
+    """
+    Content hash of an array (dtype, shape and bytes).
+
+    Args:
+        values: Array or Series
+
+    Returns:
+        Hex digest identifying the values
+    """
+    array = np.ascontiguousarray(np.asarray(values))
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(array.view(np.uint8).reshape(-1) if array.dtype.kind != 'O' else repr(array.tolist()).encode())
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Memoizes indicator arrays keyed on (data fingerprint, indicator, parameters).
+
+    Entries are kept in memory up to `max_bytes`, evicting the least
+    recently used first. With a `directory`, every computed indicator is
+    also written there as a .npy file, so other processes and later runs
+    over the same data load it instead of computing it again; files beyond
+    `max_disk_bytes` are deleted least recently used first. Returned
+    arrays are read-only because they are shared between callers.
+    """
+
+    def __init__(self,
+                 max_bytes: int = 256 * 2**20,
+                 directory: Optional[str] = None,
+                 max_disk_bytes: int = 2**30):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget of the in-memory tier
+            directory: Optional directory of the on-disk tier (created if missing)
+            max_disk_bytes: Disk budget of the on-disk tier
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self._files = OrderedDict()
+        self.disk_nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    def get(self, name: str, *inputs: ArrayLike, **params) -> np.ndarray:
+        """
+        Value of an indicator, computed only if it is not cached.
+
+        Args:
+            name: Indicator name (a key of INDICATORS)
+            *inputs: Input arrays or Series, in the indicator's argument order
+            **params: Indicator parameters
+
+        Returns:
+            Read-only array with one value per bar
+        """
+        if name not in INDICATORS:
+            raise ValueError(f"Indicator must be one of {tuple(INDICATORS)}")
+
+        key = self._key(name, inputs, params)
+        values = self._entries.get(key)
+        if values is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return values
+
+        values = self._load(key)
+        if values is None:
+            self.misses += 1
+            values = INDICATORS[name](*inputs, **params)
+            self._save(key, values)
+        else:
+            self.hits += 1
+
+        values.flags.writeable = False
+        self._store(key, values)
+        return values
+
+    def sma(self, values: ArrayLike, period: int) -> np.ndarray:
+        """Cached simple moving average"""
+        return self.get('sma', values, period=period)
+
+    def ema(self, values: ArrayLike, period: int) -> np.ndarray:
+        """Cached exponential moving average"""
+        return self.get('ema', values, period=period)
+
+    def stdev(self, values: ArrayLike, period: int) -> np.ndarray:
+        """Cached rolling standard deviation"""
+        return self.get('stdev', values, period=period)
+
+    def rolling_max(self, values: ArrayLike, period: int) -> np.ndarray:
+        """Cached rolling maximum"""
+        return self.get('rolling_max', values, period=period)
+
+    def rolling_min(self, values: ArrayLike, period: int) -> np.ndarray:
+        """Cached rolling minimum"""
+        return self.get('rolling_min', values, period=period)
+
+    def atr(self, data: pd.DataFrame, period: int = 14) -> np.ndarray:
+        """Cached Average True Range of a DataFrame with 'high', 'low' and 'close' columns"""
+        return self.get('atr', data['high'], data['low'], data['close'], period=period)
+
+    def wilder_atr(self, data: pd.DataFrame, period: int = 14) -> np.ndarray:
+        """Cached Wilder's ATR of a DataFrame with 'high', 'low' and 'close' columns"""
+        return self.get('wilder_atr', data['high'], data['low'], data['close'], period=period)
+
+    def clear(self, disk: bool = False) -> None:
+        """
+        Drop the in-memory tier.
+
+        Args:
+            disk: Whether to also delete the files of the on-disk tier
+        """
+        self._entries.clear()
+        self.nbytes = 0
+        if disk and self.directory is not None:
+            self._scan()
+            for key in list(self._files):
+                self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, name: str, inputs: Tuple, params: Dict) -> str:
+        """Cache key of an indicator call"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(name.encode())
+        digest.update(repr(sorted(params.items())).encode())
+        for values in inputs:
+            digest.update(fingerprint(values).encode())
+        return digest.hexdigest()
+
+    def _store(self, key: str, values: np.ndarray) -> None:
+        """Add an entry to the in-memory tier and evict down to the budget"""
+        if values.nbytes > self.max_bytes:
+            return
+        self._entries[key] = values
+        self.nbytes += values.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        """Read an entry from the on-disk tier"""
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            values = np.load(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        if key in self._files:
+            self._files.move_to_end(key)
+        return values
+
+    def _save(self, key: str, values: np.ndarray) -> None:
+        """Write an entry to the on-disk tier (atomically, so concurrent readers never see partial files)"""
+        if self.directory is None:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self.disk_nbytes -= self._files.pop(key, 0)
+        self._files[key] = os.path.getsize(self._path(key))
+        self.disk_nbytes += self._files[key]
+        if self.disk_nbytes > self.max_disk_bytes:
+            self._scan()
+            self._evict(keep=key)
+
+    def _scan(self) -> None:
+        """Index the files on disk (including other processes' writes) from oldest to newest use"""
+        found = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith('.npy'):
+                    try:
+                        stat = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    found.append((stat.st_mtime, item.name[:-len('.npy')], stat.st_size))
+        found.sort()
+        self._files = OrderedDict((key, size) for _, key, size in found)
+        self.disk_nbytes = sum(self._files.values())
+
+    def _evict(self, keep: str) -> None:
+        """Delete the least recently used files until the disk budget is met"""
+        for key in list(self._files):
+            if self.disk_nbytes <= self.max_disk_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        self.disk_nbytes -= self._files.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
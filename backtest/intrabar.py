@@ -0,0 +1,87 @@
+"""
+Intrabar data module.
+Indexes tick or lower-timeframe prices by bar so ambiguous bars can be resolved in time order.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Union
+
+from .columnar import ColumnarDataset
+
+
+class TickIndex:
+    """
+    Tick prices in time order with a lookup from bars to their ticks.
+
+    The ticks of a bar are those from its date up to the next bar's date
+    (bars are labelled by their open time). Offsets for a set of bars are
+    found with one binary search per bar, so resolving a bar only touches
+    its own ticks.
+    """
+
+    def __init__(self, dates: np.ndarray, prices: np.ndarray):
+        """
+        Initialize the index.
+
+        Args:
+            dates: Tick timestamps (datetime64), sorted ascending
+            prices: Tick prices (trade prices, or closes of lower-timeframe bars)
+        """
+        self.dates = np.asarray(dates, dtype='datetime64[ns]')
+        self.prices = np.asarray(prices, dtype=np.float64)
+        if len(self.dates) != len(self.prices):
+            raise ValueError("Tick dates and prices must have the same length")
+        if len(self.dates) > 1 and (self.dates[1:] < self.dates[:-1]).any():
+            raise ValueError("Ticks must be sorted by date")
+
+    @classmethod
+    def from_frame(cls,
+                   ticks: Union[pd.DataFrame, ColumnarDataset],
+                   date_column: str = 'date',
+                   price_column: str = 'price') -> 'TickIndex':
+        """
+        Build the index from a DataFrame or columnar dataset of ticks.
+
+        Args:
+            ticks: Ticks with a date column (or a DatetimeIndex) and a price column
+            date_column: Name of the date column
+            price_column: Name of the price column ('close' for lower-timeframe bars)
+
+        Returns:
+            TickIndex over the ticks (memory-mapped columns are not copied)
+        """
+        if isinstance(ticks, ColumnarDataset):
+            return cls(ticks[date_column], ticks[price_column])
+        if date_column in ticks.columns:
+            dates = pd.to_datetime(ticks[date_column]).to_numpy()
+        else:
+            dates = pd.DatetimeIndex(ticks.index).to_numpy()
+        return cls(dates, ticks[price_column].to_numpy(dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def offsets(self, bar_dates: np.ndarray) -> np.ndarray:
+        """
+        Tick offsets of a sequence of bars.
+
+        Args:
+            bar_dates: Open times of the bars, sorted ascending
+
+        Returns:
+            Array of len(bar_dates) + 1 offsets; the ticks of bar i are
+            prices[offsets[i]:offsets[i + 1]] (the last bar runs to the last tick)
+
+        Raises:
+            ValueError: If the bars are labelled by numbers rather than dates
+        """
+        bar_dates = np.asarray(bar_dates)
+        if bar_dates.dtype.kind in 'biuf':
+            # A positional index would be read as nanoseconds since the epoch
+            raise ValueError("Tick resolution needs bar dates (a 'date' column or a DatetimeIndex)")
+        bar_dates = pd.to_datetime(bar_dates).to_numpy(dtype='datetime64[ns]')
+        offsets = np.empty(len(bar_dates) + 1, dtype=np.int64)
+        offsets[:-1] = np.searchsorted(self.dates, bar_dates, side='left')
+        offsets[-1] = len(self.dates)
+        return offsets
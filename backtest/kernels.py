@@ -0,0 +1,295 @@
+"""
+Array-based execution kernels.
+Runs the path-dependent trade state machine over contiguous float64 arrays.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, fall back to the plain Python loop
+    njit = None
+    NUMBA_AVAILABLE = False
+
+# Position sizing method codes
+SIZING_CODES = {'fixed': 0, 'percent_equity': 1, 'percent_risk': 2}
+
+# Exit reason codes (index into EXIT_REASONS)
+EXIT_REASONS = ('stop_loss', 'take_profit', 'signal', 'end_of_data')
+
+# Layout of one trade record in the flat trade buffer
+TRADE_FIELDS = 9  # entry_bar, exit_bar, direction, entry_price, exit_price, position_size, pnl, commission, exit_reason
+
+# Layout of the state vector carried between kernel calls
+STATE_FIELDS = 9  # in_trade, direction, entry_price, entry_bar, stop_loss, take_profit, position_size, capital, current_position
+
+
+def _execution_loop(open_, high, low, close, atr, signal, start, params, state,
+                    equity, positions, trades, n_trades, tick_offsets, tick_prices):
+    """
+    Simulate stop-loss, take-profit and trailing stop execution bar by bar.
+
+    Mirrors TradeExecutor.apply_execution_logic. Processing starts at bar
+    `start` and stops early when the trade buffer is full, so the caller can
+    grow the buffer and resume from the returned bar with the same state.
+
+    Args:
+        open_, high, low, close, atr, signal: Per-bar inputs
+        start: First bar to process (>= 1)
+        params: sizing code, risk_per_trade, fixed_position_size, stop_loss_atr_multiple,
+                take_profit_atr_multiple, trailing_stop, trailing_stop_activation,
+                trailing_stop_distance, commission, slippage
+        state: Position state (STATE_FIELDS values), updated in place
+        equity: Equity output, written for bars start..n-1
+        positions: Position value output, written for bars start..n-1 (offset by one)
+        trades: Flat trade buffer (TRADE_FIELDS values per trade)
+        n_trades: Number of trades already in the buffer
+        tick_offsets: Bar to tick index (ticks of bar i are tick_prices[tick_offsets[i]:tick_offsets[i + 1]]),
+                      empty to always assume the stop fired first when a bar hits stop and target
+        tick_prices: Tick prices in time order
+
+    Returns:
+        Tuple of (next bar to process, number of trades in the buffer)
+    """
+    sizing = params[0]
+    risk_per_trade = params[1]
+    fixed_position_size = params[2]
+    stop_loss_multiple = params[3]
+    take_profit_multiple = params[4]
+    trailing_stop = params[5]
+    trailing_activation = params[6]
+    trailing_distance = params[7]
+    commission = params[8]
+    slippage = params[9]
+
+    in_trade = state[0]
+    direction = state[1]
+    entry_price = state[2]
+    entry_bar = state[3]
+    stop_loss = state[4]
+    take_profit = state[5]
+    position_size = state[6]
+    capital = state[7]
+    current_position = state[8]
+
+    capacity = len(trades) // TRADE_FIELDS
+    n = len(close)
+    i = start
+    while i < n:
+        prev_signal = signal[i - 1]
+
+        if in_trade != 0.0:
+            if n_trades == capacity:
+                break
+
+            # Check for exit conditions
+            if direction > 0.0:
+                stop_hit = low[i] <= stop_loss
+                target_hit = high[i] >= take_profit
+                exit_signal = prev_signal == -1.0
+            else:
+                stop_hit = high[i] >= stop_loss
+                target_hit = low[i] <= take_profit
+                exit_signal = prev_signal == 1.0
+
+            # Both levels inside one bar: the first tick that reaches either decides
+            if stop_hit and target_hit and len(tick_offsets) > 0:
+                for t in range(int(tick_offsets[i]), int(tick_offsets[i + 1])):
+                    price = tick_prices[t]
+                    if (price <= stop_loss) if direction > 0.0 else (price >= stop_loss):
+                        break
+                    if (price >= take_profit) if direction > 0.0 else (price <= take_profit):
+                        stop_hit = False
+                        break
+
+            if stop_hit or target_hit or exit_signal:
+                if stop_hit:
+                    exit_price = stop_loss
+                    exit_reason = 0.0
+                elif target_hit:
+                    exit_price = take_profit
+                    exit_reason = 1.0
+                elif direction > 0.0:
+                    exit_price = open_[i] * (1 - slippage)
+                    exit_reason = 2.0
+                else:
+                    exit_price = open_[i] * (1 + slippage)
+                    exit_reason = 2.0
+
+                if direction > 0.0:
+                    pnl = (exit_price - entry_price) * position_size
+                else:
+                    pnl = (entry_price - exit_price) * position_size
+
+                commission_amount = (entry_price * position_size * commission) + (exit_price * position_size * commission)
+                pnl -= commission_amount
+                capital += pnl
+
+                # Record trade
+                k = n_trades * TRADE_FIELDS
+                trades[k] = entry_bar
+                trades[k + 1] = i
+                trades[k + 2] = direction
+                trades[k + 3] = entry_price
+                trades[k + 4] = exit_price
+                trades[k + 5] = position_size
+                trades[k + 6] = pnl
+                trades[k + 7] = commission_amount
+                trades[k + 8] = exit_reason
+                n_trades += 1
+
+                in_trade = 0.0
+                current_position = 0.0
+
+            else:
+                # Update trailing stop if enabled
+                if trailing_stop != 0.0:
+                    atr_value = atr[i]
+                    if direction > 0.0:
+                        if close[i] >= entry_price + (atr_value * trailing_activation):
+                            new_stop = close[i] - (atr_value * trailing_distance)
+                            if new_stop > stop_loss:
+                                stop_loss = new_stop
+                    else:
+                        if close[i] <= entry_price - (atr_value * trailing_activation):
+                            new_stop = close[i] + (atr_value * trailing_distance)
+                            if new_stop < stop_loss:
+                                stop_loss = new_stop
+
+                if direction > 0.0:
+                    current_position = position_size * close[i]
+                else:
+                    current_position = position_size * (2 * entry_price - close[i])
+
+        elif prev_signal == 1.0 or prev_signal == -1.0:
+            # Enter long on a buy signal, short on a sell signal
+            atr_value = atr[i]
+            if prev_signal == 1.0:
+                direction = 1.0
+                entry_price = open_[i] * (1 + slippage)
+                stop_loss = entry_price - (atr_value * stop_loss_multiple)
+                take_profit = entry_price + (atr_value * take_profit_multiple)
+            else:
+                direction = -1.0
+                entry_price = open_[i] * (1 - slippage)
+                stop_loss = entry_price + (atr_value * stop_loss_multiple)
+                take_profit = entry_price - (atr_value * take_profit_multiple)
+            entry_bar = i
+
+            # Calculate position size
+            if sizing == 1.0:
+                position_size = (capital * risk_per_trade) / entry_price
+            elif sizing == 2.0:
+                risk_per_unit = abs(entry_price - stop_loss)
+                if risk_per_unit == 0:
+                    position_size = fixed_position_size
+                else:
+                    position_size = (capital * risk_per_trade) / risk_per_unit
+            else:
+                position_size = fixed_position_size
+
+            in_trade = 1.0
+            current_position = position_size * entry_price
+
+        # Update equity curve
+        if in_trade != 0.0:
+            if direction > 0.0:
+                unrealized_pnl = position_size * close[i] - (position_size * entry_price)
+            else:
+                unrealized_pnl = position_size * (entry_price - close[i])
+            equity[i] = capital + unrealized_pnl
+        else:
+            equity[i] = capital
+
+        positions[i - 1] = current_position
+        i += 1
+
+    state[0] = in_trade
+    state[1] = direction
+    state[2] = entry_price
+    state[3] = entry_bar
+    state[4] = stop_loss
+    state[5] = take_profit
+    state[6] = position_size
+    state[7] = capital
+    state[8] = current_position
+
+    return i, n_trades
+
+
+if NUMBA_AVAILABLE:
+    _compiled_execution_loop = njit(cache=True, nogil=True)(_execution_loop)
+
+
+def run_execution_kernel(open_: np.ndarray,
+                         high: np.ndarray,
+                         low: np.ndarray,
+                         close: np.ndarray,
+                         atr: np.ndarray,
+                         signal: np.ndarray,
+                         params: np.ndarray,
+                         state: np.ndarray,
+                         use_numba: bool = True,
+                         tick_offsets: Optional[np.ndarray] = None,
+                         tick_prices: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run the execution state machine over a full set of bars.
+
+    Args:
+        open_, high, low, close, atr, signal: Per-bar float64 arrays of equal length
+        params: Execution parameters (see _execution_loop)
+        state: Initial position state, updated in place
+        use_numba: Use the JIT-compiled loop when numba is installed
+        tick_offsets: Optional bar to tick index (len(close) + 1 offsets) used to resolve
+                      bars that hit both stop and target
+        tick_prices: Tick prices the offsets point into
+
+    Returns:
+        Tuple of (equity, positions, trades) where trades has one row of
+        TRADE_FIELDS values per closed trade
+    """
+    n = len(close)
+    equity = np.empty(n, dtype=np.float64)
+    if n:
+        equity[0] = state[7]
+    positions = np.empty(max(n - 1, 0), dtype=np.float64)
+    capacity = min(n // 2 + 1, 4096)
+    if tick_offsets is None:
+        tick_offsets = np.empty(0, dtype=np.int64)
+        tick_prices = np.empty(0, dtype=np.float64)
+    else:
+        tick_offsets = np.ascontiguousarray(tick_offsets, dtype=np.int64)
+        tick_prices = np.ascontiguousarray(tick_prices, dtype=np.float64)
+
+    if use_numba and NUMBA_AVAILABLE:
+        inputs = [np.ascontiguousarray(a, dtype=np.float64) for a in (open_, high, low, close, atr, signal)]
+        trades = np.empty(capacity * TRADE_FIELDS, dtype=np.float64)
+        start, n_trades = 1, 0
+        while True:
+            start, n_trades = _compiled_execution_loop(*inputs, start, params, state,
+                                                       equity, positions, trades, n_trades,
+                                                       tick_offsets, tick_prices)
+            if start >= n:
+                break
+            trades = np.concatenate([trades, np.empty_like(trades)])
+        trades = trades[:n_trades * TRADE_FIELDS]
+    else:
+        # Python lists index much faster than NumPy scalars in an interpreted loop
+        # (ticks stay arrays: only the few ambiguous bars read them)
+        inputs = [np.asarray(a, dtype=np.float64).tolist() for a in (open_, high, low, close, atr, signal)]
+        py_params = params.tolist()
+        py_state = state.tolist()
+        py_equity = equity.tolist()
+        py_positions = [0.0] * len(positions)
+        trades = [0.0] * ((n // 2 + 1) * TRADE_FIELDS)
+        _, n_trades = _execution_loop(*inputs, 1, py_params, py_state,
+                                      py_equity, py_positions, trades, 0,
+                                      tick_offsets, tick_prices)
+        state[:] = py_state
+        equity = np.array(py_equity, dtype=np.float64)
+        positions = np.array(py_positions, dtype=np.float64)
+        trades = np.array(trades[:n_trades * TRADE_FIELDS], dtype=np.float64)
+
+    return equity, positions, trades.reshape(-1, TRADE_FIELDS)
@@ -0,0 +1,502 @@
+"""
+Trade ledger module.
+Stores closed trades column-wise in typed NumPy arrays.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Iterator, Optional, Tuple, Union
+
+from .kernels import EXIT_REASONS
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.0
+    guess_datetime_format = None
+
+# Numeric trade fields and their storage types
+_NUMERIC_FIELDS = {
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'position_size': np.float64,
+    'pnl': np.float64,
+    'pnl_pct': np.float64,
+    'commission': np.float64,
+    'slippage': np.float64,
+    'direction': np.int8,      # 1 for long, -1 for short
+    'exit_reason': np.int8     # index into EXIT_REASONS
+}
+
+# Trade report headers recognized for each field (matched ignoring case and surrounding spaces)
+REPORT_COLUMNS = {
+    'entry_date': ('entry_date', 'entry date', 'date', 'data', 'data entrada', 'abertura'),
+    'exit_date': ('exit_date', 'exit date', 'data saída', 'data saida', 'fechamento'),
+    'entry_price': ('entry_price', 'entry price', 'preço entrada', 'preco entrada'),
+    'exit_price': ('exit_price', 'exit price', 'preço saída', 'preco saida'),
+    'position_size': ('position_size', 'quantity', 'qty', 'size', 'quantidade', 'qtd'),
+    'direction': ('direction', 'side', 'direção', 'direcao', 'lado'),
+    'pnl': ('pnl', 'result', 'profit', 'resultado', 'res. operação', 'res. operacao'),
+    'commission': ('commission', 'fees', 'custos', 'taxas')
+}
+
+# Direction labels read as short trades (ignoring case); any other label is long
+SHORT_LABELS = frozenset({'short', 'sell', 's', '-1', 'venda', 'vendido', 'v'})
+
+# Width of the strftime fields understood by the fixed-width date parser
+_DATE_FIELDS = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2}
+
+
+class TradeLedger:
+    """
+    Closed trades held in typed NumPy arrays, one array per field.
+
+    The ledger also behaves like the list of trade dictionaries the engines
+    used to return (len, iteration and indexing yield dicts, slicing yields
+    a ledger), so reading code keeps working while metrics and visualization
+    read the arrays. Trades are added with append(**fields) or extend();
+    a trade dict from another ledger can be appended as append(**trade).
+    """
+
+    def __init__(self, date_dtype: Union[str, np.dtype] = 'datetime64[ns]', capacity: int = 64):
+        """
+        Initialize an empty ledger.
+
+        Args:
+            date_dtype: Storage type of entry/exit dates (the dtype of the data's
+                        date column or index; anything else is stored as objects)
+            capacity: Initial number of trades to allocate room for
+        """
+        try:
+            date_dtype = np.dtype(date_dtype)
+        except TypeError:  # pandas extension types such as tz-aware datetimes
+            date_dtype = np.dtype(object)
+        if date_dtype.kind not in 'iufM':
+            date_dtype = np.dtype(object)
+
+        self._size = 0
+        self._capacity = max(capacity, 1)
+        self._columns = {
+            'entry_date': np.empty(self._capacity, dtype=date_dtype),
+            'exit_date': np.empty(self._capacity, dtype=date_dtype)
+        }
+        for name, dtype in _NUMERIC_FIELDS.items():
+            self._columns[name] = np.empty(self._capacity, dtype=dtype)
+
+    @classmethod
+    def from_records(cls, trades: List[Dict]) -> 'TradeLedger':
+        """
+        Build a ledger from a list of trade dictionaries (open trades are skipped).
+
+        Args:
+            trades: Trade dictionaries with at least entry/exit dates and pnl
+
+        Returns:
+            TradeLedger holding the closed trades
+        """
+        closed = [t for t in trades if t.get('exit_date') is not None]
+        dates = pd.Index([t['entry_date'] for t in closed] + [t['exit_date'] for t in closed])
+        if dates.dtype.kind == 'O' and len(dates):
+            parsed = pd.to_datetime(dates, errors='coerce')
+            if not parsed.isna().any():
+                dates = parsed
+        ledger = cls(date_dtype=dates.dtype, capacity=len(closed))
+
+        n = len(closed)
+        ledger.extend(
+            entry_date=dates[:n],
+            exit_date=dates[n:],
+            entry_price=[t.get('entry_price', np.nan) for t in closed],
+            exit_price=[t.get('exit_price', np.nan) for t in closed],
+            position_size=[t.get('position_size', np.nan) for t in closed],
+            direction=[-1 if t.get('direction') == 'short' else 1 for t in closed],
+            pnl=[t['pnl'] for t in closed],
+            pnl_pct=[t.get('pnl_pct', np.nan) for t in closed],
+            commission=[t.get('commission', 0) for t in closed],
+            slippage=[t.get('slippage', 0) for t in closed],
+            exit_reason=[EXIT_REASONS.index(t.get('exit_reason', 'signal')) for t in closed]
+        )
+        return ledger
+
+    @classmethod
+    def concat(cls, ledgers: List['TradeLedger']) -> 'TradeLedger':
+        """
+        Join ledgers into one, keeping their order.
+
+        Args:
+            ledgers: Ledgers with the same date storage type
+
+        Returns:
+            TradeLedger holding the trades of every ledger
+        """
+        if not ledgers:
+            return cls()
+        ledger = cls(ledgers[0].entry_date.dtype, capacity=sum(len(part) for part in ledgers))
+        for part in ledgers:
+            ledger.extend(**{name: part.column(name) for name in part._columns})
+        return ledger
+
+    @classmethod
+    def read_csv(cls,
+                 csv_path: str,
+                 columns: Optional[Dict[str, str]] = None,
+                 date_format: Optional[str] = None,
+                 dayfirst: bool = False,
+                 chunksize: int = 1_000_000,
+                 **read_csv_kwargs) -> 'TradeLedger':
+        """
+        Read a broker or platform trade report CSV.
+        
+        Only the trade columns are parsed, with explicit dtypes (float64
+        numbers, categorical directions), in chunks written straight into the
+        ledger's arrays. Reports without a result column get their P&L from
+        the prices, direction, size and commission.
+        
+        Args:
+            csv_path: Trade report file
+            columns: Field name to CSV header, for headers not in REPORT_COLUMNS
+            date_format: strftime format of the date columns (much faster than inference)
+            dayfirst: Whether dates without a format are day first (dd/mm/yyyy)
+            chunksize: Rows parsed per chunk
+            **read_csv_kwargs: Extra arguments for pd.read_csv (sep=';', decimal=',',
+                               thousands='.', encoding, skiprows, ...)
+        
+        Returns:
+            TradeLedger with the report's trades in file order
+        """
+        first_row = pd.read_csv(csv_path, nrows=1, dtype=str, **read_csv_kwargs)
+        names = {str(name).strip().lower(): name for name in first_row.columns}
+        fields = {}
+        for field, aliases in REPORT_COLUMNS.items():
+            for alias in aliases:
+                if alias in names:
+                    fields[field] = names[alias]
+                    break
+        fields.update(columns or {})
+        
+        if 'entry_date' not in fields and 'exit_date' not in fields:
+            raise ValueError("Trade report must contain an entry or exit date column")
+        if 'pnl' not in fields and not {'entry_price', 'exit_price'} <= set(fields):
+            raise ValueError("Trade report must contain a result column or entry and exit prices")
+        
+        # Fixed-width date formats (given, or guessed from the first row) are read
+        # as bytes and parsed with array arithmetic
+        fixed_format = date_format
+        date_field = 'entry_date' if 'entry_date' in fields else 'exit_date'
+        if fixed_format is None and guess_datetime_format is not None and len(first_row):
+            first_date = first_row[fields[date_field]].iloc[0]
+            if isinstance(first_date, str):
+                fixed_format = guess_datetime_format(first_date.strip(), dayfirst=dayfirst)
+        layout = _date_layout(fixed_format) if fixed_format else None
+        ledger = cls._read_report(csv_path, fields, date_format, dayfirst, layout, chunksize, read_csv_kwargs)
+        if ledger is None:
+            # Some dates are longer than the layout and were cut short when read as
+            # fixed-width bytes, so read them again as strings (in whatever format
+            # each one has, unless a format was given)
+            ledger = cls._read_report(csv_path, fields, date_format or 'mixed', dayfirst, None, chunksize, read_csv_kwargs)
+        return ledger
+
+    @classmethod
+    def _read_report(cls,
+                     csv_path: str,
+                     fields: Dict[str, str],
+                     date_format: Optional[str],
+                     dayfirst: bool,
+                     layout: Optional[Tuple[Dict[str, int], List[Tuple[int, int]], int]],
+                     chunksize: int,
+                     read_csv_kwargs: Dict) -> Optional['TradeLedger']:
+        """
+        Read the trades of a report whose columns are resolved (see read_csv).
+
+        Returns:
+            TradeLedger, or None when a date did not fit the fixed-width layout's
+            byte dtype (the file must then be read without a layout)
+        """
+        dtypes = {column: np.float64 for field, column in fields.items() if field in _NUMERIC_FIELDS}
+        if 'direction' in fields:
+            dtypes[fields['direction']] = 'category'
+        for field in ('entry_date', 'exit_date'):
+            if field in fields:
+                dtypes[fields[field]] = f"S{layout[2] + 1}" if layout else str
+        
+        ledger = None
+        for chunk in pd.read_csv(csv_path, usecols=list(fields.values()), dtype=dtypes,
+                                 chunksize=chunksize, **read_csv_kwargs):
+            n = len(chunk)
+            values = {}
+            for field in ('entry_date', 'exit_date'):
+                if field in fields:
+                    dates = chunk[fields[field]].to_numpy()
+                    if layout and _truncated(dates, layout[2]):
+                        return None
+                    values[field] = _parse_dates(dates, date_format, dayfirst, layout)
+            values.setdefault('entry_date', values.get('exit_date'))
+            values.setdefault('exit_date', values['entry_date'])
+            
+            for field in ('entry_price', 'exit_price', 'position_size', 'pnl', 'commission'):
+                if field in fields:
+                    values[field] = chunk[fields[field]].to_numpy(dtype=np.float64)
+            
+            direction = np.ones(n, dtype=np.int8)
+            if 'direction' in fields:
+                labels = chunk[fields['direction']].cat
+                short = np.array([str(label).strip().lower() in SHORT_LABELS for label in labels.categories], dtype=bool)
+                codes = labels.codes.to_numpy()
+                direction[(codes >= 0) & short[np.maximum(codes, 0)]] = -1
+            
+            commission = values.get('commission', np.zeros(n))
+            if 'pnl' not in values:
+                size = values.get('position_size', np.ones(n))
+                values['pnl'] = (values['exit_price'] - values['entry_price']) * direction * size - commission
+            entry_value = values.get('entry_price', np.nan) * values.get('position_size', np.nan)
+            
+            if ledger is None:
+                ledger = cls(values['entry_date'].dtype, capacity=n)
+            ledger.extend(
+                entry_date=values['entry_date'],
+                exit_date=values['exit_date'],
+                entry_price=values.get('entry_price', np.nan),
+                exit_price=values.get('exit_price', np.nan),
+                position_size=values.get('position_size', np.nan),
+                direction=direction,
+                pnl=values['pnl'],
+                pnl_pct=(values['pnl'] / entry_value) * 100,
+                commission=commission,
+                slippage=0.0,
+                exit_reason=EXIT_REASONS.index('signal')
+            )
+        return ledger if ledger is not None else cls()
+
+    def append(self,
+               entry_date,
+               exit_date,
+               entry_price: float,
+               exit_price: float,
+               position_size: float,
+               direction: str,
+               pnl: float,
+               pnl_pct: float,
+               commission: float,
+               slippage: float,
+               exit_reason: str) -> None:
+        """Record one closed trade"""
+        if self._size == self._capacity:
+            self._grow(self._size + 1)
+        i = self._size
+        c = self._columns
+        c['entry_date'][i] = entry_date
+        c['exit_date'][i] = exit_date
+        c['entry_price'][i] = entry_price
+        c['exit_price'][i] = exit_price
+        c['position_size'][i] = position_size
+        c['direction'][i] = 1 if direction == 'long' else -1
+        c['pnl'][i] = pnl
+        c['pnl_pct'][i] = pnl_pct
+        c['commission'][i] = commission
+        c['slippage'][i] = slippage
+        c['exit_reason'][i] = EXIT_REASONS.index(exit_reason)
+        self._size += 1
+
+    def extend(self, **columns) -> None:
+        """
+        Record many closed trades at once from equal-length arrays.
+
+        Args:
+            **columns: One array per trade field (direction as 1/-1, exit_reason as codes)
+        """
+        n = len(columns['pnl'])
+        if self._size + n > self._capacity:
+            self._grow(self._size + n)
+        for name, target in self._columns.items():
+            target[self._size:self._size + n] = columns[name]
+        self._size += n
+
+    def take(self, indices: np.ndarray) -> 'TradeLedger':
+        """
+        New ledger with the trades at the given positions, in that order.
+
+        Args:
+            indices: Trade positions (e.g. np.argsort of a column)
+
+        Returns:
+            TradeLedger holding the selected trades
+        """
+        ledger = type(self)(self._columns['entry_date'].dtype, capacity=len(indices))
+        ledger.extend(**{name: self.column(name)[indices] for name in self._columns})
+        return ledger
+
+    def _grow(self, required: int) -> None:
+        """Reallocate the columns with room for at least `required` trades"""
+        capacity = max(required, self._capacity * 2)
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        View of one field over the recorded trades.
+
+        Args:
+            name: Trade field name
+
+        Returns:
+            NumPy array with one value per trade
+        """
+        return self._columns[name][:self._size]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('_columns', {})
+        if name in columns:
+            return columns[name][:self._size]
+        raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict, 'TradeLedger']:
+        """Trade dict at a position, or a TradeLedger with the trades of a slice"""
+        if isinstance(i, slice):
+            return self.take(np.arange(self._size)[i])
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("Trade index out of range")
+        c = self._columns
+        return {
+            'entry_date': self._date_value(c['entry_date'][i]),
+            'entry_price': c['entry_price'][i],
+            'position_size': c['position_size'][i],
+            'direction': 'long' if c['direction'][i] > 0 else 'short',
+            'exit_date': self._date_value(c['exit_date'][i]),
+            'exit_price': c['exit_price'][i],
+            'pnl': c['pnl'][i],
+            'pnl_pct': c['pnl_pct'][i],
+            'exit_reason': EXIT_REASONS[c['exit_reason'][i]],
+            'commission': c['commission'][i],
+            'slippage': c['slippage'][i]
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._size):
+            yield self[i]
+
+    def _date_value(self, value):
+        """Convert a stored date back to the type the engines used to record"""
+        if isinstance(value, np.datetime64):
+            return pd.Timestamp(value)
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame view of the ledger with one row per trade.
+
+        Returns:
+            DataFrame with the trade fields as columns
+        """
+        frame = pd.DataFrame({name: self.column(name) for name in self._columns})
+        frame['direction'] = np.where(frame['direction'] > 0, 'long', 'short')
+        frame['exit_reason'] = np.asarray(EXIT_REASONS, dtype=object)[self.column('exit_reason')]
+        return frame
+
+
+def _date_layout(date_format: str) -> Optional[Tuple[Dict[str, int], List[Tuple[int, int]], int]]:
+    """
+    Byte layout of a fixed-width date format.
+
+    Args:
+        date_format: strftime format
+
+    Returns:
+        Tuple of (offset of each field, (offset, byte) of each literal character,
+        width), or None when the format is not made of fixed-width numeric fields
+        and ASCII literals
+    """
+    fields = {}
+    literals = []
+    position = 0
+    i = 0
+    while i < len(date_format):
+        token = date_format[i:i + 2]
+        if token in _DATE_FIELDS and token not in fields:
+            fields[token] = position
+            position += _DATE_FIELDS[token]
+            i += 2
+        elif date_format[i] != '%' and ord(date_format[i]) < 128:
+            literals.append((position, ord(date_format[i])))
+            position += 1
+            i += 1
+        else:
+            return None
+    if not {'%Y', '%m', '%d'} <= set(fields):
+        return None
+    return fields, literals, position
+
+
+def _parse_dates(values: np.ndarray,
+                 date_format: Optional[str],
+                 dayfirst: bool,
+                 layout: Optional[Tuple[Dict[str, int], List[Tuple[int, int]], int]]) -> np.ndarray:
+    """
+    Parse a column of report dates to datetime64[ns].
+
+    Byte strings in a fixed-width layout are decoded digit by digit over the
+    whole column; anything that does not match the layout exactly (missing
+    values, shorter strings, impossible dates) goes through pd.to_datetime.
+
+    Args:
+        values: Date strings, or byte strings one longer than the layout's width
+        date_format: strftime format, 'mixed' to infer it per value, or None to infer it once
+        dayfirst: Whether inferred dates are day first
+        layout: Result of _date_layout for the format, if fixed width
+
+    Returns:
+        datetime64[ns] array (or objects for tz-aware dates)
+    """
+    if layout is not None:
+        parsed = _parse_fixed_dates(values, *layout)
+        if parsed is not None:
+            return parsed
+    if values.dtype.kind == 'S':
+        values = values.astype(str)
+    parsed = pd.to_datetime(values, format=date_format, dayfirst=dayfirst).to_numpy()
+    # pandas picks the resolution from the strings; keep it the same as the fixed-width path
+    return parsed.astype('datetime64[ns]') if parsed.dtype.kind == 'M' else parsed
+
+
+def _truncated(values: np.ndarray, width: int) -> bool:
+    """Whether any byte string read with a width + 1 byte dtype may have been cut short"""
+    return bool((values.view(np.uint8).reshape(len(values), width + 1)[:, width] != 0).any())
+
+
+def _parse_fixed_dates(values: np.ndarray,
+                       fields: Dict[str, int],
+                       literals: List[Tuple[int, int]],
+                       width: int) -> Optional[np.ndarray]:
+    """Parse fixed-width date bytes with array arithmetic, or None if any value does not fit the layout"""
+    chars = values.view(np.uint8).reshape(len(values), width + 1)
+    if (chars[:, width] != 0).any():
+        return None
+    for position, code in literals:
+        if (chars[:, position] != code).any():
+            return None
+
+    parts = {}
+    for token, position in fields.items():
+        digits = chars[:, position:position + _DATE_FIELDS[token]].astype(np.int32) - 48
+        if ((digits < 0) | (digits > 9)).any():
+            return None
+        parts[token] = digits @ (10 ** np.arange(_DATE_FIELDS[token] - 1, -1, -1, dtype=np.int32))
+
+    months = ((parts['%Y'] - 1970) * 12 + parts['%m'] - 1).astype('datetime64[M]')
+    month_days = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+    seconds = parts.get('%H', 0) * 3600 + parts.get('%M', 0) * 60 + parts.get('%S', 0)
+    valid = ((parts['%m'] >= 1) & (parts['%m'] <= 12) & (parts['%d'] >= 1) & (parts['%d'] <= month_days)
+             & (parts.get('%H', 0) < 24) & (parts.get('%M', 0) < 60) & (parts.get('%S', 0) < 60))
+    if not np.all(valid):
+        return None
+
+    days = months.astype('datetime64[D]') + (parts['%d'] - 1)
+    return (days.astype('datetime64[s]') + seconds).astype('datetime64[ns]')
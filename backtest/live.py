@@ -0,0 +1,304 @@
+"""
+Live and paper trading module.
+Drives TradeExecutor's execution state machine bar by bar from an asyncio event stream.
+"""
+
+import asyncio
+import os
+import pandas as pd
+import numpy as np
+from typing import Dict, List, AsyncIterator, Callable, Optional, Union
+
+from .columnar import ColumnarDataset
+from .execution import TradeExecutor
+from .incremental import RunningATR
+from .kernels import _execution_loop, EXIT_REASONS, STATE_FIELDS, TRADE_FIELDS
+from .ledger import TradeLedger
+from .metrics import RunningMetrics
+
+# Bar fields read from the feed
+BAR_FIELDS = ('open', 'high', 'low', 'close')
+
+
+class ReplayFeed:
+    """
+    Replays stored bars as an asynchronous stream, standing in for a live source.
+
+    Bars are yielded as dictionaries with 'date', 'open', 'high', 'low',
+    'close' and any other columns of the data (e.g. 'signal', 'atr').
+    """
+
+    def __init__(self,
+                 source: Union[str, pd.DataFrame],
+                 speed: Optional[float] = None,
+                 date_column: str = 'date'):
+        """
+        Initialize the replay feed.
+
+        Args:
+            source: DataFrame, CSV file or columnar dataset directory with the bars
+            speed: Replay speed as a multiple of real time (None replays as fast as possible)
+            date_column: Name of the date column
+        """
+        self.source = source
+        self.speed = speed
+        self.date_column = date_column
+
+    def _load(self) -> pd.DataFrame:
+        """Read the bars from the source"""
+        if isinstance(self.source, pd.DataFrame):
+            return self.source
+        if os.path.isdir(self.source):
+            return ColumnarDataset.open(self.source).to_frame()
+        return pd.read_csv(self.source, parse_dates=[self.date_column])
+
+    async def __aiter__(self) -> AsyncIterator[Dict]:
+        data = self._load()
+        columns = list(data.columns)
+        has_dates = self.date_column in data.columns
+        prev_date = None
+
+        for values in zip(*(data[col].to_numpy() for col in columns)):
+            bar = dict(zip(columns, values))
+            if has_dates:
+                bar[self.date_column] = pd.Timestamp(bar[self.date_column])
+            if self.speed and has_dates and prev_date is not None:
+                await asyncio.sleep(max((bar[self.date_column] - prev_date).total_seconds() / self.speed, 0.0))
+            else:
+                # Let subscribers run between bars
+                await asyncio.sleep(0)
+            prev_date = bar.get(self.date_column)
+            yield bar
+
+
+class LiveRunner:
+    """
+    Event-driven runner for paper and live trading.
+
+    Each bar runs one step of the same execution loop that
+    TradeExecutor.apply_execution_logic(..., mode='compiled') and
+    StreamingExecutor use, so stops, targets, trailing stops and sizing
+    behave exactly as in the backtest. Fills and equity updates are
+    published to subscriber queues as dictionaries with a 'type' key
+    ('entry', 'exit' or 'equity'), and runner.metrics keeps the performance
+    metrics of the session up to date.
+
+    Bars without an 'atr' field get their ATR from a RunningATR. Over the
+    first `atr_period` - 1 bars it averages the true ranges seen so far,
+    whereas the backtest (indicators.atr) fills those bars with the mean
+    true range of the whole series, so stops and percent-risk sizing of
+    trades opened during the warm-up can differ. Give bars an 'atr' field
+    for an exact replay of a backtest.
+    """
+
+    def __init__(self,
+                 executor: TradeExecutor,
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.0,
+                 slippage: float = 0.0,
+                 strategy: Optional[Callable[[Dict], float]] = None,
+                 atr_period: int = 14):
+        """
+        Initialize the runner.
+
+        Args:
+            executor: TradeExecutor holding the sizing and stop settings
+            initial_capital: Initial capital
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+            strategy: Function called with each bar at its close, returning the signal
+                      (1 for buy, -1 for sell, 0 for no action) acted on at the next bar;
+                      when omitted, bars must carry a 'signal' field
+            atr_period: ATR period used when bars have no 'atr' field (see the
+                        class docstring for the warm-up bars)
+        """
+        self.executor = executor
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.strategy = strategy
+        self.atr_period = atr_period
+
+        self._params = executor._kernel_params(commission, slippage).tolist()
+        self._subscribers: List[asyncio.Queue] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Start again from the initial capital with no position"""
+        self.state = [0.0] * STATE_FIELDS
+        self.state[7] = self.initial_capital
+        self.trades = TradeLedger()
+        self.entry_date = None
+        self.equity = self.initial_capital
+        self.metrics = RunningMetrics(self.initial_capital)
+        self._atr = RunningATR(self.atr_period)
+        self._prev = None  # (date, open, high, low, close, atr, signal) of the last bar
+
+    def subscribe(self, maxsize: int = 0) -> asyncio.Queue:
+        """
+        Register a subscriber.
+
+        Args:
+            maxsize: Queue bound; when a bounded queue is full its oldest event is dropped
+
+        Returns:
+            Queue receiving every event published from now on
+        """
+        queue = asyncio.Queue(maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop publishing to a subscriber queue"""
+        self._subscribers.remove(queue)
+
+    def _publish(self, event: Dict) -> None:
+        """Hand an event to every subscriber without waiting"""
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def on_bar(self, bar: Dict) -> List[Dict]:
+        """
+        Process one bar synchronously and publish the resulting events.
+
+        Args:
+            bar: Dictionary with 'date', 'open', 'high', 'low', 'close' and
+                 optionally 'atr' and 'signal'
+
+        Returns:
+            List of events produced by the bar
+        """
+        date = bar.get('date')
+        prices = [float(bar[field]) for field in BAR_FIELDS]
+        atr_value = self._atr.update(prices[1], prices[2], prices[3])
+        if 'atr' in bar:
+            atr_value = float(bar['atr'])
+
+        events = []
+        state = self.state
+        if self._prev is not None:
+            was_in_trade = state[0] != 0.0
+            prev = self._prev
+            equity = [state[7], state[7]]
+            positions = [0.0]
+            trades = [0.0] * TRADE_FIELDS
+
+            _, n_trades = _execution_loop(
+                [prev[1], prices[0]], [prev[2], prices[1]], [prev[3], prices[2]], [prev[4], prices[3]],
+                [prev[5], atr_value], [prev[6], 0.0], 1, self._params, state,
+                equity, positions, trades, 0, (), ()
+            )
+
+            if n_trades:
+                events.append(self._record_exit(trades, date))
+            if not was_in_trade and state[0] != 0.0:
+                self.entry_date = date
+                events.append({
+                    'type': 'entry',
+                    'date': date,
+                    'direction': 'long' if state[1] > 0 else 'short',
+                    'price': state[2],
+                    'position_size': state[6],
+                    'stop_loss': state[4],
+                    'take_profit': state[5]
+                })
+            self.equity = equity[1]
+            self.metrics.add_equity(self.equity)
+
+        events.append({
+            'type': 'equity',
+            'date': date,
+            'equity': self.equity,
+            'capital': state[7],
+            'position': state[8],
+            'stop_loss': state[4] if state[0] else None
+        })
+
+        signal = self.strategy(bar) if self.strategy is not None else bar.get('signal', 0.0)
+        self._prev = (date, prices[0], prices[1], prices[2], prices[3], atr_value, float(signal))
+
+        for event in events:
+            self._publish(event)
+        return events
+
+    def _record_exit(self, trade: List[float], date) -> Dict:
+        """Append a closed trade from a kernel trade record to the ledger and build its event"""
+        self.trades.append(
+            entry_date=self.entry_date,
+            exit_date=date,
+            entry_price=trade[3],
+            exit_price=trade[4],
+            position_size=trade[5],
+            direction='long' if trade[2] > 0 else 'short',
+            pnl=trade[6],
+            pnl_pct=(trade[6] / (trade[3] * trade[5])) * 100,
+            commission=trade[7],
+            slippage=0,  # Slippage is already included in the price
+            exit_reason=EXIT_REASONS[int(trade[8])]
+        )
+        self.metrics.add_trade(trade[6], self.entry_date, date)
+        return self._exit_event(self.trades[-1])
+
+    def _exit_event(self, trade: Dict) -> Dict:
+        """Event published for a closed trade"""
+        return {
+            'type': 'exit',
+            'date': trade['exit_date'],
+            'direction': trade['direction'],
+            'entry_date': trade['entry_date'],
+            'entry_price': trade['entry_price'],
+            'price': trade['exit_price'],
+            'position_size': trade['position_size'],
+            'pnl': trade['pnl'],
+            'exit_reason': trade['exit_reason']
+        }
+
+    def close_position(self) -> Optional[Dict]:
+        """
+        Close the open position at the last close, as the backtest does at the end of the data.
+
+        Returns:
+            The exit event, or None when no position is open
+        """
+        if not self.state[0] or self._prev is None:
+            return None
+
+        state = np.array(self.state, dtype=np.float64)
+        self.executor._close_kernel_position(self.trades, state, self.entry_date,
+                                             self._prev[4], self._prev[0], self.commission)
+        self.state = state.tolist()
+        self.equity = self.state[7]
+
+        # The closing fill replaces the last bar's equity, as at the end of a backtest
+        event = self._exit_event(self.trades[-1])
+        self.metrics.add_trade(event['pnl'], event['entry_date'], event['date'])
+        self.metrics.revise_equity(self.equity)
+        self._publish(event)
+        return event
+
+    async def run(self, feed: AsyncIterator[Dict], close_at_end: bool = True) -> Dict:
+        """
+        Consume a bar stream until it ends.
+
+        Args:
+            feed: Asynchronous iterable of bars (e.g. ReplayFeed)
+            close_at_end: Close an open position when the stream ends
+
+        Returns:
+            Dict with all 'trades', 'final_capital', 'return_pct' and the 'metrics' snapshot
+        """
+        async for bar in feed:
+            self.on_bar(bar)
+
+        if close_at_end:
+            self.close_position()
+
+        current_capital = self.state[7]
+        return {
+            'trades': self.trades,
+            'final_capital': current_capital,
+            'return_pct': ((current_capital / self.initial_capital) - 1) * 100,
+            'metrics': self.metrics.snapshot()
+        }
@@ -3,34 +3,151 @@ Performance metrics calculation module.
 Calculates various trading performance metrics from backtest results.
 """
 
+import math
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
+from .ledger import TradeLedger
+from .profiling import Profiler, DISABLED
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
+MONTHS = [
+    'january', 'february', 'march', 'april', 'may', 'june',
+    'july', 'august', 'september', 'october', 'november', 'december'
+]
+
+# Default trading sessions as [start_hour, end_hour) of the entry time
+SESSIONS = {
+    'asia': (0, 8),
+    'europe': (8, 14),
+    'america': (14, 24)
+}
+
+# Metrics reported when there are no closed trades
+EMPTY_METRICS = {
+    'netProfit': 0,
+    'totalTrades': 0,
+    'winRate': 0,
+    'averageWin': 0,
+    'averageLoss': 0,
+    'payoff': 0,
+    'profitFactor': 0,
+    'averageTrade': 0,
+    'maxDrawdown': 0,
+    'maxDrawdownAmount': 0,
+    'maxConsecutiveLosses': 0,
+    'maxConsecutiveWins': 0,
+    'recoveryFactor': 0,
+    'sharpeRatio': 0,
+    'expectancy': 0,
+    'averageTradeDuration': "0h 0min"
+}
+
 class PerformanceMetrics:
     """
     Calculates performance metrics from backtest results.
     """
     
-    def __init__(self, backtest_results: Dict):
+    def __init__(self, backtest_results: Dict, profiler: Optional[Profiler] = None):
         """
         Initialize with backtest results.
         
         Args:
             backtest_results: Dictionary containing backtest results from BacktestEngine
+            profiler: Optional Profiler timing the ledger conversion and metric calculation
+                      (pass the engine's profiler to get one report for the whole pipeline)
         """
+        self.profiler = profiler if profiler is not None else DISABLED
         self.results = backtest_results
         self.trades = backtest_results['trades']
         self.equity_curve = backtest_results['equity_curve']
-        self.initial_capital = self.equity_curve[0]
+        # Engines return float64 arrays, so this is a view rather than a copy
+        self.equity = np.asarray(self.equity_curve, dtype=np.float64)
+        self.initial_capital = self.equity[0]
         self.data = backtest_results['data']
         
-        # Filter out trades with no exit (should not happen if backtest is complete)
-        self.completed_trades = [t for t in self.trades if t['exit_date'] is not None]
+        with self.profiler:
+            # Engines return a TradeLedger; lists of trade dicts are converted
+            # (trades with no exit are dropped, which should not happen if the backtest is complete)
+            if isinstance(self.trades, TradeLedger):
+                self.ledger = self.trades
+            else:
+                with self.profiler.span('metrics.ledger'):
+                    self.ledger = TradeLedger.from_records(self.trades)
+            self.completed_trades = self.ledger
+            
+            # Calculate basic metrics
+            with self.profiler.span('metrics.calculate'):
+                self.metrics = self._calculate_metrics()
+    
+    @classmethod
+    def from_trades(cls,
+                    trades: TradeLedger,
+                    initial_capital: float = 10000.0,
+                    profiler: Optional[Profiler] = None) -> 'PerformanceMetrics':
+        """
+        Calculate metrics from closed trades alone, without price data.
+        
+        Trades are put in exit order and the equity curve is rebuilt from the
+        cumulative P&L, with one point per trade.
+        
+        Args:
+            trades: TradeLedger of closed trades
+            initial_capital: Capital before the first trade
+            profiler: Optional Profiler (see __init__)
+            
+        Returns:
+            PerformanceMetrics of the trades
+        """
+        exit_dates = trades.exit_date
+        if len(exit_dates) > 1 and not (exit_dates[1:] >= exit_dates[:-1]).all():
+            trades = trades.take(np.argsort(exit_dates, kind='stable'))
+        
+        equity = np.empty(len(trades) + 1, dtype=np.float64)
+        equity[0] = initial_capital
+        np.cumsum(trades.pnl, out=equity[1:])
+        equity[1:] += initial_capital
         
-        # Calculate basic metrics
-        self.metrics = self._calculate_metrics()
+        # The curve starts at the first entry (or nowhere, without trades)
+        start = trades.entry_date[:1] if len(trades) else np.array([None], dtype=trades.entry_date.dtype)
+        dates = np.concatenate([start, trades.exit_date])
+        results = {
+            'trades': trades,
+            'equity_curve': equity,
+            'positions': trades.position_size,
+            'dates': dates,
+            'final_capital': equity[-1],
+            'return_pct': ((equity[-1] / initial_capital) - 1) * 100,
+            'data': pd.DataFrame({'date': dates, 'close': equity})
+        }
+        return cls(results, profiler=profiler)
+    
+    @classmethod
+    def from_trades_csv(cls,
+                        csv_path: str,
+                        initial_capital: float = 10000.0,
+                        profiler: Optional[Profiler] = None,
+                        **read_kwargs) -> 'PerformanceMetrics':
+        """
+        Calculate metrics from a broker or platform trade report CSV.
+        
+        Args:
+            csv_path: Trade report file
+            initial_capital: Capital before the first trade
+            profiler: Optional Profiler (see __init__)
+            **read_kwargs: Arguments for TradeLedger.read_csv (columns, date_format,
+                           dayfirst, sep, decimal, thousands, encoding, ...)
+            
+        Returns:
+            PerformanceMetrics of the report's trades
+        """
+        profiler = profiler if profiler is not None else DISABLED
+        with profiler:
+            with profiler.span('metrics.read_csv'):
+                trades = TradeLedger.read_csv(csv_path, **read_kwargs)
+            return cls.from_trades(trades, initial_capital, profiler=profiler)
     
     def _calculate_metrics(self) -> Dict:
         """
@@ -39,93 +156,62 @@ class PerformanceMetrics:
         Returns:
             Dictionary containing all calculated metrics
         """
-        if not self.completed_trades:
-            return {
-                'netProfit': 0,
-                'totalTrades': 0,
-                'winRate': 0,
-                'averageWin': 0,
-                'averageLoss': 0,
-                'payoff': 0,
-                'profitFactor': 0,
-                'averageTrade': 0,
-                'maxDrawdown': 0,
-                'maxDrawdownAmount': 0,
-                'maxConsecutiveLosses': 0,
-                'maxConsecutiveWins': 0,
-                'recoveryFactor': 0,
-                'sharpeRatio': 0,
-                'expectancy': 0,
-                'averageTradeDuration': "0h 0min"
-            }
+        if not len(self.completed_trades):
+            return dict(EMPTY_METRICS)
+        
+        # All trade statistics are computed from the ledger's arrays
+        pnl = self.ledger.pnl
+        wins = pnl > 0
         
         # Basic metrics
-        net_profit = sum(t['pnl'] for t in self.completed_trades)
-        total_trades = len(self.completed_trades)
+        net_profit = pnl.sum()
+        total_trades = len(pnl)
         
         # Winning and losing trades
-        winning_trades = [t for t in self.completed_trades if t['pnl'] > 0]
-        losing_trades = [t for t in self.completed_trades if t['pnl'] <= 0]
+        winning_pnl = pnl[wins]
+        losing_pnl = pnl[~wins]
         
-        win_rate = (len(winning_trades) / total_trades) * 100 if total_trades > 0 else 0
+        win_rate = (len(winning_pnl) / total_trades) * 100 if total_trades > 0 else 0
         
         # Average win and loss
-        avg_win = sum(t['pnl'] for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(t['pnl'] for t in losing_trades) / len(losing_trades) if losing_trades else 0
+        avg_win = winning_pnl.mean() if len(winning_pnl) else 0
+        avg_loss = losing_pnl.mean() if len(losing_pnl) else 0
         
         # Payoff ratio
         payoff = abs(avg_win / avg_loss) if avg_loss != 0 else 0
         
         # Profit factor
-        gross_profit = sum(t['pnl'] for t in winning_trades)
-        gross_loss = abs(sum(t['pnl'] for t in losing_trades))
+        gross_profit = winning_pnl.sum()
+        gross_loss = abs(losing_pnl.sum())
         profit_factor = gross_profit / gross_loss if gross_loss != 0 else 0
         
         # Average trade
         avg_trade = net_profit / total_trades if total_trades > 0 else 0
         
         # Drawdown calculation
-        equity_array = np.array(self.equity_curve)
+        equity_array = self.equity
         max_equity = np.maximum.accumulate(equity_array)
-        drawdowns = (max_equity - equity_array) / max_equity * 100
-        max_drawdown = np.max(drawdowns)
-        max_drawdown_amount = np.max(max_equity - equity_array)
+        drawdown_amounts = max_equity - equity_array
+        max_drawdown = np.max(drawdown_amounts / max_equity * 100)
+        max_drawdown_amount = np.max(drawdown_amounts)
         
         # Consecutive wins and losses
-        trade_results = [1 if t['pnl'] > 0 else 0 for t in self.completed_trades]
-        max_consecutive_wins = self._max_consecutive(trade_results, 1)
-        max_consecutive_losses = self._max_consecutive(trade_results, 0)
+        max_consecutive_wins = self._max_consecutive(wins, True)
+        max_consecutive_losses = self._max_consecutive(wins, False)
         
         # Recovery factor
         recovery_factor = net_profit / max_drawdown_amount if max_drawdown_amount > 0 else 0
         
         # Sharpe ratio (assuming daily returns)
         daily_returns = np.diff(equity_array) / equity_array[:-1]
-        sharpe_ratio = np.mean(daily_returns) / np.std(daily_returns) * np.sqrt(252) if np.std(daily_returns) > 0 else 0
+        returns_std = np.std(daily_returns)
+        sharpe_ratio = np.mean(daily_returns) / returns_std * np.sqrt(252) if returns_std > 0 else 0
         
         # Expectancy
         expectancy = (win_rate/100 * avg_win) + ((1 - win_rate/100) * avg_loss)
         
         # Average trade duration
-        durations = []
-        for trade in self.completed_trades:
-            if isinstance(trade['entry_date'], str):
-                entry_date = pd.to_datetime(trade['entry_date'])
-            else:
-                entry_date = trade['entry_date']
-                
-            if isinstance(trade['exit_date'], str):
-                exit_date = pd.to_datetime(trade['exit_date'])
-            else:
-                exit_date = trade['exit_date']
-                
-            duration = exit_date - entry_date
-            durations.append(duration.total_seconds())
-        
-        avg_duration_seconds = sum(durations) / len(durations) if durations else 0
-        hours = int(avg_duration_seconds // 3600)
-        minutes = int((avg_duration_seconds % 3600) // 60)
-        avg_trade_duration = f"{hours}h {minutes}min"
+        avg_trade_duration = _format_duration(self._trade_durations().mean())
         
         # Day of week analysis
         day_of_week_analysis = self._analyze_by_day_of_week()
@@ -154,96 +240,96 @@ class PerformanceMetrics:
             'monthlyAnalysis': monthly_analysis
         }
     
-    def _max_consecutive(self, arr: List[int], value: int) -> int:
-        """Calculate maximum consecutive occurrences of a value in an array"""
-        max_count = 0
-        current_count = 0
-        
-        for item in arr:
-            if item == value:
-                current_count += 1
-                max_count = max(max_count, current_count)
-            else:
-                current_count = 0
-                
-        return max_count
+    def _max_consecutive(self, arr: np.ndarray, value) -> int:
+        """Calculate maximum consecutive occurrences of a value in an array (run-length encoded)"""
+        hits = np.asarray(arr) == value
+        if not hits.any():
+            return 0
+        
+        # Runs start and end where the padded mask changes
+        edges = np.flatnonzero(np.diff(np.concatenate([[False], hits, [False]])))
+        return int((edges[1::2] - edges[::2]).max())
+    
+    def _trade_dates(self, name: str) -> pd.DatetimeIndex:
+        """Entry or exit dates of the completed trades as a DatetimeIndex"""
+        # Strings or tz-aware timestamps are stored as objects and parsed here
+        return pd.DatetimeIndex(pd.to_datetime(self.ledger.column(name)))
+    
+    def _trade_durations(self) -> np.ndarray:
+        """Duration of each completed trade in seconds"""
+        durations = self._trade_dates('exit_date') - self._trade_dates('entry_date')
+        return (durations / pd.Timedelta(seconds=1)).to_numpy()
     
     def _analyze_by_day_of_week(self) -> Dict:
         """Analyze performance by day of the week"""
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
-        day_analysis = {}
-        
-        for day in days:
-            day_trades = []
-            
-            for trade in self.completed_trades:
-                entry_date = pd.to_datetime(trade['entry_date']) if isinstance(trade['entry_date'], str) else trade['entry_date']
-                day_of_week = entry_date.day_name().lower()
-                
-                if day_of_week == day:
-                    day_trades.append(trade)
-            
-            if day_trades:
-                winning_trades = [t for t in day_trades if t['pnl'] > 0]
-                win_rate = (len(winning_trades) / len(day_trades)) * 100
-                
-                gross_profit = sum(t['pnl'] for t in day_trades if t['pnl'] > 0)
-                gross_loss = abs(sum(t['pnl'] for t in day_trades if t['pnl'] <= 0))
-                profit_factor = gross_profit / gross_loss if gross_loss > 0 else 1.0
-                
-                day_analysis[day] = {
-                    'trades': len(day_trades),
-                    'winRate': round(win_rate, 2),
-                    'profitFactor': round(profit_factor, 2)
-                }
-            else:
-                day_analysis[day] = {
-                    'trades': 0,
-                    'winRate': 0,
-                    'profitFactor': 0
-                }
-        
-        return day_analysis
+        return self.analyze_by('day_of_week')
     
     def _analyze_by_month(self) -> Dict:
         """Analyze performance by month"""
-        months = [
-            'january', 'february', 'march', 'april', 'may', 'june',
-            'july', 'august', 'september', 'october', 'november', 'december'
-        ]
-        month_analysis = {}
-        
-        for month in months:
-            month_trades = []
-            
-            for trade in self.completed_trades:
-                entry_date = pd.to_datetime(trade['entry_date']) if isinstance(trade['entry_date'], str) else trade['entry_date']
-                trade_month = entry_date.month_name().lower()
-                
-                if trade_month == month:
-                    month_trades.append(trade)
+        return self.analyze_by('month')
+    
+    def analyze_by(self, bucket: str, sessions: Optional[Dict[str, Tuple[int, int]]] = None) -> Dict:
+        """
+        Analyze performance by the calendar bucket of each trade's entry.
+        
+        Trades are grouped in one pass on integer bucket codes, so the cost
+        does not grow with the number of buckets.
+        
+        Args:
+            bucket: 'day_of_week', 'month', 'hour', 'week' (ISO week), 'year' or 'session'
+            sessions: Session name to [start_hour, end_hour) for bucket='session' (defaults to SESSIONS)
             
-            if month_trades:
-                winning_trades = [t for t in month_trades if t['pnl'] > 0]
-                win_rate = (len(winning_trades) / len(month_trades)) * 100
-                
-                gross_profit = sum(t['pnl'] for t in month_trades if t['pnl'] > 0)
-                gross_loss = abs(sum(t['pnl'] for t in month_trades if t['pnl'] <= 0))
-                profit_factor = gross_profit / gross_loss if gross_loss > 0 else 1.0
-                
-                month_analysis[month] = {
-                    'trades': len(month_trades),
-                    'winRate': round(win_rate, 2),
-                    'profitFactor': round(profit_factor, 2)
-                }
-            else:
-                month_analysis[month] = {
-                    'trades': 0,
-                    'winRate': 0,
-                    'profitFactor': 0
-                }
+        Returns:
+            Dictionary mapping each bucket label to its trades, winRate and profitFactor
+        """
+        if not len(self.completed_trades):
+            return {}
+        
+        entry_dates = self._trade_dates('entry_date')
+        
+        if bucket == 'day_of_week':
+            # Weekend entries fall outside the labels and are left out
+            codes = entry_dates.dayofweek.to_numpy()
+            labels = WEEKDAYS
+        elif bucket == 'month':
+            codes = entry_dates.month.to_numpy() - 1
+            labels = MONTHS
+        elif bucket == 'hour':
+            codes = entry_dates.hour.to_numpy()
+            labels = list(range(24))
+        elif bucket == 'week':
+            codes = entry_dates.isocalendar()['week'].to_numpy(dtype=np.int64) - 1
+            labels = list(range(1, 54))
+        elif bucket == 'year':
+            years = entry_dates.year.to_numpy()
+            codes = years - years.min()
+            labels = list(range(years.min(), years.max() + 1))
+        elif bucket == 'session':
+            sessions = sessions or SESSIONS
+            hours = entry_dates.hour.to_numpy()
+            codes = np.full(len(hours), -1)
+            for code, (start, end) in enumerate(sessions.values()):
+                codes[(codes < 0) & (hours >= start) & (hours < end)] = code
+            labels = list(sessions.keys())
+        else:
+            raise ValueError("Bucket must be 'day_of_week', 'month', 'hour', 'week', 'year' or 'session'")
+        
+        return self._bucket_stats(codes, labels)
+    
+    def _bucket_stats(self, codes: np.ndarray, labels: List) -> Dict:
+        """Per-bucket trade count, win rate and profit factor from integer bucket codes"""
+        pnl = self.ledger.pnl
+        n = len(labels)
+        valid = (codes >= 0) & (codes < n)
+        codes = codes[valid].astype(np.int64)
+        pnl = pnl[valid]
         
-        return month_analysis
+        wins = pnl > 0
+        counts = np.bincount(codes, minlength=n)
+        win_counts = np.bincount(codes, weights=wins, minlength=n)
+        gross_profit = np.bincount(codes, weights=np.where(wins, pnl, 0.0), minlength=n)
+        gross_loss = -np.bincount(codes, weights=np.where(wins, 0.0, pnl), minlength=n)
+        return _bucket_analysis(labels, counts, win_counts, gross_profit, gross_loss)
     
     def get_metrics(self) -> Dict:
         """
@@ -277,4 +363,205 @@ class PerformanceMetrics:
         Expectancy: ${m['expectancy']:.2f}
         """
         
-        return summary
\ No newline at end of file
+        return summary
+
+class RunningMetrics:
+    """
+    Performance metrics maintained incrementally as trades close and equity moves.
+
+    Each closed trade and each equity point updates running sums, win/loss
+    counts, streaks, the equity peak and drawdowns, per-bucket calendar
+    statistics and a Welford mean/variance of the equity returns in O(1), so
+    a dashboard can refresh metrics at any time without rescanning the
+    trades. snapshot() returns the same keys as PerformanceMetrics.get_metrics().
+
+    The latest equity point is provisional until the next one arrives and
+    can be replaced with revise_equity(), as the backtests do when a
+    position still open at the end is closed on the last bar.
+    """
+
+    def __init__(self, initial_capital: float = 10000.0):
+        """
+        Initialize with no trades and a flat equity curve.
+
+        Args:
+            initial_capital: Starting capital (the first equity point)
+        """
+        self.initial_capital = initial_capital
+
+        # Trade statistics (losing trades are those with pnl <= 0, as in PerformanceMetrics)
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.current_streak = 0  # positive for wins, negative for losses
+        self.max_consecutive_wins = 0
+        self.max_consecutive_losses = 0
+        self._duration_seconds = 0.0
+        self._timed_trades = 0
+        self._buckets = {
+            'dayOfWeekAnalysis': np.zeros((4, len(WEEKDAYS))),
+            'monthlyAnalysis': np.zeros((4, len(MONTHS)))
+        }
+
+        # Equity statistics of the committed points and the provisional last point
+        self._equity = (0, 0.0, 0.0, 0.0, 0.0, 0, 0.0, 0.0)
+        self._pending = float(initial_capital)
+
+    def add_trade(self, pnl: float, entry_date=None, exit_date=None) -> None:
+        """
+        Record a closed trade.
+
+        Args:
+            pnl: Net profit or loss of the trade
+            entry_date: Entry time (used for the duration and calendar breakdowns)
+            exit_date: Exit time (used for the duration)
+        """
+        win = pnl > 0
+        self.total_trades += 1
+        if win:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+            self.current_streak = self.current_streak + 1 if self.current_streak > 0 else 1
+            self.max_consecutive_wins = max(self.max_consecutive_wins, self.current_streak)
+        else:
+            self.gross_loss -= pnl
+            self.current_streak = self.current_streak - 1 if self.current_streak < 0 else -1
+            self.max_consecutive_losses = max(self.max_consecutive_losses, -self.current_streak)
+
+        if entry_date is None:
+            return
+        entry = pd.Timestamp(entry_date)
+        if exit_date is not None:
+            self._duration_seconds += (pd.Timestamp(exit_date) - entry) / pd.Timedelta(seconds=1)
+            self._timed_trades += 1
+        for name, code in (('dayOfWeekAnalysis', entry.dayofweek), ('monthlyAnalysis', entry.month - 1)):
+            stats = self._buckets[name]
+            if code < stats.shape[1]:
+                stats[0, code] += 1
+                stats[1, code] += win
+                stats[2 if win else 3, code] += pnl if win else -pnl
+
+    def add_equity(self, value: float) -> None:
+        """
+        Record the next equity point, committing the previous one.
+
+        Args:
+            value: Account equity
+        """
+        self._equity = _equity_step(self._equity, self._pending)
+        self._pending = float(value)
+
+    def revise_equity(self, value: float) -> None:
+        """
+        Replace the latest equity point.
+
+        Args:
+            value: Corrected account equity
+        """
+        self._pending = float(value)
+
+    def snapshot(self) -> Dict:
+        """
+        Metrics as of the trades and equity points recorded so far.
+
+        Returns:
+            Dictionary with the keys of PerformanceMetrics.get_metrics()
+        """
+        if not self.total_trades:
+            return dict(EMPTY_METRICS)
+
+        _, _, _, max_drawdown, max_drawdown_amount, returns, mean_return, m2 = _equity_step(self._equity, self._pending)
+
+        total_trades = self.total_trades
+        losing_trades = total_trades - self.winning_trades
+        net_profit = self.gross_profit - self.gross_loss
+        win_rate = (self.winning_trades / total_trades) * 100
+        avg_win = self.gross_profit / self.winning_trades if self.winning_trades else 0
+        avg_loss = -self.gross_loss / losing_trades if losing_trades else 0
+        payoff = abs(avg_win / avg_loss) if avg_loss != 0 else 0
+        profit_factor = self.gross_profit / self.gross_loss if self.gross_loss != 0 else 0
+        returns_std = math.sqrt(m2 / returns) if returns else 0.0
+        duration = self._duration_seconds / self._timed_trades if self._timed_trades else 0.0
+
+        metrics = {
+            'netProfit': net_profit,
+            'totalTrades': total_trades,
+            'winRate': win_rate,
+            'averageWin': avg_win,
+            'averageLoss': avg_loss,
+            'payoff': payoff,
+            'profitFactor': profit_factor,
+            'averageTrade': net_profit / total_trades,
+            'maxDrawdown': max_drawdown,
+            'maxDrawdownAmount': max_drawdown_amount,
+            'maxConsecutiveLosses': self.max_consecutive_losses,
+            'maxConsecutiveWins': self.max_consecutive_wins,
+            'recoveryFactor': net_profit / max_drawdown_amount if max_drawdown_amount > 0 else 0,
+            'sharpeRatio': mean_return / returns_std * np.sqrt(252) if returns_std > 0 else 0,
+            'expectancy': (win_rate/100 * avg_win) + ((1 - win_rate/100) * avg_loss),
+            'averageTradeDuration': _format_duration(duration)
+        }
+        for name, labels in (('dayOfWeekAnalysis', WEEKDAYS), ('monthlyAnalysis', MONTHS)):
+            metrics[name] = _bucket_analysis(labels, *self._buckets[name])
+        return metrics
+
+
+def _equity_step(stats: Tuple, value: float) -> Tuple:
+    """
+    Equity statistics after one more point.
+
+    Args:
+        stats: (points, last value, peak, max drawdown %, max drawdown amount,
+                returns, mean return, sum of squared return deviations)
+        value: Next equity point
+
+    Returns:
+        Updated statistics tuple
+    """
+    points, last, peak, max_drawdown, max_drawdown_amount, returns, mean_return, m2 = stats
+    if points:
+        # Welford update with the return from the previous point
+        r = (value - last) / last
+        returns += 1
+        delta = r - mean_return
+        mean_return += delta / returns
+        m2 += delta * (r - mean_return)
+        peak = max(peak, value)
+    else:
+        peak = value
+    amount = peak - value
+    max_drawdown = max(max_drawdown, amount / peak * 100)
+    max_drawdown_amount = max(max_drawdown_amount, amount)
+    return points + 1, value, peak, max_drawdown, max_drawdown_amount, returns, mean_return, m2
+
+
+def _format_duration(seconds: float) -> str:
+    """Average trade duration as hours and minutes"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    return f"{hours}h {minutes}min"
+
+
+def _bucket_analysis(labels: List, counts: np.ndarray, win_counts: np.ndarray,
+                     gross_profit: np.ndarray, gross_loss: np.ndarray) -> Dict:
+    """Per-bucket trade count, win rate and profit factor from per-bucket totals"""
+    analysis = {}
+    for code, label in enumerate(labels):
+        if counts[code]:
+            win_rate = (win_counts[code] / counts[code]) * 100
+            profit_factor = gross_profit[code] / gross_loss[code] if gross_loss[code] > 0 else 1.0
+            
+            analysis[label] = {
+                'trades': int(counts[code]),
+                'winRate': round(float(win_rate), 2),
+                'profitFactor': round(float(profit_factor), 2)
+            }
+        else:
+            analysis[label] = {
+                'trades': 0,
+                'winRate': 0,
+                'profitFactor': 0
+            }
+    
+    return analysis
@@ -0,0 +1,187 @@
+"""
+Monte Carlo analysis module.
+Resamples the trade P&L sequence to estimate the distribution of drawdowns and outcomes.
+"""
+
+import math
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Union
+
+from .ledger import TradeLedger
+
+# Resampling methods: random order of the same trades, or draws with replacement
+METHODS = ('shuffle', 'bootstrap')
+
+# Statistics simulated for every path
+STATISTICS = ('maxDrawdown', 'maxDrawdownAmount', 'finalEquity', 'maxConsecutiveLosses')
+
+
+class MonteCarlo:
+    """
+    Monte Carlo simulation over the trades of a backtest.
+
+    Paths are generated as a simulations x trades matrix of P&L and
+    processed in blocks of rows with NumPy, so memory stays bounded for any
+    number of simulations. Each block has its own random stream spawned
+    from the seed, which makes results reproducible and independent of the
+    number of worker processes.
+    """
+
+    def __init__(self,
+                 backtest_results: Union[Dict, TradeLedger],
+                 simulations: int = 10000,
+                 method: str = 'shuffle',
+                 initial_capital: Optional[float] = None,
+                 seed: Optional[int] = None,
+                 block_size: Optional[int] = None,
+                 max_workers: int = 1):
+        """
+        Initialize the simulation.
+
+        Args:
+            backtest_results: Dictionary of backtest results (from any engine) or a TradeLedger
+            simulations: Number of resampled trade sequences
+            method: 'shuffle' (permute the trades; final equity is the same on every path)
+                    or 'bootstrap' (draw the same number of trades with replacement)
+            initial_capital: Starting capital of each path (defaults to the first equity point)
+            seed: Seed of the random generator
+            block_size: Paths simulated at once (defaults to ~32 MB of P&L per block)
+            max_workers: Number of worker processes used for the blocks
+        """
+        if method not in METHODS:
+            raise ValueError(f"Method must be one of {METHODS}")
+        if simulations < 1:
+            raise ValueError("Number of simulations must be at least 1")
+
+        if isinstance(backtest_results, TradeLedger):
+            ledger = backtest_results
+        else:
+            trades = backtest_results['trades']
+            ledger = trades if isinstance(trades, TradeLedger) else TradeLedger.from_records(trades)
+            if initial_capital is None:
+                initial_capital = float(np.asarray(backtest_results['equity_curve'], dtype=np.float64)[0])
+        if initial_capital is None:
+            raise ValueError("Initial capital is required when only a trade ledger is given")
+
+        self.pnl = np.array(ledger.pnl, dtype=np.float64)
+        self.initial_capital = initial_capital
+        self.simulations = simulations
+        self.method = method
+        self.seed = seed
+        self.block_size = block_size or max(1, (32 * 2**20) // (8 * max(len(self.pnl), 1)))
+        self.max_workers = max_workers
+
+        self._distributions = None
+
+    def run(self) -> Dict[str, np.ndarray]:
+        """
+        Simulate every path (computed once and cached).
+
+        Returns:
+            Dictionary mapping 'maxDrawdown' (percent), 'maxDrawdownAmount',
+            'finalEquity' and 'maxConsecutiveLosses' to one value per path
+        """
+        if self._distributions is not None:
+            return self._distributions
+
+        n_blocks = math.ceil(self.simulations / self.block_size)
+        sizes = [min(self.block_size, self.simulations - i * self.block_size) for i in range(n_blocks)]
+        seeds = np.random.SeedSequence(self.seed).spawn(n_blocks)
+        tasks = [(self.pnl, self.initial_capital, self.method, size, seq) for size, seq in zip(sizes, seeds)]
+
+        workers = min(self.max_workers or os.cpu_count() or 1, n_blocks)
+        if workers == 1:
+            blocks = [_simulate_block(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                blocks = list(pool.map(_simulate_block, *zip(*tasks)))
+
+        self._distributions = {name: np.concatenate([block[name] for block in blocks]) for name in STATISTICS}
+        return self._distributions
+
+    def percentiles(self, q: Sequence[float] = (5, 25, 50, 75, 95)) -> Dict[str, Dict]:
+        """
+        Percentiles and mean of each simulated statistic.
+
+        Args:
+            q: Percentiles to report (0-100)
+
+        Returns:
+            Dictionary mapping each statistic to {'mean', 'p5', 'p25', ...}
+        """
+        distributions = self.run()
+        result = {}
+        for name, values in distributions.items():
+            stats = {'mean': float(values.mean())}
+            for p, value in zip(q, np.percentile(values, q)):
+                stats[f"p{p:g}"] = float(value)
+            result[name] = stats
+        return result
+
+    def get_summary(self) -> str:
+        """
+        Get a text summary of the simulated distributions.
+
+        Returns:
+            String with the median and 5th/95th percentiles of each statistic
+        """
+        p = self.percentiles((5, 50, 95))
+
+        summary = f"""
+        Monte Carlo Summary ({self.simulations} {self.method} paths, {len(self.pnl)} trades):
+        -----------------
+        Max Drawdown: {p['maxDrawdown']['p50']:.2f}% (5%: {p['maxDrawdown']['p5']:.2f}%, 95%: {p['maxDrawdown']['p95']:.2f}%)
+        Max Drawdown Amount: ${p['maxDrawdownAmount']['p50']:.2f} (95%: ${p['maxDrawdownAmount']['p95']:.2f})
+        Final Equity: ${p['finalEquity']['p50']:.2f} (5%: ${p['finalEquity']['p5']:.2f}, 95%: ${p['finalEquity']['p95']:.2f})
+        Max Consecutive Losses: {p['maxConsecutiveLosses']['p50']:.0f} (95%: {p['maxConsecutiveLosses']['p95']:.0f})
+        """
+
+        return summary
+
+
+def _simulate_block(pnl: np.ndarray,
+                    initial_capital: float,
+                    method: str,
+                    size: int,
+                    seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    """Simulate one block of paths and return the per-path statistics"""
+    rng = np.random.default_rng(seed)
+    n_trades = len(pnl)
+    if not n_trades:
+        return {
+            'maxDrawdown': np.zeros(size),
+            'maxDrawdownAmount': np.zeros(size),
+            'finalEquity': np.full(size, float(initial_capital)),
+            'maxConsecutiveLosses': np.zeros(size, dtype=np.int64)
+        }
+
+    if method == 'shuffle':
+        paths = rng.permuted(np.broadcast_to(pnl, (size, n_trades)), axis=1)
+    else:  # bootstrap
+        paths = pnl[rng.integers(0, n_trades, size=(size, n_trades))]
+
+    # Equity after each trade, starting from the initial capital
+    equity = np.empty((size, n_trades + 1))
+    equity[:, 0] = initial_capital
+    np.cumsum(paths, axis=1, out=equity[:, 1:])
+    equity[:, 1:] += initial_capital
+
+    peaks = np.maximum.accumulate(equity, axis=1)
+    drawdown_amounts = peaks - equity
+    max_drawdown = np.max(drawdown_amounts / peaks * 100, axis=1)
+    max_drawdown_amount = drawdown_amounts.max(axis=1)
+
+    # Longest losing streak: count of losses minus the count at the last win
+    losses = paths <= 0
+    loss_counts = np.cumsum(losses, axis=1)
+    at_last_win = np.maximum.accumulate(np.where(losses, 0, loss_counts), axis=1)
+    max_consecutive_losses = (loss_counts - at_last_win).max(axis=1)
+
+    return {
+        'maxDrawdown': max_drawdown,
+        'maxDrawdownAmount': max_drawdown_amount,
+        'finalEquity': equity[:, -1].copy(),
+        'maxConsecutiveLosses': max_consecutive_losses
+    }
@@ -0,0 +1,300 @@
+"""
+Portfolio backtesting module.
+Simulates many symbols at once on time x symbol price arrays with shared capital.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Callable, Union
+
+from .engine import _prepare_data
+from .ledger import TradeLedger
+from .kernels import EXIT_REASONS
+
+# Allocation rules: notional for each symbol entering on a bar
+ALLOCATION_RULES = ('equal_weight', 'cash_split')
+
+
+class PortfolioEngine:
+    """
+    Backtests one strategy over a universe of symbols that share capital.
+
+    Prices are held as 2-D arrays (time x symbol) on the union of all dates.
+    Every bar is processed for all symbols with array operations: exits are
+    settled first, then the freed capital is allocated to new entries. Entry
+    and exit rules follow BacktestEngine (long only, orders fill at the next
+    open), so a single-symbol portfolio reproduces BacktestEngine.run.
+    """
+
+    def __init__(self,
+                 data: Union[Dict[str, pd.DataFrame], pd.DataFrame],
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.0,
+                 slippage: float = 0.0):
+        """
+        Initialize the portfolio engine.
+
+        Args:
+            data: Mapping of symbol to a DataFrame with 'open', 'high', 'low', 'close'
+                  and 'date' columns, or a wide DataFrame indexed by date with
+                  (field, symbol) MultiIndex columns
+            initial_capital: Starting capital shared by all symbols
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+        """
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+
+        if isinstance(data, pd.DataFrame):
+            self.frames = None
+            self.symbols = list(data['close'].columns)
+            self.dates = pd.DatetimeIndex(pd.to_datetime(data.index))
+            self.opens = data['open'][self.symbols].to_numpy(dtype=np.float64)
+            self.closes = data['close'][self.symbols].to_numpy(dtype=np.float64)
+            self.panel = data
+        else:
+            if not data:
+                raise ValueError("Portfolio must contain at least one symbol")
+            self.frames = {symbol: _prepare_data(frame.copy(), calendar_columns=False) for symbol, frame in data.items()}
+            self.symbols = list(self.frames.keys())
+            self.dates = pd.DatetimeIndex(sorted(set().union(*(frame['date'] for frame in self.frames.values()))))
+            self.opens = self._align('open')
+            self.closes = self._align('close')
+            self.panel = None
+
+        # Last known close, used to value positions on bars a symbol does not trade
+        self.valuation_closes = np.nan_to_num(pd.DataFrame(self.closes).ffill().to_numpy())
+
+        self.data = pd.DataFrame(self.closes, index=self.dates, columns=self.symbols)
+        self.trades = TradeLedger(self.dates.dtype)
+        self.symbol_trades = {}
+        self.current_capital = initial_capital
+
+    def _align(self, column: str) -> np.ndarray:
+        """Stack one price column of every symbol into a time x symbol array"""
+        panel = np.full((len(self.dates), len(self.symbols)), np.nan)
+        for j, frame in enumerate(self.frames.values()):
+            rows = self.dates.get_indexer(frame['date'])
+            panel[rows, j] = frame[column].to_numpy(dtype=np.float64)
+        return panel
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """
+        Price data of one symbol in the layout strategy functions expect.
+
+        Args:
+            symbol: Symbol name
+
+        Returns:
+            DataFrame with the symbol's OHLC columns and 'date'
+        """
+        if self.frames is not None:
+            return self.frames[symbol]
+        fields = [field for field in ('open', 'high', 'low', 'close', 'volume') if field in self.panel.columns.get_level_values(0)]
+        frame = pd.DataFrame({field: self.panel[field][symbol].to_numpy() for field in fields})
+        frame['date'] = self.dates
+        return frame.dropna(subset=['open', 'close']).reset_index(drop=True)
+
+    def signal_matrix(self, strategy_func: Callable) -> np.ndarray:
+        """
+        Run a single-symbol strategy function on every symbol.
+
+        Args:
+            strategy_func: Function taking one symbol's DataFrame and returning a
+                           DataFrame with a 'signal' column (see BacktestEngine.run)
+
+        Returns:
+            Time x symbol signal array aligned with the portfolio dates
+        """
+        signals = np.zeros((len(self.dates), len(self.symbols)))
+        for j, symbol in enumerate(self.symbols):
+            frame = self.symbol_frame(symbol)
+            result = strategy_func(frame)
+            if not isinstance(result, pd.DataFrame) or 'signal' not in result.columns:
+                raise ValueError("Strategy function must return DataFrame with 'signal' column")
+            rows = self.dates.get_indexer(frame['date'])
+            signals[rows, j] = result['signal'].reindex(frame.index).to_numpy(dtype=np.float64)
+        return signals
+
+    def run(self,
+            signals: Union[Callable, pd.DataFrame, np.ndarray],
+            allocation: Union[str, Callable] = 'equal_weight') -> Dict:
+        """
+        Run the portfolio backtest.
+
+        Args:
+            signals: Time x symbol signal matrix (1 for buy, -1 for sell, 0 for no action)
+                     as an array or a DataFrame with symbol columns, or a single-symbol
+                     strategy function applied to every symbol
+            allocation: 'equal_weight' (capital / number of symbols per entry),
+                        'cash_split' (free capital split among the bar's entries), or a
+                        function allocation(capital, free_capital, entering, prices)
+                        returning the notional to buy for each symbol
+
+        Returns:
+            Dict with the portfolio 'equity_curve' and 'dates', 'positions'
+            (time x symbol sizes), all 'trades', per-symbol 'symbol_trades',
+            'final_capital', 'return_pct' and 'data' (close prices)
+        """
+        if not callable(allocation) and allocation not in ALLOCATION_RULES:
+            raise ValueError(f"Allocation must be one of {ALLOCATION_RULES} or a function")
+
+        if callable(signals):
+            signals = self.signal_matrix(signals)
+        elif isinstance(signals, pd.DataFrame):
+            signals = signals.reindex(columns=self.symbols).to_numpy(dtype=np.float64)
+        signals = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+        if signals.shape != self.closes.shape:
+            raise ValueError("Signals must have one row per date and one column per symbol")
+
+        n_bars, n_symbols = self.closes.shape
+        equity = np.empty(n_bars, dtype=np.float64)
+        equity[:1] = self.initial_capital
+        positions = np.zeros((n_bars, n_symbols), dtype=np.float64)
+
+        # Per-symbol state of the open positions
+        sizes = np.zeros(n_symbols)
+        entry_values = np.zeros(n_symbols)
+        entry_prices = np.zeros(n_symbols)
+        entry_bars = np.zeros(n_symbols, dtype=np.int64)
+        held = np.zeros(n_symbols, dtype=bool)
+        capital = self.initial_capital
+        closed = []
+
+        # Only bars following a non-zero signal can change positions
+        event_bars = np.flatnonzero((signals[:-1] != 0).any(axis=1)) + 1
+        segment_start = 1
+
+        for bar in event_bars:
+            self._fill_segment(equity, positions, segment_start, bar, capital, sizes, entry_values)
+            segment_start = bar
+
+            prev_signal = signals[bar - 1]
+            tradable = ~np.isnan(self.opens[bar])
+
+            exits = held & (prev_signal == -1) & tradable
+            if exits.any():
+                exit_prices = self.opens[bar, exits] * (1 - self.slippage)
+                trades = self._settle(np.flatnonzero(exits), bar, exit_prices,
+                                      sizes, entry_values, entry_prices, entry_bars, 'signal')
+                capital += trades['pnl'].sum()
+                closed.append(trades)
+                held[exits] = False
+                sizes[exits] = 0.0
+                entry_values[exits] = 0.0
+
+            entering = ~held & (prev_signal == 1) & tradable
+            if entering.any():
+                prices = self.opens[bar] * (1 + self.slippage)
+                free_capital = capital - entry_values.sum()
+                notional = self._allocate(allocation, capital, free_capital, entering, prices)
+                entering &= notional > 0
+
+                sizes[entering] = notional[entering] / prices[entering]
+                entry_prices[entering] = prices[entering]
+                entry_values[entering] = sizes[entering] * prices[entering]
+                entry_bars[entering] = bar
+                held |= entering
+
+        self._fill_segment(equity, positions, segment_start, n_bars, capital, sizes, entry_values)
+
+        # Close any open positions at the end of the backtest
+        if held.any():
+            trades = self._settle(np.flatnonzero(held), n_bars - 1, self.valuation_closes[-1, held],
+                                  sizes, entry_values, entry_prices, entry_bars, 'end_of_data')
+            capital += trades['pnl'].sum()
+            closed.append(trades)
+            equity[-1] = capital
+
+        self.current_capital = capital
+        self._record_trades(closed)
+
+        return {
+            'trades': self.trades,
+            'symbol_trades': self.symbol_trades,
+            'equity_curve': equity,
+            'positions': positions,
+            'dates': self.dates.to_numpy(),
+            'symbols': self.symbols,
+            'final_capital': capital,
+            'return_pct': ((capital / self.initial_capital) - 1) * 100,
+            'data': self.data
+        }
+
+    def _fill_segment(self, equity, positions, start, end, capital, sizes, entry_values) -> None:
+        """Mark bars [start, end) to market while no position changes"""
+        if end <= start:
+            return
+        equity[start:end] = capital + self.valuation_closes[start:end] @ sizes - entry_values.sum()
+        positions[start:end] = sizes
+
+    def _allocate(self, allocation, capital: float, free_capital: float, entering: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Notional to buy for each entering symbol, scaled down to the free capital"""
+        if callable(allocation):
+            notional = np.asarray(allocation(capital, free_capital, entering, prices), dtype=np.float64)
+        elif allocation == 'equal_weight':
+            notional = np.full(len(entering), capital / len(entering))
+        else:  # cash_split
+            notional = np.full(len(entering), free_capital / entering.sum())
+        notional = np.where(entering, np.maximum(notional, 0.0), 0.0)
+
+        total = notional.sum()
+        if total > 0 and total > free_capital:
+            notional *= max(free_capital, 0.0) / total
+        return notional
+
+    def _settle(self, symbols, bar, exit_prices, sizes, entry_values, entry_prices, entry_bars, exit_reason) -> Dict:
+        """Close positions in the given symbol columns and return their trade arrays"""
+        exit_values = sizes[symbols] * exit_prices
+        commission = entry_values[symbols] * self.commission + exit_values * self.commission
+        slippage = entry_values[symbols] * self.slippage + exit_values * self.slippage
+        pnl = exit_values - entry_values[symbols] - commission - slippage
+
+        return {
+            'symbol': symbols,
+            'entry_bar': entry_bars[symbols].copy(),
+            'exit_bar': np.full(len(symbols), bar),
+            'entry_price': entry_prices[symbols].copy(),
+            'exit_price': exit_prices,
+            'position_size': sizes[symbols].copy(),
+            'pnl': pnl,
+            'pnl_pct': (pnl / entry_values[symbols]) * 100,
+            'commission': commission,
+            'slippage': slippage,
+            'exit_reason': np.full(len(symbols), EXIT_REASONS.index(exit_reason))
+        }
+
+    def _record_trades(self, closed: List[Dict]) -> None:
+        """Build the portfolio ledger and one ledger per symbol from the closed trade batches"""
+        fields = ('symbol', 'entry_bar', 'exit_bar', 'entry_price', 'exit_price', 'position_size',
+                  'pnl', 'pnl_pct', 'commission', 'slippage', 'exit_reason')
+        trades = {name: np.concatenate([batch[name] for batch in closed]) if closed else np.empty(0)
+                  for name in fields}
+        dates = self.dates.to_numpy()
+
+        n_trades = len(trades['pnl'])
+        self.trades = TradeLedger(dates.dtype, capacity=n_trades)
+        self._extend_ledger(self.trades, trades, dates, np.ones(n_trades, dtype=bool))
+
+        self.symbol_trades = {}
+        for j, symbol in enumerate(self.symbols):
+            mask = trades['symbol'] == j
+            self.symbol_trades[symbol] = TradeLedger(dates.dtype, capacity=int(mask.sum()))
+            self._extend_ledger(self.symbol_trades[symbol], trades, dates, mask)
+
+    def _extend_ledger(self, ledger: TradeLedger, trades: Dict, dates: np.ndarray, mask: np.ndarray) -> None:
+        """Append the masked rows of the closed trade arrays to a ledger"""
+        ledger.extend(
+            entry_date=dates[trades['entry_bar'][mask].astype(np.int64)],
+            exit_date=dates[trades['exit_bar'][mask].astype(np.int64)],
+            entry_price=trades['entry_price'][mask],
+            exit_price=trades['exit_price'][mask],
+            position_size=trades['position_size'][mask],
+            direction=1,
+            pnl=trades['pnl'][mask],
+            pnl_pct=trades['pnl_pct'][mask],
+            commission=trades['commission'][mask],
+            slippage=trades['slippage'][mask],
+            exit_reason=trades['exit_reason'][mask]
+        )
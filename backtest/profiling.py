@@ -0,0 +1,228 @@
+"""
+Profiling module.
+Opt-in timing spans, counters and cProfile/tracemalloc capture for the backtest hot paths.
+"""
+
+import cProfile
+import pstats
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .kernels import EXIT_REASONS
+
+
+class _Span:
+    """Times one phase and adds it to the profiler's totals"""
+
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> '_Span':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        elapsed = time.perf_counter() - self._start
+        span = self._profiler._spans.setdefault(self._name, [0, 0.0])
+        span[0] += 1
+        span[1] += elapsed
+        return False
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out by disabled profilers"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Collects timing spans and counters from the engines and metrics.
+
+    Spans wrap whole phases (strategy call, data merge, simulation, metrics),
+    never single bars, and counters are derived from the results once a run
+    has finished, so an enabled profiler adds microseconds per run. A
+    disabled profiler hands out one shared no-op span and ignores counts.
+    Totals accumulate across runs until reset().
+    """
+
+    def __init__(self, enabled: bool = True, cprofile: bool = False, memory: bool = False, top: int = 20):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled: Whether to record anything
+            cprofile: Whether to run cProfile during sessions (adds per-call overhead)
+            memory: Whether to trace the peak memory of sessions with tracemalloc (slows allocations)
+            top: Number of functions listed in the cProfile report
+        """
+        self.enabled = enabled
+        self.cprofile = cprofile
+        self.memory = memory
+        self.top = top
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all recorded spans, counters and captures"""
+        self._spans = {}
+        self._counters = {}
+        self._depth = 0
+        self._profile = cProfile.Profile() if self.cprofile else None
+        self._started_tracing = False
+        self._peak_memory = 0
+
+    def span(self, name: str):
+        """
+        Context manager timing one phase.
+
+        Args:
+            name: Span name ('engine.simulate', 'metrics.calculate', ...)
+
+        Returns:
+            Context manager adding the elapsed time to the span's total
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + int(value)
+
+    def count_results(self, prefix: str, bars: int, trades) -> None:
+        """
+        Count the bars and trades of a finished run.
+
+        Args:
+            prefix: Counter prefix ('engine' or 'executor')
+            bars: Number of bars simulated
+            trades: TradeLedger of the run
+        """
+        if not self.enabled:
+            return
+        self.count(f"{prefix}.bars", bars)
+        self.count(f"{prefix}.trades", len(trades))
+        reasons = np.bincount(trades.exit_reason, minlength=len(EXIT_REASONS))
+        for reason, hits in zip(EXIT_REASONS, reasons):
+            self.count(f"{prefix}.exits.{reason}", hits)
+
+    def start(self) -> None:
+        """Start a session (cProfile and tracemalloc capture when enabled; sessions nest)"""
+        if not self.enabled:
+            return
+        self._depth += 1
+        if self._depth > 1:
+            return
+        if self.memory:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop the current session"""
+        if not self.enabled or self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+        if self.memory:
+            self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.stop()
+        return False
+
+    def report(self) -> Dict:
+        """
+        Structured report of everything recorded so far.
+
+        Returns:
+            Dict with 'spans' ({name: {'calls', 'total', 'mean'}} in seconds),
+            'counters', and 'peak_memory' (bytes) / 'profile' (top functions by
+            cumulative time) when those captures are on
+        """
+        report = {
+            'spans': {
+                name: {'calls': calls, 'total': total, 'mean': total / calls}
+                for name, (calls, total) in self._spans.items()
+            },
+            'counters': dict(self._counters)
+        }
+        if self.memory:
+            report['peak_memory'] = self._peak_memory
+        if self._profile is not None:
+            report['profile'] = self._profile_rows()
+        return report
+
+    def _profile_rows(self) -> List[Dict]:
+        """Top functions of the cProfile capture by cumulative time"""
+        if not self._profile.getstats():
+            return []
+        stats = pstats.Stats(self._profile).stats
+        rows = [
+            {
+                'function': f"{filename}:{line}({name})",
+                'calls': calls,
+                'total': total,
+                'cumulative': cumulative
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in stats.items()
+        ]
+        rows.sort(key=lambda row: row['cumulative'], reverse=True)
+        return rows[:self.top]
+
+    def get_summary(self) -> str:
+        """
+        Get a formatted summary of the recorded spans and counters.
+
+        Returns:
+            Formatted string with one line per span and counter
+        """
+        report = self.report()
+        lines = ["Profile", "=" * 50]
+        for name, span in sorted(report['spans'].items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{name:<32} {span['total']:>10.4f}s {span['calls']:>6} calls")
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"{name:<32} {value:>10}")
+        if 'peak_memory' in report:
+            lines.append(f"{'peak_memory':<32} {report['peak_memory'] / 2**20:>10.1f} MB")
+        return "\n".join(lines)
+
+
+# Profiler used when none is given; never records anything
+DISABLED = Profiler(enabled=False)
@@ -0,0 +1,218 @@
+"""
+Report module.
+Renders dashboards and metrics files for many backtests headlessly in worker processes.
+"""
+
+import json
+import math
+import os
+import re
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from matplotlib import style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .metrics import PerformanceMetrics
+from .visualization import BacktestVisualizer, dashboard_axes, STYLE
+
+# Image formats the dashboards can be written in
+FORMATS = ('png', 'svg', 'pdf')
+
+# Fixed margins of the dashboard template, so its layout is computed once per worker
+TEMPLATE_MARGINS = {'left': 0.06, 'right': 0.98, 'bottom': 0.08, 'top': 0.92}
+
+# Chunks submitted to the pool ahead of the ones being rendered
+CHUNKS_IN_FLIGHT = 2
+
+# Per-process state set up by the pool initializer
+_worker_state = {}
+
+
+class BatchReport:
+    """
+    Writes a dashboard image and a metrics JSON file for each of many backtests.
+
+    Figures are drawn on the Agg canvas without pyplot, so rendering needs
+    no display and nothing accumulates in pyplot's figure registry. Each
+    process builds the dashboard figure and its axes once and redraws the
+    axes for every result; figures are closed when the run ends. Results
+    are sent to the workers a few chunks at a time, so memory stays flat
+    over thousands of strategies.
+    """
+
+    def __init__(self,
+                 output_dir: str,
+                 formats: Sequence[str] = ('png',),
+                 figsize: Tuple[int, int] = (15, 10),
+                 dpi: int = 100,
+                 max_workers: Optional[int] = None,
+                 chunksize: Optional[int] = None):
+        """
+        Initialize the report batch.
+
+        Args:
+            output_dir: Directory the files are written to (created if missing)
+            formats: Image formats of each dashboard ('png', 'svg' and/or 'pdf')
+            figsize: Dashboard size (width, height) in inches
+            dpi: Resolution of raster images
+            max_workers: Number of worker processes (1 renders in the current process)
+            chunksize: Reports per task (defaults to ~4 tasks per worker, at most 16)
+        """
+        formats = tuple(formats)
+        for fmt in formats:
+            if fmt not in FORMATS:
+                raise ValueError(f"Format must be one of {FORMATS}")
+
+        self.output_dir = output_dir
+        self.formats = formats
+        self.figsize = figsize
+        self.dpi = dpi
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        os.makedirs(output_dir, exist_ok=True)
+
+    def run(self, results: Mapping[str, Dict], progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Render the reports of every backtest.
+
+        Args:
+            results: Mapping of strategy name to the dict returned by BacktestEngine.run
+                     (its 'metrics' are reused when present, e.g. from a ResultCache)
+            progress: Optional callback called as progress(completed, total) after each chunk
+
+        Returns:
+            DataFrame with one row per strategy (name, scalar metrics and the written
+            file paths), in the order of `results`
+        """
+        names = list(results.keys())
+        total = len(names)
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = self.chunksize or min(16, max(1, math.ceil(total / (workers * 4))))
+        chunks = [names[i:i + chunksize] for i in range(0, total, chunksize)]
+        settings = (self.output_dir, self.formats, self.figsize, self.dpi)
+        stems = _file_stems(names)
+
+        def payload(chunk: List[str]) -> List[Tuple[str, str, Dict]]:
+            return [(name, stems[name], _report_payload(results[name])) for name in chunk]
+
+        rows = {}
+        if workers == 1:
+            _init_worker(*settings)
+            try:
+                for chunk in chunks:
+                    rows.update(_render_chunk(payload(chunk)))
+                    if progress:
+                        progress(len(rows), total)
+            finally:
+                _close_worker()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=settings) as pool:
+                pending = set()
+                for chunk in chunks:
+                    pending.add(pool.submit(_render_chunk, payload(chunk)))
+                    if len(pending) < workers * CHUNKS_IN_FLIGHT:
+                        continue
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rows.update(future.result())
+                        if progress:
+                            progress(len(rows), total)
+                for future in pending:
+                    rows.update(future.result())
+                    if progress:
+                        progress(len(rows), total)
+
+        return pd.DataFrame([{'name': name, **rows[name]} for name in names])
+
+
+def _report_payload(results: Dict) -> Dict:
+    """The parts of a backtest's results a report needs (the price data is left out)"""
+    payload = {key: results[key] for key in ('equity_curve', 'trades', 'dates', 'metrics') if key in results}
+    data = results.get('data')
+    payload['data'] = data[['date']] if data is not None and 'date' in data.columns else pd.DataFrame()
+    return payload
+
+
+def _init_worker(output_dir: str, formats: Tuple[str, ...], figsize: Tuple[int, int], dpi: int) -> None:
+    """Pool initializer: build the dashboard figure reused for every report of this process"""
+    with style.context(STYLE):
+        fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    axes = dashboard_axes(fig)
+    fig.subplots_adjust(**TEMPLATE_MARGINS)
+    _worker_state.update(fig=fig, axes=axes, output_dir=output_dir, formats=formats)
+
+
+def _close_worker() -> None:
+    """Release the dashboard figure"""
+    fig = _worker_state.get('fig')
+    if fig is not None:
+        fig.clear()
+    _worker_state.clear()
+
+
+def _render_chunk(chunk: List[Tuple[str, str, Dict]]) -> Dict[str, Dict]:
+    """Write the dashboard and metrics files of a chunk of (name, file stem, results) triples"""
+    fig = _worker_state['fig']
+    axes = _worker_state['axes']
+    output_dir = _worker_state['output_dir']
+    rows = {}
+    for name, file_stem, results in chunk:
+        metrics = results.get('metrics')
+        if metrics is None:
+            metrics = PerformanceMetrics(results).get_metrics()
+        stem = os.path.join(output_dir, file_stem)
+
+        BacktestVisualizer(results, metrics).draw_dashboard(fig, axes, title=f"{name} - Backtest Performance Dashboard")
+        files = {}
+        for fmt in _worker_state['formats']:
+            files[fmt] = f"{stem}.{fmt}"
+            fig.savefig(files[fmt], format=fmt)
+
+        files['json'] = f"{stem}.json"
+        with open(files['json'], 'w') as f:
+            json.dump({'name': str(name), 'metrics': metrics}, f, indent=2, default=_json_default)
+
+        row = {k: v for k, v in metrics.items() if not isinstance(v, dict)}
+        row.update({f"{fmt}_path": path for fmt, path in files.items()})
+        rows[name] = row
+    return rows
+
+
+def _file_stems(names: List[Any]) -> Dict[Any, str]:
+    """
+    File stem of every strategy, unique even when names only differ in replaced characters or case.
+
+    Args:
+        names: Strategy names
+
+    Returns:
+        Mapping of name to stem; later names whose stem is taken get a '_2', '_3', ... suffix
+    """
+    stems = {}
+    taken = set()
+    for name in names:
+        base = _file_stem(name)
+        stem, suffix = base, 1
+        while stem.lower() in taken:
+            suffix += 1
+            stem = f"{base}_{suffix}"
+        taken.add(stem.lower())
+        stems[name] = stem
+    return stems
+
+
+def _file_stem(name: Any) -> str:
+    """File name for a strategy name (characters other than letters, digits, '.', '-' and '_' are replaced)"""
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('._') or 'strategy'
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars left in metrics to Python numbers"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot write {type(value).__name__} to a metrics file")
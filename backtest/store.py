@@ -0,0 +1,135 @@
+"""
+Shared price store module.
+Holds columnar price history in shared memory so worker processes can read it without copies.
+"""
+
+import math
+import pandas as pd
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+# Name under which a non-default index is stored in the block
+_INDEX_KEY = '__index__'
+
+
+class SharedPriceStore:
+    """
+    Columnar price data in a single shared memory block.
+
+    The process that creates the store owns the block and unlinks it; other
+    processes attach by handle and get read-only NumPy views, so attaching is
+    O(1) in the size of the data and adds no private memory for the series.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, handle: Dict, owner: bool = False):
+        """
+        Wrap an existing shared memory block. Use create() or attach() instead.
+
+        Args:
+            shm: Shared memory block holding the columns
+            handle: Picklable description of the block layout
+            owner: Whether this process created the block (and should unlink it)
+        """
+        self.shm = shm
+        self.handle = handle
+        self.owner = owner
+
+    @classmethod
+    def create(cls, data: pd.DataFrame) -> 'SharedPriceStore':
+        """
+        Copy the numeric and datetime columns of a DataFrame into a new shared block.
+
+        A string 'date'/'datetime' column is parsed to datetime64 and a
+        non-default index is stored as well. Other object columns are skipped.
+
+        Args:
+            data: DataFrame with historical price data
+
+        Returns:
+            SharedPriceStore owning the new block
+        """
+        arrays = {}
+        for name in data.columns:
+            values = data[name].to_numpy()
+            if name in ('date', 'datetime') and values.dtype.kind == 'O':
+                values = pd.to_datetime(data[name]).to_numpy()
+            if values.dtype.kind in 'biufM':
+                arrays[name] = values
+        has_index = not isinstance(data.index, pd.RangeIndex) or data.index.start != 0 or data.index.step != 1
+        if has_index:
+            arrays[_INDEX_KEY] = data.index.to_numpy()
+
+        columns = []
+        offset = 0
+        for name, values in arrays.items():
+            columns.append((name, values.dtype.str, offset))
+            offset += math.ceil(values.nbytes / 8) * 8
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        handle = {'name': shm.name, 'length': len(data), 'columns': columns}
+        for name, dtype, col_offset in columns:
+            target = np.ndarray(len(data), dtype=dtype, buffer=shm.buf, offset=col_offset)
+            target[:] = arrays[name]
+        return cls(shm, handle, owner=True)
+
+    @classmethod
+    def attach(cls, handle: Dict) -> 'SharedPriceStore':
+        """
+        Attach to a store created in another process.
+
+        Args:
+            handle: The creating store's handle
+
+        Returns:
+            SharedPriceStore with read-only access to the block
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=handle['name'], track=False)
+        except TypeError:  # track was added in Python 3.13
+            shm = shared_memory.SharedMemory(name=handle['name'])
+        return cls(shm, handle)
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the stored columns"""
+        return [name for name, _, _ in self.handle['columns'] if name != _INDEX_KEY]
+
+    def __len__(self) -> int:
+        return self.handle['length']
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Read-only view of one column"""
+        for col, dtype, offset in self.handle['columns']:
+            if col == name:
+                view = np.ndarray(len(self), dtype=dtype, buffer=self.shm.buf, offset=offset)
+                view.flags.writeable = False
+                return view
+        raise KeyError(name)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build a DataFrame whose columns are read-only views over the block.
+
+        Returns:
+            DataFrame sharing memory with the store
+        """
+        arrays = {name: self[name] for name, _, _ in self.handle['columns']}
+        index = arrays.pop(_INDEX_KEY, None)
+        return pd.DataFrame(arrays, index=index, copy=False)
+
+    def close(self) -> None:
+        """Detach from the block in this process"""
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Release the block (only the owner should call this)"""
+        self.shm.unlink()
+
+    def __enter__(self) -> 'SharedPriceStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
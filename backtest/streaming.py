@@ -0,0 +1,341 @@
+"""
+Streaming backtest module.
+Runs the engine and execution logic over an iterator of price chunks with bounded memory.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Callable, Iterable, Iterator, Optional
+
+from .engine import _TradeBook, _prepare_data
+from .execution import TradeExecutor
+from .kernels import run_execution_kernel, STATE_FIELDS
+from .ledger import TradeLedger
+
+
+class _SignalWindow:
+    """
+    Generates strategy signals chunk by chunk, prepending a tail of earlier
+    rows so indicators that look back up to `lookback` bars stay correct
+    across chunk boundaries.
+    """
+
+    def __init__(self, strategy_func: Optional[Callable], lookback: int):
+        self.strategy_func = strategy_func
+        self.lookback = lookback
+        self.tail = None
+
+    def signals_for(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Signal values for the rows of a chunk"""
+        if self.strategy_func is None:
+            if 'signal' not in chunk.columns:
+                raise ValueError("Chunks must contain a 'signal' column when no strategy function is given")
+            return chunk['signal'].to_numpy(dtype=np.float64)
+
+        window = pd.concat([self.tail, chunk]) if self.tail is not None else chunk
+        signals = self.strategy_func(window)
+        if not isinstance(signals, pd.DataFrame) or 'signal' not in signals.columns:
+            raise ValueError("Strategy function must return DataFrame with 'signal' column")
+
+        if self.lookback > 0:
+            self.tail = window.iloc[-self.lookback:]
+        return signals['signal'].reindex(chunk.index).to_numpy(dtype=np.float64)
+
+
+class StreamingEngine(_TradeBook):
+    """
+    Runs the BacktestEngine simulation over a stream of OHLC chunks.
+
+    Only the open trade, the capital, the previous bar's signal and a
+    `lookback` tail of rows are kept between chunks. Results match
+    BacktestEngine.run on the concatenated data as long as the strategy
+    needs no more than `lookback` earlier rows and chunks keep a global index.
+    """
+
+    def __init__(self,
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.0,
+                 slippage: float = 0.0):
+        """
+        Initialize the streaming engine.
+
+        Args:
+            initial_capital: Starting capital for the backtest
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+        """
+        # Price data arrives through stream(), so no data is held up front
+        self.data = None
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+
+        self.trades = TradeLedger()
+        self._open_trade = None
+        self.equity_curve = np.empty(0, dtype=np.float64)
+        self.positions = np.empty(0, dtype=np.float64)
+        self.current_position = 0
+        self.current_capital = initial_capital
+
+    def stream(self,
+               chunks: Iterable[pd.DataFrame],
+               strategy_func: Callable,
+               lookback: int = 0) -> Iterator[Dict]:
+        """
+        Run the backtest chunk by chunk.
+
+        Each equity point is emitted once it is final, i.e. one bar late, so
+        the last point can still be corrected when the open position is
+        closed at the end of the data.
+
+        Args:
+            chunks: Iterable of DataFrames with consecutive bars ('open', 'high', 'low', 'close', 'date')
+            strategy_func: Function that generates entry/exit signals (see BacktestEngine.run)
+            lookback: Number of earlier rows the strategy needs to produce correct signals
+
+        Yields:
+            Dict per chunk with 'trades' closed in it and the new 'equity_curve' points
+            (arrays aligned with 'dates') and 'positions'; the last update also has
+            'final_capital' and 'return_pct'
+        """
+        self.trades = None
+        self._open_trade = None
+        self.current_position = 0
+        self.current_capital = self.initial_capital
+
+        window = _SignalWindow(strategy_func, lookback)
+        prev_signal = 0.0
+        pending_equity = None
+        last_date = None
+        last_close = None
+
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            chunk = _prepare_data(chunk.copy())
+            if self.trades is None:
+                self.trades = TradeLedger(chunk['date'].dtype)
+            signal = window.signals_for(chunk)
+            dates = chunk['date']
+            date_values = dates.to_numpy()
+
+            equity, positions = self._simulate_chunk(
+                chunk['open'].to_numpy(dtype=np.float64),
+                chunk['close'].to_numpy(dtype=np.float64),
+                signal,
+                dates,
+                prev_signal
+            )
+
+            # The very first bar has no position entry (as in BacktestEngine.run)
+            if pending_equity is None:
+                positions = positions[1:]
+                emitted = equity[:-1]
+                emitted_dates = date_values[:-1]
+            else:
+                emitted = np.concatenate([[pending_equity], equity[:-1]])
+                emitted_dates = np.concatenate([[last_date], date_values[:-1]])
+            pending_equity = equity[-1]
+
+            prev_signal = signal[-1]
+            last_date = date_values[-1]
+            last_close = chunk['close'].iloc[-1]
+
+            yield {
+                'trades': self._pop_closed_trades(),
+                'equity_curve': emitted,
+                'positions': positions,
+                'dates': emitted_dates
+            }
+
+        # Close any open positions at the end of the stream
+        if self.trades is None:
+            self.trades = TradeLedger()
+        if self.current_position > 0:
+            self._close_trade(pd.Timestamp(last_date), last_close, 'end_of_data')
+            pending_equity = self.current_capital
+            self.current_position = 0
+
+        yield {
+            'trades': self._pop_closed_trades(),
+            'equity_curve': np.array([pending_equity if pending_equity is not None else self.initial_capital]),
+            'positions': np.empty(0, dtype=np.float64),
+            'dates': np.array([last_date]) if last_date is not None else np.empty(0, dtype='datetime64[ns]'),
+            'final_capital': self.current_capital,
+            'return_pct': ((self.current_capital / self.initial_capital) - 1) * 100
+        }
+
+    def _pop_closed_trades(self) -> TradeLedger:
+        """Return the trades closed since the last call and start a new ledger"""
+        closed = self.trades
+        self.trades = TradeLedger(closed.entry_date.dtype)
+        return closed
+
+
+class StreamingExecutor:
+    """
+    Runs TradeExecutor's execution logic over a stream of OHLC chunks.
+
+    The array kernel's position state (open trade, stops, capital) is carried
+    between chunks together with the last bar and the true range window used
+    for ATR.
+    """
+
+    def __init__(self,
+                 executor: TradeExecutor,
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.0,
+                 slippage: float = 0.0,
+                 atr_period: int = 14):
+        """
+        Initialize the streaming executor.
+
+        Args:
+            executor: TradeExecutor holding the sizing and stop settings
+            initial_capital: Initial capital
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+            atr_period: ATR period used when chunks have no 'atr' column
+        """
+        self.executor = executor
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.atr_period = atr_period
+
+    def stream(self,
+               chunks: Iterable[pd.DataFrame],
+               strategy_func: Optional[Callable] = None,
+               lookback: int = 0) -> Iterator[Dict]:
+        """
+        Run the execution logic chunk by chunk.
+
+        Results match apply_execution_logic on the concatenated data when the
+        chunks carry an 'atr' column. Otherwise ATR is computed on the fly:
+        from bar atr_period - 1 on it equals the batch ATR, while the bars
+        before it get the mean true range seen so far (as in RunningATR)
+        instead of the mean over the whole history, which is not known yet.
+        Either way the results do not depend on the chunk sizes.
+
+        Args:
+            chunks: Iterable of DataFrames with consecutive bars ('open', 'high', 'low', 'close')
+            strategy_func: Function returning a DataFrame with a 'signal' column;
+                           when omitted, chunks must contain a 'signal' column
+            lookback: Number of earlier rows the strategy needs to produce correct signals
+
+        Yields:
+            Dict per chunk with 'trades' closed in it and the new 'equity_curve' points
+            (arrays aligned with 'dates') and 'positions'; the last
+            update also has 'final_capital' and 'return_pct'
+        """
+        params = self.executor._kernel_params(self.commission, self.slippage)
+        state = np.zeros(STATE_FIELDS, dtype=np.float64)
+        state[7] = self.initial_capital
+
+        window = _SignalWindow(strategy_func, lookback)
+        carry = None            # last bar of the previous chunk: (label, open, high, low, close, atr, signal)
+        open_entry_date = None  # entry label of a position opened in an earlier chunk
+        tr_tail = np.empty(0)
+        tr_seen = (0.0, 0)
+        pending_equity = None
+        last_date = None
+
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            for col in ('open', 'high', 'low', 'close'):
+                if col not in chunk.columns:
+                    raise ValueError(f"Data must contain '{col}' column")
+
+            high = chunk['high'].to_numpy(dtype=np.float64)
+            low = chunk['low'].to_numpy(dtype=np.float64)
+            close = chunk['close'].to_numpy(dtype=np.float64)
+            if 'atr' in chunk.columns:
+                atr = chunk['atr'].to_numpy(dtype=np.float64)
+            else:
+                atr, tr_tail, tr_seen = self._stream_atr(high, low, close, carry, tr_tail, tr_seen)
+            columns = [chunk['open'].to_numpy(dtype=np.float64), high, low, close, atr, window.signals_for(chunk)]
+            labels = chunk.index
+
+            # Prepend the previous bar so the kernel sees its signal and resumes from it
+            if carry is not None:
+                columns = [np.concatenate([[carry[k + 1]], col]) for k, col in enumerate(columns)]
+                labels = pd.Index([carry[0]]).append(labels)
+
+            equity, positions, trade_rows = run_execution_kernel(*columns, params, state)
+            trades = TradeLedger(labels.dtype, capacity=len(trade_rows))
+            self.executor._record_kernel_trades(trades, trade_rows, labels, open_entry_date)
+
+            if state[0]:
+                # Re-base the open position's entry bar onto the next chunk
+                if state[3] >= 0:
+                    open_entry_date = labels[int(state[3])]
+                state[3] = -1
+
+            date_values = self.executor._result_dates(chunk)
+            if pending_equity is None:
+                emitted = equity[:-1]
+                emitted_dates = date_values[:-1]
+            else:
+                emitted = np.concatenate([[pending_equity], equity[1:-1]])
+                emitted_dates = np.concatenate([[last_date], date_values[:-1]])
+            pending_equity = equity[-1]
+            last_date = date_values[-1]
+            carry = (labels[-1],) + tuple(col[-1] for col in columns)
+
+            yield {
+                'trades': trades,
+                'equity_curve': emitted,
+                'positions': positions,
+                'dates': emitted_dates
+            }
+
+        # Close any open positions at the end
+        trades = TradeLedger(labels.dtype if carry is not None else 'datetime64[ns]', capacity=1)
+        if state[0]:
+            self.executor._close_kernel_position(
+                trades, state, open_entry_date, carry[4], carry[0], self.commission
+            )
+            pending_equity = state[7]
+
+        current_capital = state[7]
+        yield {
+            'trades': trades,
+            'equity_curve': np.array([pending_equity if pending_equity is not None else self.initial_capital]),
+            'positions': np.empty(0, dtype=np.float64),
+            'dates': np.array([last_date]) if last_date is not None else np.empty(0),
+            'final_capital': current_capital,
+            'return_pct': ((current_capital / self.initial_capital) - 1) * 100
+        }
+
+    def _stream_atr(self, high, low, close, carry, tr_tail, tr_seen):
+        """
+        ATR for one chunk, continuing the true range window of earlier chunks.
+
+        Bars before the first full window get the mean true range of the bars
+        seen so far (as RunningATR does), so the values do not depend on how
+        the data is split into chunks.
+
+        Returns:
+            Tuple of (atr, new true range tail, (sum, count) of the true ranges seen)
+        """
+        prev_close = np.empty(len(close))
+        prev_close[0] = carry[4] if carry is not None else np.nan
+        prev_close[1:] = close[:-1]
+
+        tr = pd.concat([
+            pd.Series(high - low),
+            pd.Series(np.abs(high - prev_close)),
+            pd.Series(np.abs(low - prev_close))
+        ], axis=1).max(axis=1).to_numpy()
+
+        tr_window = np.concatenate([tr_tail, tr])
+        atr = pd.Series(tr_window).rolling(window=self.atr_period).mean().to_numpy()[len(tr_tail):]
+        tr_sum, tr_count = tr_seen
+        warm_up = np.isnan(atr)
+        if warm_up.any():
+            running_mean = (tr_sum + np.cumsum(tr)) / (tr_count + np.arange(1, len(tr) + 1))
+            atr = np.where(warm_up, running_mean, atr)
+
+        tail = tr_window[-(self.atr_period - 1):] if self.atr_period > 1 else np.empty(0)
+        return atr, tail, (tr_sum + tr.sum(), tr_count + len(tr))
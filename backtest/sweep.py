@@ -0,0 +1,154 @@
+"""
+Parameter sweep module.
+Runs a strategy over a grid of parameters in parallel worker processes.
+"""
+
+import itertools
+import math
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Callable, Optional, Sequence, Tuple
+
+from .engine import BacktestEngine
+from .metrics import PerformanceMetrics
+from .store import SharedPriceStore
+from .cache import ResultCache
+
+# Per-process state set up by the pool initializer
+_worker_state = {}
+
+
+class ParameterSweep:
+    """
+    Runs a strategy function over every combination of a parameter grid.
+    """
+
+    def __init__(self,
+                 data: pd.DataFrame,
+                 strategy_func: Callable,
+                 param_grid: Dict[str, Sequence],
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.0,
+                 slippage: float = 0.0,
+                 mode: str = 'vectorized',
+                 max_workers: Optional[int] = None,
+                 chunksize: Optional[int] = None,
+                 result_cache: Optional[ResultCache] = None):
+        """
+        Initialize the parameter sweep.
+
+        Args:
+            data: DataFrame with historical price data; strategies receive its numeric and date
+                  columns as stored in a SharedPriceStore (without object or 'day_of_week'/'month'
+                  columns), whatever the number of workers
+            strategy_func: Module-level function called as strategy_func(data, **params)
+            param_grid: Mapping of parameter name to the values to try
+            initial_capital: Starting capital for each backtest
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+            mode: BacktestEngine.run mode used for each combination
+            max_workers: Number of worker processes (1 runs in the current process)
+            chunksize: Combinations per task (defaults to ~4 tasks per worker)
+            result_cache: Optional ResultCache shared by the workers; combinations already
+                          stored are not run again, so an interrupted sweep resumes
+        """
+        if not param_grid:
+            raise ValueError("Parameter grid must contain at least one parameter")
+
+        self.data = data
+        self.strategy_func = strategy_func
+        self.param_grid = param_grid
+        self.engine_kwargs = {
+            'initial_capital': initial_capital,
+            'commission': commission,
+            'slippage': slippage,
+            'result_cache': result_cache
+        }
+        self.mode = mode
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+
+    def combinations(self) -> List[Dict]:
+        """
+        List parameter combinations in deterministic grid order.
+
+        Returns:
+            List of parameter dictionaries
+        """
+        names = list(self.param_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*self.param_grid.values())]
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Run the backtest for every parameter combination.
+
+        Args:
+            progress: Optional callback called as progress(completed, total) after each chunk
+
+        Returns:
+            DataFrame with one row per combination (parameters followed by metrics), in grid order
+        """
+        combos = self.combinations()
+        total = len(combos)
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = self.chunksize or max(1, math.ceil(total / (workers * 4)))
+        indexed = list(enumerate(combos))
+        chunks = [indexed[i:i + chunksize] for i in range(0, total, chunksize)]
+
+        rows = []
+        # Workers and the in-process path both read the data through the store,
+        # so strategies see the same columns whatever the number of workers
+        with SharedPriceStore.create(self.data) as store:
+            if workers == 1:
+                _init_worker_state(store, self.strategy_func, self.engine_kwargs, self.mode)
+                try:
+                    for chunk in chunks:
+                        rows.extend(_run_chunk(chunk))
+                        if progress:
+                            progress(len(rows), total)
+                finally:
+                    _worker_state.clear()
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(store.handle, self.strategy_func, self.engine_kwargs, self.mode)
+                ) as pool:
+                    futures = [pool.submit(_run_chunk, chunk) for chunk in chunks]
+                    for future in as_completed(futures):
+                        rows.extend(future.result())
+                        if progress:
+                            progress(len(rows), total)
+
+        rows.sort(key=lambda row: row[0])
+        return pd.DataFrame(
+            [{**combos[idx], **metrics} for idx, metrics in rows],
+            columns=list(self.param_grid.keys()) + (list(rows[0][1].keys()) if rows else [])
+        )
+
+
+def _init_worker(handle: Dict, strategy_func: Callable, engine_kwargs: Dict, mode: str) -> None:
+    """Pool initializer: attach to the shared price data once per worker"""
+    store = SharedPriceStore.attach(handle)
+    _worker_state['store'] = store
+    _init_worker_state(store, strategy_func, engine_kwargs, mode)
+
+
+def _init_worker_state(data: SharedPriceStore, strategy_func: Callable, engine_kwargs: Dict, mode: str) -> None:
+    """Build the engine reused by every combination run in this process"""
+    _worker_state['engine'] = BacktestEngine(data, **engine_kwargs)
+    _worker_state['strategy_func'] = strategy_func
+    _worker_state['mode'] = mode
+
+
+def _run_chunk(chunk: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict]]:
+    """Backtest a chunk of (index, params) pairs and return scalar metrics for each"""
+    engine = _worker_state['engine']
+    strategy_func = _worker_state['strategy_func']
+    rows = []
+    for idx, params in chunk:
+        results = engine.run(lambda data: strategy_func(data, **params), mode=_worker_state['mode'])
+        metrics = results['metrics'] if 'metrics' in results else PerformanceMetrics(results).get_metrics()
+        rows.append((idx, {k: v for k, v in metrics.items() if not isinstance(v, dict)}))
+    return rows
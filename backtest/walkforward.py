@@ -0,0 +1,319 @@
+"""
+Walk-forward optimization module.
+Optimizes a strategy on rolling or anchored in-sample windows and stitches the out-of-sample runs.
+"""
+
+import itertools
+import math
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Callable, Optional, Sequence, Tuple
+
+from .engine import BacktestEngine
+from .metrics import PerformanceMetrics
+from .store import SharedPriceStore
+from .ledger import TradeLedger
+
+# Per-process state set up by the pool initializer
+_worker_state = {}
+
+
+class WalkForward:
+    """
+    Walk-forward optimization of a strategy over a parameter grid.
+
+    The history is split into consecutive windows of `in_sample` bars used
+    to pick the parameters and `out_of_sample` bars they are then traded on.
+    Signals are computed once per parameter combination on the full history
+    and sliced for every window, so indicators are not recomputed for
+    overlapping windows and need no warm-up inside a window. Combinations
+    run in parallel worker processes sharing the price data.
+    """
+
+    def __init__(self,
+                 data: pd.DataFrame,
+                 strategy_func: Callable,
+                 param_grid: Dict[str, Sequence],
+                 in_sample: int,
+                 out_of_sample: int,
+                 step: Optional[int] = None,
+                 anchored: bool = False,
+                 objective: str = 'netProfit',
+                 initial_capital: float = 10000.0,
+                 commission: float = 0.0,
+                 slippage: float = 0.0,
+                 max_workers: Optional[int] = None,
+                 chunksize: Optional[int] = None):
+        """
+        Initialize the walk-forward optimization.
+
+        Args:
+            data: DataFrame with historical price data; strategies receive its numeric and date
+                  columns as stored in a SharedPriceStore (without object or 'day_of_week'/'month'
+                  columns), whatever the number of workers
+            strategy_func: Module-level function called as strategy_func(data, **params); it must
+                           only look back in time, since it is run once on the full history
+            param_grid: Mapping of parameter name to the values to try
+            in_sample: Number of bars each optimization window spans (the first one when anchored)
+            out_of_sample: Number of bars traded with the parameters chosen on the preceding window
+            step: Bars between window starts (defaults to out_of_sample)
+            anchored: Whether every in-sample window starts at the first bar
+            objective: PerformanceMetrics key maximized on the in-sample windows
+            initial_capital: Starting capital of the stitched out-of-sample run
+            commission: Commission per trade (percentage)
+            slippage: Slippage per trade (percentage)
+            max_workers: Number of worker processes (1 runs in the current process)
+            chunksize: Combinations per task (defaults to ~4 tasks per worker)
+        """
+        if not param_grid:
+            raise ValueError("Parameter grid must contain at least one parameter")
+        if in_sample < 1 or out_of_sample < 1:
+            raise ValueError("In-sample and out-of-sample windows must span at least one bar")
+
+        self.data = data
+        self.strategy_func = strategy_func
+        self.param_grid = param_grid
+        self.in_sample_bars = in_sample
+        self.out_of_sample_bars = out_of_sample
+        self.step = step or out_of_sample
+        self.anchored = anchored
+        self.objective = objective
+        self.engine_kwargs = {
+            'initial_capital': initial_capital,
+            'commission': commission,
+            'slippage': slippage
+        }
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+
+        # In-sample metrics of every (window, combination), computed on first use
+        self._in_sample = None
+
+    def combinations(self) -> List[Dict]:
+        """
+        List parameter combinations in deterministic grid order.
+
+        Returns:
+            List of parameter dictionaries
+        """
+        names = list(self.param_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*self.param_grid.values())]
+
+    def windows(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Row ranges of the walk-forward windows.
+
+        The last out-of-sample window is cut short at the end of the data.
+
+        Returns:
+            List of (in_sample_start, in_sample_stop, out_of_sample_start, out_of_sample_stop)
+            row positions, stops exclusive
+        """
+        n = len(self.data)
+        windows = []
+        start = 0
+        while start + self.in_sample_bars < n:
+            is_start = 0 if self.anchored else start
+            is_stop = start + self.in_sample_bars
+            windows.append((is_start, is_stop, is_stop, min(is_stop + self.out_of_sample_bars, n)))
+            start += self.step
+        if not windows:
+            raise ValueError("Data is too short for one in-sample and out-of-sample window")
+        return windows
+
+    def in_sample(self, progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Backtest every parameter combination on every in-sample window.
+
+        The table is cached, so choosing parameters with another objective
+        does not run the backtests again.
+
+        Args:
+            progress: Optional callback called as progress(completed, total) after each chunk of combinations
+
+        Returns:
+            DataFrame with one row per window and combination ('window', parameters,
+            then scalar metrics), sorted by window and grid order
+        """
+        if self._in_sample is not None:
+            return self._in_sample
+
+        combos = self.combinations()
+        windows = self.windows()
+        total = len(combos)
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = self.chunksize or max(1, math.ceil(total / (workers * 4)))
+        indexed = list(enumerate(combos))
+        chunks = [indexed[i:i + chunksize] for i in range(0, total, chunksize)]
+
+        rows = []
+        done = 0
+        with SharedPriceStore.create(self.data) as store:
+            if workers == 1:
+                _init_worker_state(store, self.strategy_func, self.engine_kwargs, windows)
+                try:
+                    for chunk in chunks:
+                        rows.extend(_run_chunk(chunk))
+                        done += len(chunk)
+                        if progress:
+                            progress(done, total)
+                finally:
+                    _worker_state.clear()
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(store.handle, self.strategy_func, self.engine_kwargs, windows)
+                ) as pool:
+                    futures = {pool.submit(_run_chunk, chunk): len(chunk) for chunk in chunks}
+                    for future in as_completed(futures):
+                        rows.extend(future.result())
+                        done += futures[future]
+                        if progress:
+                            progress(done, total)
+
+        rows.sort(key=lambda row: (row[0], row[1]))
+        metric_names = list(rows[0][2].keys()) if rows else []
+        self._in_sample = pd.DataFrame(
+            [{'window': window, **combos[idx], **metrics} for window, idx, metrics in rows],
+            columns=['window'] + list(self.param_grid.keys()) + metric_names
+        )
+        return self._in_sample
+
+    def run(self,
+            objective: Optional[str] = None,
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Optimize on each in-sample window and trade the best parameters out of sample.
+
+        Out-of-sample windows are run in order, each starting with the
+        capital the previous one ended with, and stitched into one result.
+
+        Args:
+            objective: PerformanceMetrics key to maximize (defaults to the one given at init)
+            progress: Optional callback passed to in_sample()
+
+        Returns:
+            Dict with 'windows' (DataFrame with the dates, chosen parameters, in-sample
+            score and out-of-sample return of each window), 'results' (the stitched
+            out-of-sample backtest, same layout as BacktestEngine.run), 'metrics'
+            (PerformanceMetrics of the stitched run) and 'in_sample' (see in_sample())
+        """
+        objective = objective or self.objective
+        table = self.in_sample(progress)
+        if objective not in table.columns:
+            raise ValueError(f"Objective must be a scalar metric, got '{objective}'")
+
+        # Out-of-sample runs read the data through the store like the in-sample ones
+        with SharedPriceStore.create(self.data) as store:
+            _init_worker_state(store, self.strategy_func, self.engine_kwargs, self.windows())
+            try:
+                capital, parts, summary = _run_out_of_sample(table, objective, self.combinations())
+            finally:
+                _worker_state.clear()
+        equity_parts, position_parts, date_parts, data_parts, ledgers = parts
+
+        initial_capital = self.engine_kwargs['initial_capital']
+        stitched = {
+            'trades': TradeLedger.concat(ledgers),
+            'equity_curve': np.concatenate(equity_parts),
+            'positions': np.concatenate(position_parts)[1:],
+            'dates': np.concatenate(date_parts),
+            'final_capital': capital,
+            'return_pct': ((capital / initial_capital) - 1) * 100,
+            'data': pd.concat(data_parts)
+        }
+
+        return {
+            'windows': pd.DataFrame(summary),
+            'results': stitched,
+            'metrics': PerformanceMetrics(stitched),
+            'in_sample': table
+        }
+
+
+def _signal_array(engine: BacktestEngine, strategy_func: Callable, params: Dict) -> np.ndarray:
+    """Signals of a parameter combination over the engine's full data"""
+    signals = strategy_func(engine.data, **params)
+    if not isinstance(signals, pd.DataFrame) or 'signal' not in signals.columns:
+        raise ValueError("Strategy function must return DataFrame with 'signal' column")
+    return np.nan_to_num(signals['signal'].reindex(engine.data.index).to_numpy(dtype=np.float64))
+
+
+def _init_worker(handle: Dict, strategy_func: Callable, engine_kwargs: Dict, windows: List[Tuple[int, int, int, int]]) -> None:
+    """Pool initializer: attach to the shared price data once per worker"""
+    store = SharedPriceStore.attach(handle)
+    _worker_state['store'] = store
+    _init_worker_state(store, strategy_func, engine_kwargs, windows)
+
+
+def _init_worker_state(data: SharedPriceStore, strategy_func: Callable, engine_kwargs: Dict, windows: List[Tuple[int, int, int, int]]) -> None:
+    """Build the engine reused by every combination and window run in this process"""
+    _worker_state['engine'] = BacktestEngine(data, **engine_kwargs)
+    _worker_state['strategy_func'] = strategy_func
+    _worker_state['windows'] = windows
+
+
+def _run_chunk(chunk: List[Tuple[int, Dict]]) -> List[Tuple[int, int, Dict]]:
+    """Backtest a chunk of (index, params) pairs on every in-sample window"""
+    engine = _worker_state['engine']
+    rows = []
+    for idx, params in chunk:
+        signal = _signal_array(engine, _worker_state['strategy_func'], params)
+        for window, (is_start, is_stop, _, _) in enumerate(_worker_state['windows']):
+            results = engine.run_signals(signal, is_start, is_stop)
+            metrics = PerformanceMetrics(results).get_metrics()
+            rows.append((window, idx, {k: v for k, v in metrics.items() if not isinstance(v, dict)}))
+    return rows
+
+
+def _run_out_of_sample(table: pd.DataFrame, objective: str, combos: List[Dict]) -> Tuple[float, Tuple[List, ...], List[Dict]]:
+    """
+    Trade the best in-sample parameters of every window with this process's engine.
+
+    Args:
+        table: In-sample metrics (see WalkForward.in_sample)
+        objective: Column of the table to maximize
+        combos: Parameter combinations in grid order
+
+    Returns:
+        Tuple of (final capital, (equity, positions, dates, data and ledger of each
+        window), summary row of each window); nothing refers to the engine's data
+    """
+    engine = _worker_state['engine']
+    dates = engine.data['date']
+    signal_cache = {}
+
+    capital = engine.initial_capital
+    equity_parts, position_parts, date_parts, data_parts, ledgers, summary = [], [], [], [], [], []
+    for window, (is_start, is_stop, oos_start, oos_stop) in enumerate(_worker_state['windows']):
+        # Rows of a window are in grid order, so the row position is the combination index
+        scores = table.loc[table['window'] == window, objective].to_numpy(dtype=np.float64)
+        best = int(np.nanargmax(scores))
+        params = combos[best]
+
+        if best not in signal_cache:
+            signal_cache[best] = _signal_array(engine, _worker_state['strategy_func'], params)
+
+        engine.initial_capital = capital
+        results = engine.run_signals(signal_cache[best], oos_start, oos_stop)
+
+        equity_parts.append(results['equity_curve'])
+        position_parts.append(np.concatenate([[0.0], results['positions']]))
+        date_parts.append(np.array(results['dates']))
+        data_parts.append(results['data'].copy())
+        ledgers.append(results['trades'])
+        summary.append({
+            'window': window,
+            'in_sample_start': dates.iloc[is_start],
+            'in_sample_end': dates.iloc[is_stop - 1],
+            'out_of_sample_start': dates.iloc[oos_start],
+            'out_of_sample_end': dates.iloc[oos_stop - 1],
+            **params,
+            'in_sample_score': scores[best],
+            'out_of_sample_return_pct': results['return_pct']
+        })
+        capital = results['final_capital']
+    return capital, (equity_parts, position_parts, date_parts, data_parts, ledgers), summary
@@ -0,0 +1,7 @@
+"""
+Benchmark suite for the backtesting package.
+
+Usage:
+    python -m benchmarks [--profile quick|standard|full] [--filter TEXT] [--repeat N]
+                         [--baseline FILE] [--save-baseline] [--threshold 0.25]
+"""
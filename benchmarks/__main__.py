@@ -0,0 +1,138 @@
+"""
+Benchmark runner: times each benchmark, records peak memory and compares with a stored baseline.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Dict, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+
+from .suite import Benchmark, benchmarks
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Fast benchmarks are repeated until their runs add up to this many seconds
+MIN_TOTAL_TIME = 0.2
+MAX_RUNS = 1000
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Dict:
+    """
+    Time a benchmark and record its peak memory.
+
+    The first run is a warm-up (JIT compilation, caches). Time is the best
+    of at least `repeat` runs (more for fast benchmarks); peak memory comes
+    from one more run under tracemalloc, kept separate so tracing does not
+    slow the timed runs.
+
+    Args:
+        benchmark: Benchmark to run
+        repeat: Number of timed runs
+
+    Returns:
+        Dict with 'time' (seconds) and 'peak_memory' (bytes allocated during the run)
+    """
+    state = benchmark.setup()
+    benchmark.run(state)
+
+    times = []
+    while len(times) < repeat or (sum(times) < MIN_TOTAL_TIME and len(times) < MAX_RUNS):
+        start = time.perf_counter()
+        benchmark.run(state)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        benchmark.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'time': min(times), 'peak_memory': peak}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float, memory_threshold: float) -> List[str]:
+    """
+    Regressions of the results over the baseline.
+
+    Args:
+        results: Measurements by benchmark name
+        baseline: Stored measurements by benchmark name
+        threshold: Allowed relative slowdown (0.25 = 25%)
+        memory_threshold: Allowed relative growth of peak memory
+
+    Returns:
+        One message per regression (benchmarks missing from the baseline count as regressions)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            regressions.append(f"{name}: not in the baseline (refresh it with --save-baseline)")
+            continue
+        if result['time'] > base['time'] * (1 + threshold):
+            regressions.append(f"{name}: time {result['time']:.4f}s vs baseline {base['time']:.4f}s")
+        if result['peak_memory'] > base['peak_memory'] * (1 + memory_threshold):
+            regressions.append(f"{name}: peak memory {result['peak_memory'] / 2**20:.1f} MB "
+                               f"vs baseline {base['peak_memory'] / 2**20:.1f} MB")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; returns 1 when a benchmark regressed, 2 when there is no baseline"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Backtesting benchmarks")
+    parser.add_argument('--profile', default='quick', choices=['quick', 'standard', 'full'])
+    parser.add_argument('--filter', default=None, help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help="Allowed relative peak memory growth")
+    parser.add_argument('--output', default=None, help="Write the results as JSON")
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore', message='This figure includes Axes that are not compatible with tight_layout')
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    elif not args.save_baseline:
+        print(f"No baseline at {args.baseline}; create one with --save-baseline", file=sys.stderr)
+        return 2
+
+    results = {}
+    for benchmark in benchmarks(args.profile):
+        if args.filter and args.filter not in benchmark.name:
+            continue
+        result = measure(benchmark, args.repeat)
+        results[benchmark.name] = result
+
+        base = baseline.get(benchmark.name)
+        change = f"{(result['time'] / base['time'] - 1) * 100:+.1f}%" if base else ""
+        print(f"{benchmark.name:<55} {result['time']:>10.4f}s {result['peak_memory'] / 2**20:>10.1f} MB {change:>8}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Synthetic data generators for the benchmarks.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict
+
+from backtest.ledger import TradeLedger
+
+
+def make_prices(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Random-walk OHLC bars at one-minute spacing.
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+
+    Returns:
+        DataFrame with 'date', 'open', 'high', 'low' and 'close' columns
+    """
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, n_bars)))
+    open_ = np.empty(n_bars)
+    open_[:1] = 100.0
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0.0, 0.0005, n_bars)) * close
+    return pd.DataFrame({
+        'date': pd.date_range('2000-01-03', periods=n_bars, freq='min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close
+    })
+
+
+def make_signals(n_bars: int, n_trades: int, seed: int = 0) -> np.ndarray:
+    """
+    Signals that open and close about `n_trades` long trades.
+
+    Args:
+        n_bars: Number of bars
+        n_trades: Approximate number of round trips
+        seed: Random seed
+
+    Returns:
+        Array with a buy (1) at each entry bar and a sell (-1) some bars later
+    """
+    rng = np.random.default_rng(seed)
+    signal = np.zeros(n_bars)
+    spacing = max(n_bars // max(n_trades, 1), 2)
+    entries = np.arange(0, n_bars - 1, spacing)
+    exits = np.minimum(entries + rng.integers(1, spacing, len(entries)), n_bars - 1)
+    signal[entries] = 1.0
+    signal[exits] = -1.0
+    return signal
+
+
+def make_results(n_trades: int, seed: int = 0, initial_capital: float = 10000.0) -> Dict:
+    """
+    Backtest results with `n_trades` closed trades, one equity point per trade.
+
+    Args:
+        n_trades: Number of trades
+        seed: Random seed
+        initial_capital: Starting capital
+
+    Returns:
+        Dict in the layout returned by BacktestEngine.run
+    """
+    rng = np.random.default_rng(seed)
+    entry_dates = pd.date_range('2000-01-03', periods=n_trades, freq='h').to_numpy()
+    exit_dates = entry_dates + rng.integers(1, 59, n_trades).astype('timedelta64[m]')
+    entry_price = 100.0 + rng.normal(0.0, 5.0, n_trades)
+    exit_price = entry_price * (1 + rng.normal(0.0005, 0.01, n_trades))
+    position_size = np.full(n_trades, 10.0)
+    pnl = (exit_price - entry_price) * position_size
+
+    trades = TradeLedger(entry_dates.dtype, capacity=n_trades)
+    trades.extend(
+        entry_date=entry_dates,
+        exit_date=exit_dates,
+        entry_price=entry_price,
+        exit_price=exit_price,
+        position_size=position_size,
+        direction=1,
+        pnl=pnl,
+        pnl_pct=(exit_price / entry_price - 1) * 100,
+        commission=0.0,
+        slippage=0.0,
+        exit_reason=2
+    )
+
+    equity = np.empty(n_trades + 1)
+    equity[0] = initial_capital
+    equity[1:] = initial_capital + np.cumsum(pnl)
+    dates = np.concatenate([entry_dates[:1], exit_dates])
+    return {
+        'trades': trades,
+        'equity_curve': equity,
+        'positions': position_size,
+        'dates': dates,
+        'final_capital': equity[-1],
+        'return_pct': (equity[-1] / initial_capital - 1) * 100,
+        'data': pd.DataFrame({'date': dates, 'close': equity})
+    }
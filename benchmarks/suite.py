@@ -0,0 +1,184 @@
+"""
+Benchmark definitions for the engine, executor, metrics and visualization hot paths.
+"""
+
+import os
+import tempfile
+import pandas as pd
+import numpy as np
+from typing import Any, Callable, Dict, List
+
+from backtest import BacktestEngine, PerformanceMetrics, BacktestVisualizer, TradeExecutor, BatchReport
+
+from .data import make_prices, make_signals, make_results
+
+# Problem sizes by profile; larger profiles include the smaller sizes
+BAR_SIZES = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+TRADE_SIZES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+PROFILES = {
+    'quick': (['10k'], ['1k']),
+    'standard': (['10k', '1M'], ['1k', '100k']),
+    'full': (['10k', '1M', '10M'], ['1k', '100k', '1M'])
+}
+
+# Per-bar Python loops are only timed on the smallest size
+LOOP_BAR_SIZES = ('10k',)
+
+# Batches hold a bars x strategies equity matrix, so they stop below 10M bars
+BATCH_BAR_SIZES = ('10k', '1M')
+BATCH_STRATEGIES = 20
+
+# Report batches render one dashboard per strategy, so they only run on the smallest trade size
+REPORT_TRADE_SIZES = ('1k',)
+REPORT_STRATEGIES = 8
+
+
+class Benchmark:
+    """
+    One timed operation: `setup` builds the inputs once, `run` is measured.
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Any], run: Callable[[Any], Any]):
+        self.name = name
+        self.setup = setup
+        self.run = run
+
+
+def _engine_benchmark(size: str, mode: str) -> Benchmark:
+    n = BAR_SIZES[size]
+
+    def setup():
+        data = make_prices(n)
+        signals = pd.DataFrame({'signal': make_signals(n, n // 100)})
+        return BacktestEngine(data, commission=0.001), signals
+
+    def run(state):
+        engine, signals = state
+        engine.run(lambda data: signals, mode=mode)
+
+    return Benchmark(f"engine.run[{mode}-{size}]", setup, run)
+
+
+def _batch_benchmark(size: str) -> Benchmark:
+    n = BAR_SIZES[size]
+
+    def setup():
+        data = make_prices(n)
+        signals = np.column_stack([make_signals(n, n // 100, seed) for seed in range(BATCH_STRATEGIES)])
+        return BacktestEngine(data, commission=0.001), signals
+
+    def run(state):
+        engine, signals = state
+        engine.run_batch(signals)
+
+    return Benchmark(f"engine.run_batch[{BATCH_STRATEGIES}x{size}]", setup, run)
+
+
+def _executor_benchmark(size: str, mode: str) -> Benchmark:
+    n = BAR_SIZES[size]
+
+    def setup():
+        data = make_prices(n)
+        executor = TradeExecutor(position_sizing='percent_risk', trailing_stop=True)
+        data['atr'] = executor._calculate_atr(data)
+        return executor, data, pd.Series(make_signals(n, n // 100))
+
+    def run(state):
+        executor, data, signals = state
+        executor.apply_execution_logic(data, signals, commission=0.001, mode=mode)
+
+    return Benchmark(f"executor.apply_execution_logic[{mode}-{size}]", setup, run)
+
+
+def _metrics_benchmark(size: str) -> Benchmark:
+    def setup():
+        return make_results(TRADE_SIZES[size])
+
+    def run(results):
+        PerformanceMetrics(results)
+
+    return Benchmark(f"metrics.PerformanceMetrics[{size}]", setup, run)
+
+
+def _report_benchmark(size: str) -> Benchmark:
+    def setup():
+        # Semicolon separated, decimal commas and day-first dates, as Brazilian platforms export
+        frame = make_results(TRADE_SIZES[size])['trades'].to_frame()
+        path = os.path.join(tempfile.gettempdir(), f"backtest-benchmark-report-{size}.csv")
+        pd.DataFrame({
+            'Abertura': pd.to_datetime(frame['entry_date']).dt.strftime('%d/%m/%Y %H:%M:%S'),
+            'Fechamento': pd.to_datetime(frame['exit_date']).dt.strftime('%d/%m/%Y %H:%M:%S'),
+            'Preço Entrada': frame['entry_price'],
+            'Preço Saída': frame['exit_price'],
+            'Qtd': frame['position_size'],
+            'Lado': np.where(frame['direction'] == 'long', 'C', 'V'),
+            'Res. Operação': frame['pnl']
+        }).to_csv(path, sep=';', decimal=',', float_format='%.2f', index=False)
+        return path
+
+    def run(path):
+        PerformanceMetrics.from_trades_csv(path, sep=';', decimal=',', dayfirst=True)
+
+    return Benchmark(f"metrics.from_trades_csv[{size}]", setup, run)
+
+
+def _dashboard_benchmark(size: str) -> Benchmark:
+    def setup():
+        results = make_results(TRADE_SIZES[size])
+        return results, PerformanceMetrics(results).get_metrics()
+
+    def run(state):
+        import matplotlib.pyplot as plt
+        results, metrics = state
+        fig = BacktestVisualizer(results, metrics).create_dashboard()
+        fig.canvas.draw()
+        plt.close(fig)
+
+    return Benchmark(f"visualization.create_dashboard[{size}]", setup, run)
+
+
+def _batch_report_benchmark(size: str) -> Benchmark:
+    def setup():
+        results = {f"strategy_{seed}": make_results(TRADE_SIZES[size], seed) for seed in range(REPORT_STRATEGIES)}
+        return BatchReport(tempfile.mkdtemp(prefix='backtest-benchmark-reports-'), max_workers=1), results
+
+    def run(state):
+        batch, results = state
+        batch.run(results)
+
+    return Benchmark(f"report.BatchReport[{REPORT_STRATEGIES}x{size}]", setup, run)
+
+
+def benchmarks(profile: str = 'quick') -> List[Benchmark]:
+    """
+    Benchmarks of a size profile.
+
+    Args:
+        profile: 'quick', 'standard' or 'full'
+
+    Returns:
+        List of benchmarks in a stable order
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Profile must be one of {tuple(PROFILES)}")
+    bar_sizes, trade_sizes = PROFILES[profile]
+
+    suite = []
+    for size in bar_sizes:
+        if size in LOOP_BAR_SIZES:
+            suite.append(_engine_benchmark(size, 'loop'))
+        suite.append(_engine_benchmark(size, 'vectorized'))
+        if size in BATCH_BAR_SIZES:
+            suite.append(_batch_benchmark(size))
+    for size in bar_sizes:
+        if size in LOOP_BAR_SIZES:
+            suite.append(_executor_benchmark(size, 'loop'))
+        suite.append(_executor_benchmark(size, 'compiled'))
+    for size in trade_sizes:
+        suite.append(_metrics_benchmark(size))
+        suite.append(_report_benchmark(size))
+    for size in trade_sizes:
+        suite.append(_dashboard_benchmark(size))
+        if size in REPORT_TRADE_SIZES:
+            suite.append(_batch_report_benchmark(size))
+    return suite
@@ -0,0 +1,28 @@
+"""
+Benchmark runner baseline handling.
+"""
+
+from benchmarks.__main__ import compare, main
+
+RESULT = {'time': 1.0, 'peak_memory': 2**20}
+
+
+def test_missing_baseline_file_fails(tmp_path, capsys):
+    assert main(['--baseline', str(tmp_path / 'baseline.json')]) == 2
+    assert '--save-baseline' in capsys.readouterr().err
+
+
+def test_benchmarks_missing_from_the_baseline_are_reported():
+    regressions = compare({'engine': RESULT, 'metrics': RESULT}, {'engine': RESULT}, 0.25, 0.25)
+
+    assert len(regressions) == 1 and regressions[0].startswith('metrics: not in the baseline')
+
+
+def test_slowdown_and_memory_growth_over_threshold_are_reported():
+    baseline = {'engine': RESULT}
+    slower = {'engine': {'time': 1.3, 'peak_memory': 2**20}}
+    larger = {'engine': {'time': 1.0, 'peak_memory': 2 * 2**20}}
+
+    assert compare({'engine': RESULT}, baseline, 0.25, 0.25) == []
+    assert 'time' in compare(slower, baseline, 0.25, 0.25)[0]
+    assert 'peak memory' in compare(larger, baseline, 0.25, 0.25)[0]
@@ -0,0 +1,83 @@
+"""
+ResultCache hits and invalidation through BacktestEngine.run.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestEngine, ResultCache
+
+from test_engine_modes import make_data
+
+# Read by the strategies below; the tests change it to invalidate cached runs
+PERIOD = 10
+
+
+def smoothed(close: pd.Series, period: int) -> pd.Series:
+    return close.rolling(period).mean()
+
+
+def global_strategy(data: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({'signal': np.sign(data['close'] - smoothed(data['close'], PERIOD)).fillna(0)})
+
+
+def closure_strategy(period: int):
+    def strategy(data: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({'signal': np.sign(data['close'] - data['close'].rolling(period).mean()).fillna(0)})
+    return strategy
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path))
+
+
+def run(cache: ResultCache, strategy, **settings) -> dict:
+    return BacktestEngine(make_data(), result_cache=cache, **settings).run(strategy)
+
+
+def test_unchanged_run_hits(cache):
+    first = run(cache, global_strategy)
+    repeated = run(cache, global_strategy)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(first['trades']) > 0
+    np.testing.assert_array_equal(repeated['equity_curve'], first['equity_curve'])
+    assert list(repeated['trades']) == list(first['trades'])
+    assert repeated['metrics'] == first['metrics']
+
+
+def test_changed_global_invalidates(cache, monkeypatch):
+    run(cache, global_strategy)
+    monkeypatch.setattr(sys.modules[__name__], 'PERIOD', 20)
+    run(cache, global_strategy)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_changed_helper_function_invalidates(cache, monkeypatch):
+    run(cache, global_strategy)
+    monkeypatch.setattr(sys.modules[__name__], 'smoothed', lambda close, period: close.ewm(span=period).mean())
+    run(cache, global_strategy)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_changed_closure_invalidates(cache):
+    run(cache, closure_strategy(10))
+    run(cache, closure_strategy(20))
+    run(cache, closure_strategy(10))
+
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.parametrize('settings', [{'commission': 0.001}, {'slippage': 0.001}, {'initial_capital': 20000.0}])
+def test_changed_engine_setting_invalidates(cache, settings):
+    run(cache, global_strategy)
+    changed = run(cache, global_strategy, **settings)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert changed['final_capital'] != run(cache, global_strategy)['final_capital']
@@ -0,0 +1,112 @@
+"""
+Parity of the loop and array simulation modes of BacktestEngine and TradeExecutor.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestEngine, TradeExecutor
+
+N_BARS = 300
+
+
+def make_data(n: int = N_BARS, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.005, n)) * close
+    return pd.DataFrame({
+        'date': pd.date_range('2021-01-04', periods=n, freq='h'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close
+    })
+
+
+def random_signal(n: int = N_BARS, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.choice([-1.0, 0.0, 0.0, 0.0, 1.0], size=n)
+
+
+SIGNALS = {
+    'no_trades': np.zeros(N_BARS),
+    'open_at_end': np.concatenate([[1.0], np.zeros(N_BARS - 1)]),
+    'buy_on_last_bar': np.concatenate([np.zeros(N_BARS - 1), [1.0]]),
+    'random': random_signal()
+}
+
+
+def assert_same_results(loop: dict, fast: dict) -> None:
+    loop_trades = pd.DataFrame(list(loop['trades']))
+    fast_trades = pd.DataFrame(list(fast['trades']))
+    assert len(loop_trades) == len(fast_trades)
+    pd.testing.assert_frame_equal(loop_trades, fast_trades, check_exact=False, rtol=1e-9)
+    np.testing.assert_allclose(loop['equity_curve'], fast['equity_curve'], rtol=1e-9)
+    np.testing.assert_allclose(loop['positions'], fast['positions'], rtol=1e-9)
+    assert loop['final_capital'] == pytest.approx(fast['final_capital'], rel=1e-9)
+    assert loop['return_pct'] == pytest.approx(fast['return_pct'], rel=1e-9, abs=1e-12)
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+@pytest.mark.parametrize('commission, slippage', [(0.0, 0.0), (0.001, 0.0005)])
+def test_engine_vectorized_matches_loop(name, commission, slippage):
+    data = make_data()
+    signals = pd.DataFrame({'signal': SIGNALS[name]})
+
+    loop = BacktestEngine(data, commission=commission, slippage=slippage).run(lambda d: signals, mode='loop')
+    fast = BacktestEngine(data, commission=commission, slippage=slippage).run(lambda d: signals, mode='vectorized')
+
+    assert_same_results(loop, fast)
+
+
+def test_engine_no_trades_keeps_capital():
+    data = make_data()
+    signals = pd.DataFrame({'signal': SIGNALS['no_trades']})
+
+    results = BacktestEngine(data).run(lambda d: signals, mode='vectorized')
+
+    assert len(results['trades']) == 0
+    assert np.all(np.asarray(results['equity_curve']) == 10000.0)
+    assert results['final_capital'] == 10000.0
+
+
+def test_engine_open_trade_closed_at_end_of_data():
+    data = make_data()
+    signals = pd.DataFrame({'signal': SIGNALS['open_at_end']})
+
+    results = BacktestEngine(data, commission=0.001).run(lambda d: signals, mode='vectorized')
+
+    assert len(results['trades']) == 1
+    assert results['trades'][0]['exit_date'] == data['date'].iloc[-1]
+    assert results['equity_curve'][-1] == pytest.approx(results['final_capital'])
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+@pytest.mark.parametrize('executor_kwargs', [
+    {'position_sizing': 'fixed'},
+    {'position_sizing': 'percent_risk', 'stop_loss_atr_multiple': 0.5, 'take_profit_atr_multiple': 0.75},
+    {'position_sizing': 'percent_risk', 'trailing_stop': True, 'trailing_stop_activation': 0.5, 'trailing_stop_distance': 0.5}
+])
+def test_executor_compiled_matches_loop(name, executor_kwargs):
+    data = make_data()
+    signals = pd.Series(SIGNALS[name])
+
+    loop = TradeExecutor(**executor_kwargs).apply_execution_logic(
+        data.copy(), signals, commission=0.001, slippage=0.0005, mode='loop')
+    fast = TradeExecutor(**executor_kwargs).apply_execution_logic(
+        data.copy(), signals, commission=0.001, slippage=0.0005, mode='compiled')
+
+    assert_same_results(loop, fast)
+
+
+def test_executor_tight_stops_and_targets_fire():
+    data = make_data()
+    signals = pd.Series(SIGNALS['random'])
+    executor = TradeExecutor(position_sizing='percent_risk', stop_loss_atr_multiple=0.5, take_profit_atr_multiple=0.75)
+
+    results = executor.apply_execution_logic(data, signals, mode='compiled')
+
+    reasons = {trade['exit_reason'] for trade in results['trades']}
+    assert {'stop_loss', 'take_profit'} <= reasons
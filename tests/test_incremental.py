@@ -0,0 +1,74 @@
+"""
+Equivalence of the incremental indicators and their array versions in backtest.indicators.
+"""
+
+import numpy as np
+import pytest
+
+from backtest import indicators
+from backtest.incremental import RunningSMA, RunningEMA, RunningATR, WilderATR, RollingMax, RollingMin
+
+N_BARS = 400
+PERIODS = range(1, 51)
+
+
+def make_bars(n: int = N_BARS, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.005, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    return high, low, close
+
+
+HIGH, LOW, CLOSE = make_bars()
+
+
+def stream(indicator, *columns) -> np.ndarray:
+    return np.array([indicator.update(*bar) for bar in zip(*columns)])
+
+
+@pytest.mark.parametrize('period', PERIODS)
+@pytest.mark.parametrize('incremental, batch', [
+    (RunningSMA, indicators.sma),
+    (RunningEMA, indicators.ema),
+    (RollingMax, indicators.rolling_max),
+    (RollingMin, indicators.rolling_min)
+])
+def test_single_input_indicators_match_batch(incremental, batch, period):
+    values = stream(incremental(period), CLOSE)
+
+    np.testing.assert_allclose(values, batch(CLOSE, period), rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_wilder_atr_matches_batch(period):
+    values = stream(WilderATR(period), HIGH, LOW, CLOSE)
+
+    np.testing.assert_allclose(values, indicators.wilder_atr(HIGH, LOW, CLOSE, period), rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_running_atr_matches_batch_after_warm_up(period):
+    values = stream(RunningATR(period), HIGH, LOW, CLOSE)
+    expected = indicators.atr(HIGH, LOW, CLOSE, period)
+
+    np.testing.assert_allclose(values[period - 1:], expected[period - 1:], rtol=1e-10)
+    assert not np.isnan(values).any()
+
+
+@pytest.mark.parametrize('incremental', [RunningSMA, RollingMax, RollingMin])
+def test_ready_after_period_values(incremental):
+    indicator = incremental(5)
+    for x in CLOSE[:4]:
+        indicator.update(x)
+    assert not indicator.ready and np.isnan(indicator.value)
+
+    indicator.update(CLOSE[4])
+    assert indicator.ready and float(indicator) == indicator.value
+
+
+def test_period_must_be_positive():
+    with pytest.raises(ValueError):
+        RunningSMA(0)
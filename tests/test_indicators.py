@@ -0,0 +1,104 @@
+"""
+IndicatorCache hits, eviction and the on-disk tier.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import indicators
+from backtest.indicators import IndicatorCache
+
+N_BARS = 1000
+ENTRY_BYTES = N_BARS * 8
+
+
+@pytest.fixture
+def close():
+    return 100.0 + np.cumsum(np.random.default_rng(0).normal(0.0, 1.0, N_BARS))
+
+
+def npy_files(directory) -> list:
+    return sorted(name for name in os.listdir(directory) if name.endswith('.npy'))
+
+
+def test_repeated_calls_hit_the_memory_tier(close):
+    cache = IndicatorCache()
+
+    first = cache.sma(close, 20)
+    second = cache.sma(close.copy(), 20)
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not first.flags.writeable
+    np.testing.assert_array_equal(first, indicators.sma(close, 20))
+
+
+def test_parameters_and_data_are_part_of_the_key(close):
+    cache = IndicatorCache()
+
+    cache.sma(close, 20)
+    cache.sma(close, 21)
+    cache.ema(close, 20)
+    cache.sma(close + 1.0, 20)
+
+    assert (cache.hits, cache.misses) == (0, 4)
+
+
+def test_memory_tier_evicts_least_recently_used(close):
+    cache = IndicatorCache(max_bytes=2 * ENTRY_BYTES)
+
+    cache.sma(close, 10)
+    cache.sma(close, 20)
+    cache.sma(close, 10)  # most recently used
+    cache.sma(close, 30)  # evicts period 20
+
+    assert len(cache) == 2 and cache.nbytes == 2 * ENTRY_BYTES
+    cache.sma(close, 10)
+    assert cache.misses == 3
+    cache.sma(close, 20)
+    assert cache.misses == 4
+
+
+def test_disk_tier_round_trips_between_caches(close, tmp_path):
+    data = pd.DataFrame({'high': close + 1, 'low': close - 1, 'close': close})
+    IndicatorCache(directory=str(tmp_path)).atr(data, 14)
+
+    cache = IndicatorCache(directory=str(tmp_path))
+    values = cache.atr(data, 14)
+
+    assert (cache.hits, cache.misses) == (1, 0)
+    np.testing.assert_array_equal(values, indicators.atr(close + 1, close - 1, close, 14))
+    assert len(npy_files(tmp_path)) == 1
+
+
+def test_disk_tier_evicts_least_recently_used_files(close, tmp_path):
+    writer = IndicatorCache(directory=str(tmp_path))
+    for period in (10, 20, 30):
+        writer.sma(close, period)
+    file_size = os.path.getsize(tmp_path / npy_files(tmp_path)[0])
+    keys = {period: writer._key('sma', (close,), {'period': period}) for period in (10, 20, 30, 40)}
+    for age, period in enumerate((10, 20, 30)):
+        os.utime(tmp_path / f"{keys[period]}.npy", (1000 + age, 1000 + age))
+
+    cache = IndicatorCache(directory=str(tmp_path), max_disk_bytes=3 * file_size)
+    assert cache.disk_nbytes == 3 * file_size
+    cache.sma(close, 10)  # loaded from disk, now the most recently used file
+    cache.sma(close, 40)  # over budget: deletes the file of period 20
+
+    assert npy_files(tmp_path) == sorted(f"{keys[period]}.npy" for period in (10, 30, 40))
+    assert cache.disk_nbytes == 3 * file_size
+
+
+def test_clear_keeps_files_unless_asked(close, tmp_path):
+    cache = IndicatorCache(directory=str(tmp_path))
+    cache.sma(close, 10)
+    cache.sma(close, 20)
+
+    cache.clear()
+    assert len(cache) == 0 and len(npy_files(tmp_path)) == 2
+
+    cache.clear(disk=True)
+    assert npy_files(tmp_path) == [] and cache.disk_nbytes == 0
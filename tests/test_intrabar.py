@@ -0,0 +1,49 @@
+"""
+Resolving ambiguous bars from tick prices.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import TradeExecutor
+from backtest.intrabar import TickIndex
+
+from test_engine_modes import make_data, random_signal
+
+EXECUTOR = {'position_sizing': 'percent_risk', 'stop_loss_atr_multiple': 0.25, 'take_profit_atr_multiple': 0.25}
+
+
+def make_ticks(data: pd.DataFrame, per_bar: int = 4, seed: int = 1) -> TickIndex:
+    """Ticks inside each bar's range, in a random order"""
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(per_bar) * np.timedelta64(60 // per_bar, 'm')
+    dates = (data['date'].to_numpy()[:, None] + offsets[None, :]).ravel()
+    prices = rng.uniform(data['low'].to_numpy()[:, None], data['high'].to_numpy()[:, None],
+                         (len(data), per_bar)).ravel()
+    return TickIndex(dates, prices)
+
+
+@pytest.mark.parametrize('mode', ['loop', 'compiled'])
+def test_ticks_need_bar_dates(mode):
+    data = make_data().drop(columns='date')
+
+    with pytest.raises(ValueError, match='bar dates'):
+        TradeExecutor(**EXECUTOR).apply_execution_logic(
+            data, random_signal(), mode=mode, ticks=make_ticks(make_data()))
+
+
+@pytest.mark.parametrize('mode', ['loop', 'compiled'])
+def test_datetime_index_resolves_like_date_column(mode):
+    data = make_data()
+    ticks = make_ticks(data)
+    indexed = data.set_index('date')
+
+    by_column = TradeExecutor(**EXECUTOR).apply_execution_logic(data, random_signal(), mode=mode, ticks=ticks)
+    by_index = TradeExecutor(**EXECUTOR).apply_execution_logic(indexed, random_signal(), mode=mode, ticks=ticks)
+    stop_first = TradeExecutor(**EXECUTOR).apply_execution_logic(data, random_signal(), mode=mode)
+
+    assert [t['exit_reason'] for t in by_index['trades']] == [t['exit_reason'] for t in by_column['trades']]
+    np.testing.assert_allclose(by_index['equity_curve'], by_column['equity_curve'])
+    # The ticks change the outcome of at least one bar that reaches both levels
+    assert [t['exit_reason'] for t in by_column['trades']] != [t['exit_reason'] for t in stop_first['trades']]
@@ -0,0 +1,193 @@
+"""
+TradeLedger storage, its list-of-dicts compatibility and trade report parsing.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import PerformanceMetrics
+from backtest.ledger import TradeLedger
+
+from test_metrics import assert_same_metrics
+
+
+def make_trades(n: int = 6) -> list:
+    dates = pd.date_range('2021-01-04', periods=2 * n, freq='D')
+    return [{
+        'entry_date': dates[2 * i],
+        'entry_price': 100.0 + i,
+        'position_size': 10.0,
+        'direction': 'long' if i % 2 == 0 else 'short',
+        'exit_date': dates[2 * i + 1],
+        'exit_price': 101.0 + 2 * i,
+        'pnl': 10.0 * (1 + i) * (-1) ** i,
+        'pnl_pct': 1.0 + i,
+        'exit_reason': ['signal', 'stop_loss', 'take_profit'][i % 3],
+        'commission': 0.5,
+        'slippage': 0.25
+    } for i in range(n)]
+
+
+def make_ledger(n: int = 6) -> TradeLedger:
+    ledger = TradeLedger('datetime64[ns]', capacity=1)
+    for trade in make_trades(n):
+        ledger.append(**trade)
+    return ledger
+
+
+def test_append_grows_and_round_trips_trade_dicts():
+    trades = make_trades()
+    ledger = make_ledger()
+
+    assert len(ledger) == len(trades)
+    assert list(ledger) == trades
+    assert ledger[-1] == trades[-1]
+    assert isinstance(ledger[0]['entry_date'], pd.Timestamp)
+
+
+def test_index_out_of_range_raises():
+    ledger = make_ledger(3)
+
+    with pytest.raises(IndexError):
+        ledger[3]
+    with pytest.raises(IndexError):
+        ledger[-4]
+
+
+@pytest.mark.parametrize('key', [slice(None, 3), slice(-3, None), slice(None, None, 2), slice(None, None, -1), slice(4, 2)])
+def test_slices_return_ledgers_like_list_slices(key):
+    trades = make_trades()
+    ledger = make_ledger()
+
+    sliced = ledger[key]
+
+    assert isinstance(sliced, TradeLedger)
+    assert list(sliced) == trades[key]
+
+
+def test_columns_are_typed_arrays():
+    ledger = make_ledger()
+
+    assert ledger.pnl.dtype == np.float64
+    assert ledger.entry_date.dtype == np.dtype('datetime64[ns]')
+    np.testing.assert_array_equal(ledger.direction, [1, -1, 1, -1, 1, -1])
+    np.testing.assert_array_equal(ledger.column('pnl'), [t['pnl'] for t in make_trades()])
+    with pytest.raises(AttributeError):
+        ledger.volume
+
+
+def test_from_records_skips_open_trades():
+    trades = make_trades(3) + [{'entry_date': pd.Timestamp('2021-02-01'), 'exit_date': None, 'pnl': 0.0}]
+
+    ledger = TradeLedger.from_records(trades)
+
+    assert list(ledger) == trades[:3]
+
+
+def test_extend_take_and_concat():
+    ledger = make_ledger()
+    order = np.argsort(ledger.pnl)
+
+    taken = ledger.take(order)
+    joined = TradeLedger.concat([ledger[:2], ledger[2:]])
+    extended = TradeLedger(capacity=1)
+    extended.extend(**{name: ledger.column(name) for name in ('entry_date', 'exit_date', 'entry_price', 'exit_price',
+                                                              'position_size', 'direction', 'pnl', 'pnl_pct',
+                                                              'commission', 'slippage', 'exit_reason')})
+
+    np.testing.assert_array_equal(taken.pnl, np.sort(ledger.pnl))
+    assert list(joined) == list(ledger)
+    assert list(extended) == list(ledger)
+
+
+def test_to_frame_labels_direction_and_exit_reason():
+    frame = make_ledger().to_frame()
+
+    assert list(frame['direction']) == [t['direction'] for t in make_trades()]
+    assert list(frame['exit_reason']) == [t['exit_reason'] for t in make_trades()]
+    assert len(TradeLedger().to_frame()) == 0
+
+
+REPORT_FIELDS = ['entry_date', 'exit_date', 'entry_price', 'exit_price', 'position_size', 'direction', 'pnl']
+
+
+def write_report(path, trades: list, date_format: str = '%Y-%m-%d %H:%M:%S', sep: str = ',',
+                 decimal: str = '.', dates=None) -> str:
+    """Trade report CSV with the given date and number formats (dates overrides the formatted dates)"""
+    frame = pd.DataFrame(trades)[REPORT_FIELDS]
+    for field in ('entry_date', 'exit_date'):
+        frame[field] = dates if dates is not None else frame[field].dt.strftime(date_format)
+    frame.to_csv(path, index=False, sep=sep, decimal=decimal)
+    return str(path)
+
+
+def report_frame(ledger: TradeLedger) -> pd.DataFrame:
+    return ledger.to_frame()[REPORT_FIELDS]
+
+
+def expected_frame(trades: list) -> pd.DataFrame:
+    ledger = TradeLedger('datetime64[ns]')
+    for trade in trades:
+        ledger.append(**trade)
+    return report_frame(ledger)
+
+
+def hourly_trades(n: int = 10) -> list:
+    trades = make_trades(n)
+    for i, trade in enumerate(trades):
+        trade['entry_date'] += pd.Timedelta(hours=9, minutes=5 * i, seconds=i)
+        trade['exit_date'] += pd.Timedelta(hours=17, minutes=30)
+    return trades
+
+
+def test_read_csv_with_decimal_comma(tmp_path):
+    trades = hourly_trades()
+    path = write_report(tmp_path / 'report.csv', trades, '%d/%m/%Y %H:%M:%S', sep=';', decimal=',')
+
+    ledger = TradeLedger.read_csv(path, dayfirst=True, sep=';', decimal=',')
+
+    pd.testing.assert_frame_equal(report_frame(ledger), expected_frame(trades))
+
+
+@pytest.mark.parametrize('date_format', ['%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M', '%Y%m%d'])
+def test_read_csv_guessed_format_matches_explicit_format(tmp_path, date_format):
+    trades = hourly_trades()
+    path = write_report(tmp_path / 'report.csv', trades, date_format)
+
+    guessed = TradeLedger.read_csv(path, dayfirst=date_format.startswith('%d'))
+    explicit = TradeLedger.read_csv(path, date_format=date_format)
+
+    pd.testing.assert_frame_equal(report_frame(guessed), report_frame(explicit))
+    # Formats without seconds lose them; the dates still parse to the same minute
+    expected = pd.DatetimeIndex([t['entry_date'] for t in trades]).strftime(date_format)
+    assert list(pd.DatetimeIndex(guessed.entry_date).strftime(date_format)) == list(expected)
+
+
+@pytest.mark.parametrize('chunksize', [1, 3, 1000])
+@pytest.mark.parametrize('date_format', [None, '%d/%m/%Y %H:%M'])
+def test_read_csv_mixed_width_dates_across_chunks(tmp_path, chunksize, date_format):
+    # Unpadded days make later dates longer than the first one, which sets the
+    # guessed layout; with small chunks they only appear after a chunk was parsed
+    trades = hourly_trades(8)
+    dates = [f"{d.day}/{d.month:02d}/{d.year} {d.hour}:{d.minute:02d}" for d in
+             pd.DatetimeIndex([t['entry_date'] for t in trades])]
+    for trade in trades:
+        trade['entry_date'] = trade['entry_date'].floor('min')
+        trade['exit_date'] = trade['entry_date']
+    assert len(dates[0]) < max(len(d) for d in dates[chunksize:] or dates)
+    path = write_report(tmp_path / 'report.csv', trades, dates=dates)
+
+    ledger = TradeLedger.read_csv(path, date_format=date_format, dayfirst=True, chunksize=chunksize)
+
+    pd.testing.assert_frame_equal(report_frame(ledger), expected_frame(trades))
+
+
+def test_from_trades_csv_matches_metrics_of_the_ledger(tmp_path):
+    trades = hourly_trades()
+    path = write_report(tmp_path / 'report.csv', trades, '%d/%m/%Y %H:%M:%S', sep=';', decimal=',')
+
+    metrics = PerformanceMetrics.from_trades_csv(path, chunksize=4, dayfirst=True, sep=';', decimal=',')
+    expected = PerformanceMetrics.from_trades(TradeLedger.from_records(trades))
+
+    assert_same_metrics(expected.get_metrics(), metrics.get_metrics())
@@ -0,0 +1,57 @@
+"""
+LiveRunner replays against the compiled backtest.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import LiveRunner, ReplayFeed, TradeExecutor
+from backtest.incremental import RunningATR
+
+from test_engine_modes import make_data, SIGNALS
+from test_streaming import EXECUTORS
+
+
+def replay(data: pd.DataFrame, executor_kwargs: dict) -> dict:
+    runner = LiveRunner(TradeExecutor(**executor_kwargs), commission=0.001, slippage=0.0005)
+    return asyncio.run(runner.run(ReplayFeed(data)))
+
+
+def assert_same_trades(full: dict, live: dict) -> None:
+    # The runner's ledger stores dates in nanoseconds whatever the resolution of the data
+    pd.testing.assert_frame_equal(full['trades'].to_frame(), live['trades'].to_frame(),
+                                  check_dtype=False, check_exact=False, rtol=1e-9)
+    assert live['final_capital'] == pytest.approx(full['final_capital'], rel=1e-9)
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+@pytest.mark.parametrize('executor_kwargs', EXECUTORS)
+def test_replay_with_atr_column_matches_backtest(executor_kwargs, name):
+    data = make_data()
+    data['atr'] = TradeExecutor()._calculate_atr(data)
+    data['signal'] = SIGNALS[name]
+
+    # The executor labels trades by the index, the runner by the bar dates
+    full = TradeExecutor(**executor_kwargs).apply_execution_logic(
+        data.set_index('date'), data['signal'].to_numpy(), commission=0.001, slippage=0.0005, mode='compiled')
+    live = replay(data, executor_kwargs)
+
+    assert_same_trades(full, live)
+    assert live['metrics']['totalTrades'] == len(full['trades'])
+
+
+@pytest.mark.parametrize('executor_kwargs', EXECUTORS)
+def test_replay_without_atr_column_uses_running_warm_up(executor_kwargs):
+    data = make_data()
+    data['signal'] = SIGNALS['random']
+
+    running = RunningATR(14)
+    with_atr = data.assign(atr=[running.update(h, l, c) for h, l, c in zip(data['high'], data['low'], data['close'])])
+    full = TradeExecutor(**executor_kwargs).apply_execution_logic(
+        with_atr.set_index('date'), data['signal'].to_numpy(), commission=0.001, slippage=0.0005, mode='compiled')
+
+    assert_same_trades(full, replay(data, executor_kwargs))
+    np.testing.assert_allclose(with_atr['atr'].iloc[13:], TradeExecutor()._calculate_atr(data).iloc[13:])
@@ -0,0 +1,68 @@
+"""
+RunningMetrics against PerformanceMetrics on the same trades and equity.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestEngine, LiveRunner, PerformanceMetrics, ReplayFeed, RunningMetrics, TradeExecutor
+
+from test_engine_modes import make_data, SIGNALS
+
+
+def assert_same_metrics(expected: dict, actual: dict) -> None:
+    assert set(actual) == set(expected)
+    for name, value in expected.items():
+        if isinstance(value, (dict, str)):
+            assert actual[name] == value, name
+        else:
+            assert actual[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def stream(results: dict) -> RunningMetrics:
+    equity = np.asarray(results['equity_curve'], dtype=np.float64)
+    running = RunningMetrics(equity[0])
+    for value in equity[1:]:
+        running.add_equity(value)
+    for trade in results['trades']:
+        running.add_trade(trade['pnl'], trade['entry_date'], trade['exit_date'])
+    return running
+
+
+def backtest(name: str) -> dict:
+    signals = pd.DataFrame({'signal': SIGNALS[name]})
+    return BacktestEngine(make_data(), commission=0.001).run(lambda d: signals)
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+def test_streamed_trades_and_equity_match_batch_metrics(name):
+    results = backtest(name)
+
+    assert_same_metrics(PerformanceMetrics(results).get_metrics(), stream(results).snapshot())
+
+
+def test_revised_equity_replaces_the_provisional_point():
+    results = backtest('open_at_end')
+    equity = results['equity_curve']
+    provisional = {**results, 'equity_curve': np.append(equity[:-1], equity[-1] * 0.5)}
+
+    running = stream(provisional)
+    running.revise_equity(equity[-1])
+
+    assert_same_metrics(PerformanceMetrics(results).get_metrics(), running.snapshot())
+    assert running.snapshot() != stream(provisional).snapshot()
+
+
+@pytest.mark.parametrize('name', ['open_at_end', 'random'])
+def test_live_runner_metrics_match_the_backtest(name):
+    data = make_data()
+    data['atr'] = TradeExecutor()._calculate_atr(data)
+    data['signal'] = SIGNALS[name]
+
+    full = TradeExecutor().apply_execution_logic(data.set_index('date'), data['signal'].to_numpy(), mode='compiled')
+    live = asyncio.run(LiveRunner(TradeExecutor()).run(ReplayFeed(data)))
+
+    assert_same_metrics(PerformanceMetrics(full).get_metrics(), live['metrics'])
@@ -0,0 +1,61 @@
+"""
+Reproducibility of MonteCarlo paths across runs and worker counts.
+"""
+
+import numpy as np
+import pytest
+
+from backtest.ledger import TradeLedger
+from backtest.montecarlo import STATISTICS, MonteCarlo
+
+from test_ledger import make_trades
+
+
+def make_results(n: int = 40, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    trades = make_trades(n)
+    for trade, pnl in zip(trades, rng.normal(5.0, 100.0, n)):
+        trade['pnl'] = float(pnl)
+    return {'trades': TradeLedger.from_records(trades), 'equity_curve': [10000.0]}
+
+
+def simulate(method: str = 'bootstrap', **kwargs) -> dict:
+    options = {'simulations': 500, 'seed': 42, 'block_size': 64, **kwargs}
+    return MonteCarlo(make_results(), method=method, **options).run()
+
+
+def assert_same_paths(first: dict, second: dict) -> None:
+    for name in STATISTICS:
+        np.testing.assert_array_equal(first[name], second[name])
+
+
+@pytest.mark.parametrize('method', ['shuffle', 'bootstrap'])
+def test_same_seed_gives_identical_paths(method):
+    assert_same_paths(simulate(method), simulate(method))
+
+
+def test_different_seeds_give_different_paths():
+    assert not np.array_equal(simulate(seed=1)['finalEquity'], simulate(seed=2)['finalEquity'])
+
+
+@pytest.mark.parametrize('method', ['shuffle', 'bootstrap'])
+def test_paths_do_not_depend_on_worker_count(method):
+    single = simulate(method, max_workers=1)
+    pooled = simulate(method, max_workers=2)
+
+    assert len(single['finalEquity']) == 500
+    assert_same_paths(single, pooled)
+
+
+def test_spawned_blocks_are_independent_streams():
+    # Equal-sized blocks would repeat each other if they shared a stream
+    paths = simulate(simulations=256, block_size=64)['finalEquity'].reshape(4, 64)
+
+    assert len({block.tobytes() for block in paths}) == 4
+
+
+def test_shuffle_keeps_final_equity():
+    results = make_results()
+    final = simulate('shuffle')['finalEquity']
+
+    np.testing.assert_allclose(final, 10000.0 + results['trades'].pnl.sum())
@@ -0,0 +1,41 @@
+"""
+PortfolioEngine against BacktestEngine on a single symbol.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestEngine, PortfolioEngine
+
+from test_engine_modes import make_data, SIGNALS
+
+# BacktestEngine's ledger keeps the entry costs in its commission/slippage
+# columns (the exit costs are only in pnl), so those columns are not compared
+TRADE_FIELDS = ['entry_date', 'exit_date', 'entry_price', 'exit_price', 'position_size',
+                'pnl', 'pnl_pct', 'direction', 'exit_reason']
+
+
+@pytest.mark.parametrize('name', list(SIGNALS))
+@pytest.mark.parametrize('commission, slippage', [(0.0, 0.0), (0.001, 0.0005)])
+def test_single_symbol_portfolio_matches_engine(name, commission, slippage):
+    data = make_data()
+    signals = pd.DataFrame({'signal': SIGNALS[name]})
+
+    engine = BacktestEngine(data, commission=commission, slippage=slippage).run(lambda d: signals)
+    portfolio = PortfolioEngine({'TEST': data}, commission=commission, slippage=slippage).run(lambda d: signals)
+
+    pd.testing.assert_frame_equal(engine['trades'].to_frame()[TRADE_FIELDS],
+                                  portfolio['trades'].to_frame()[TRADE_FIELDS],
+                                  check_exact=False, rtol=1e-9)
+    np.testing.assert_allclose(portfolio['equity_curve'], engine['equity_curve'], rtol=1e-9)
+    np.testing.assert_allclose(portfolio['positions'][1:, 0], engine['positions'], rtol=1e-9)
+    assert portfolio['final_capital'] == pytest.approx(engine['final_capital'], rel=1e-9)
+    assert len(portfolio['symbol_trades']['TEST']) == len(engine['trades'])
+
+
+def test_portfolio_engine_is_not_a_backtest_engine():
+    portfolio = PortfolioEngine({'TEST': make_data()})
+
+    assert not isinstance(portfolio, BacktestEngine)
+    assert not hasattr(portfolio, 'run_batch')
@@ -0,0 +1,71 @@
+"""
+BatchReport output files and dashboard figure reuse.
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from backtest import BacktestEngine, BatchReport, PerformanceMetrics
+from backtest.visualization import BacktestVisualizer, dashboard_axes
+
+from test_engine_modes import make_data, SIGNALS
+
+
+def backtest(name: str, n: int = 300) -> dict:
+    signals = pd.DataFrame({'signal': SIGNALS[name][:n]})
+    return BacktestEngine(make_data(n), commission=0.001).run(lambda d: signals)
+
+
+def artists(fig: Figure, axes: list) -> list:
+    """What each axis shows, for comparing figures"""
+    return [fig.get_suptitle()] + [(
+        ax.get_title(), len(ax.lines), len(ax.patches), len(ax.collections), len(ax.texts),
+        ax.get_xlim(), ax.get_ylim(), ax.yaxis_inverted(), [t.get_text() for t in ax.get_xticklabels()]
+    ) for ax in axes]
+
+
+def draw(results: list) -> list:
+    fig = Figure(figsize=(15, 10), dpi=50)
+    FigureCanvasAgg(fig)
+    axes = dashboard_axes(fig)
+    for result in results:
+        metrics = PerformanceMetrics(result).get_metrics()
+        BacktestVisualizer(result, metrics).draw_dashboard(fig, axes, title=f"{metrics['totalTrades']} trades")
+    fig.canvas.draw()
+    return artists(fig, axes)
+
+
+def test_reused_figure_keeps_nothing_from_the_previous_report():
+    first, second = backtest('random'), backtest('open_at_end', n=200)
+
+    reused, fresh = draw([first, second]), draw([second])
+
+    assert reused == fresh
+    assert draw([first]) != fresh
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_colliding_names_get_separate_files(tmp_path, max_workers):
+    # All of these map to the file names 'MA_5_10' or '7'
+    results = {
+        'MA 5/10': backtest('random'),
+        'ma_5_10': backtest('open_at_end'),
+        'ma 5 10': backtest('no_trades'),
+        7: backtest('random'),
+        '7': backtest('buy_on_last_bar')
+    }
+
+    table = BatchReport(str(tmp_path), max_workers=max_workers, chunksize=2).run(results)
+
+    assert len(set(table['png_path'])) == len(set(table['json_path'])) == len(results)
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.png')]) == len(results)
+    for name, path, trades in zip(table['name'], table['json_path'], table['totalTrades']):
+        with open(path) as f:
+            stored = json.load(f)
+        assert stored['name'] == str(name)
+        assert stored['metrics']['totalTrades'] == trades == len(results[name]['trades'])
@@ -0,0 +1,92 @@
+"""
+Parity of the streaming engines with the in-memory ones.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestEngine, StreamingEngine, StreamingExecutor, TradeExecutor
+from backtest.incremental import RunningATR
+from backtest.ledger import TradeLedger
+
+from test_engine_modes import make_data, random_signal
+
+CHUNK_SIZES = [1, 7, 64, 1000]
+
+EXECUTORS = [
+    {'position_sizing': 'fixed'},
+    {'position_sizing': 'percent_risk', 'stop_loss_atr_multiple': 0.5, 'take_profit_atr_multiple': 0.75},
+    {'position_sizing': 'percent_risk', 'trailing_stop': True, 'trailing_stop_activation': 0.5, 'trailing_stop_distance': 0.5}
+]
+
+
+def chunked(data: pd.DataFrame, size: int):
+    return (data.iloc[i:i + size] for i in range(0, len(data), size))
+
+
+def moving_average_strategy(data: pd.DataFrame) -> pd.DataFrame:
+    fast = data['close'].rolling(5).mean()
+    slow = data['close'].rolling(20).mean()
+    return pd.DataFrame({'signal': np.sign(fast - slow).fillna(0)}, index=data.index)
+
+
+def collect(updates) -> dict:
+    updates = list(updates)
+    return {
+        'trades': TradeLedger.concat([update['trades'] for update in updates]).to_frame(),
+        'equity_curve': np.concatenate([update['equity_curve'] for update in updates]),
+        'positions': np.concatenate([update['positions'] for update in updates]),
+        'final_capital': updates[-1]['final_capital']
+    }
+
+
+def assert_same_run(full: dict, streamed: dict) -> None:
+    pd.testing.assert_frame_equal(full['trades'].to_frame(), streamed['trades'], check_exact=False, rtol=1e-9)
+    np.testing.assert_allclose(full['equity_curve'], streamed['equity_curve'], rtol=1e-9)
+    np.testing.assert_allclose(full['positions'], streamed['positions'], rtol=1e-9)
+    assert streamed['final_capital'] == pytest.approx(full['final_capital'], rel=1e-9)
+
+
+@pytest.mark.parametrize('size', CHUNK_SIZES)
+def test_streaming_engine_matches_in_memory(size):
+    data = make_data()
+
+    full = BacktestEngine(data, commission=0.001, slippage=0.0005).run(moving_average_strategy)
+    streamed = collect(StreamingEngine(commission=0.001, slippage=0.0005).stream(
+        chunked(data, size), moving_average_strategy, lookback=20))
+
+    assert len(full['trades']) > 0
+    assert_same_run(full, streamed)
+
+
+@pytest.mark.parametrize('size', CHUNK_SIZES)
+@pytest.mark.parametrize('executor_kwargs', EXECUTORS)
+def test_streaming_executor_with_atr_column_matches_in_memory(executor_kwargs, size):
+    data = make_data()
+    data['atr'] = TradeExecutor()._calculate_atr(data)
+    data['signal'] = random_signal()
+
+    full = TradeExecutor(**executor_kwargs).apply_execution_logic(
+        data.copy(), data['signal'], commission=0.001, slippage=0.0005, mode='compiled')
+    streamed = collect(StreamingExecutor(TradeExecutor(**executor_kwargs), commission=0.001, slippage=0.0005)
+                       .stream(chunked(data, size)))
+
+    assert_same_run(full, streamed)
+
+
+@pytest.mark.parametrize('size', CHUNK_SIZES)
+@pytest.mark.parametrize('executor_kwargs', EXECUTORS)
+def test_streaming_executor_without_atr_column_uses_running_warm_up(executor_kwargs, size):
+    data = make_data()
+    data['signal'] = random_signal()
+
+    # Without an 'atr' column the warm-up bars use the running mean true range
+    running = RunningATR(14)
+    with_atr = data.assign(atr=[running.update(h, l, c) for h, l, c in zip(data['high'], data['low'], data['close'])])
+    full = TradeExecutor(**executor_kwargs).apply_execution_logic(
+        with_atr, data['signal'], commission=0.001, slippage=0.0005, mode='compiled')
+    streamed = collect(StreamingExecutor(TradeExecutor(**executor_kwargs), commission=0.001, slippage=0.0005)
+                       .stream(chunked(data, size)))
+
+    assert_same_run(full, streamed)
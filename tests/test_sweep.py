@@ -0,0 +1,40 @@
+"""
+ParameterSweep results independent of the number of worker processes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtest import ParameterSweep
+
+
+def make_data(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    return pd.DataFrame({
+        'date': pd.date_range('2021-01-04', periods=n, freq='h'),
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'symbol': 'TEST'
+    })
+
+
+def column_sensitive_strategy(data: pd.DataFrame, period: int) -> pd.DataFrame:
+    """Moving average crossover that trades differently if it sees extra columns"""
+    signal = np.where(data['close'] > data['close'].rolling(period).mean(), 1, -1)
+    if {'day_of_week', 'month', 'symbol'} & set(data.columns):
+        signal = np.zeros(len(data))
+    return pd.DataFrame({'signal': signal}, index=data.index)
+
+
+def test_sweep_results_do_not_depend_on_worker_count():
+    data = make_data()
+    grid = {'period': [5, 10, 20]}
+
+    single = ParameterSweep(data, column_sensitive_strategy, grid, max_workers=1).run()
+    pooled = ParameterSweep(data, column_sensitive_strategy, grid, max_workers=2).run()
+
+    pd.testing.assert_frame_equal(single, pooled)
+    assert (single['totalTrades'] > 0).all()
@@ -0,0 +1,41 @@
+"""
+Equity curve downsampling for the dashboard.
+"""
+
+import numpy as np
+import pytest
+
+from backtest.visualization import _downsample_indices
+
+
+@pytest.mark.parametrize('n, buckets', [(10_000, 100), (10_007, 100), (1_001, 250)])
+def test_each_bucket_keeps_first_last_min_and_max(n, buckets):
+    values = np.cumsum(np.random.default_rng(n).normal(size=n))
+
+    indices = _downsample_indices(values, buckets)
+
+    size = -(-n // buckets)
+    assert len(indices) <= 4 * buckets
+    assert (np.diff(indices) > 0).all()
+    for start in range(0, n, size):
+        stop = min(start + size, n)
+        kept = indices[(indices >= start) & (indices < stop)]
+        assert kept[0] == start and kept[-1] == stop - 1
+        assert values[kept].min() == values[start:stop].min()
+        assert values[kept].max() == values[start:stop].max()
+
+
+def test_keep_positions_are_always_included():
+    values = np.sin(np.linspace(0, 50, 5_000))
+    keep = (17, 2_501, 4_998)
+
+    indices = _downsample_indices(values, 50, keep)
+
+    assert set(keep) <= set(indices)
+
+
+@pytest.mark.parametrize('n', [0, 1, 399, 400])
+def test_short_series_are_returned_unchanged(n):
+    values = np.random.default_rng(0).normal(size=n)
+
+    np.testing.assert_array_equal(_downsample_indices(values, 100), np.arange(n))
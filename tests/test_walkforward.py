@@ -0,0 +1,27 @@
+"""
+WalkForward results independent of the number of worker processes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtest import WalkForward
+
+from test_sweep import make_data, column_sensitive_strategy
+
+
+def test_walk_forward_results_do_not_depend_on_worker_count():
+    data = make_data(n=400)
+    grid = {'period': [5, 10, 20]}
+
+    runs = [
+        WalkForward(data, column_sensitive_strategy, grid, in_sample=100, out_of_sample=50, max_workers=workers).run()
+        for workers in (1, 2)
+    ]
+
+    pd.testing.assert_frame_equal(runs[0]['in_sample'], runs[1]['in_sample'])
+    pd.testing.assert_frame_equal(runs[0]['windows'], runs[1]['windows'])
+    np.testing.assert_array_equal(runs[0]['results']['equity_curve'], runs[1]['results']['equity_curve'])
+    assert runs[0]['results']['final_capital'] == runs[1]['results']['final_capital']
+    assert (runs[0]['in_sample']['totalTrades'] > 0).all()
+    assert len(runs[0]['results']['trades']) > 0